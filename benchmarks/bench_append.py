@@ -0,0 +1,49 @@
+"""
+Benchmark: per-row append_expense() vs group-committed append_expenses().
+
+Writes N synthetic rows to a temporary CSV with each method and reports
+rows/second.
+
+Run from the project root:
+    python -m benchmarks.bench_append --rows 20000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.expense import Expense
+from src.file_manager import append_expense, append_expenses
+
+
+def rows(n):
+    return [Expense(100 + i % 900, "Food", "2024-01-01", f"txn {i}") for i in range(n)]
+
+
+def timed(label, fn, n):
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:36} {elapsed:8.3f}s {n / elapsed:12,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--flush-size", type=int, default=1000)
+    args = parser.parse_args()
+    data = rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single, batched, synced = (Path(tmp) / f"{name}.csv" for name in ("single", "batched", "synced"))
+        print(f"Rows: {args.rows:,}")
+        timed("append_expense (per row)", lambda: [append_expense(e, single) for e in data], args.rows)
+        timed(f"append_expenses (flush {args.flush_size})",
+              lambda: append_expenses(data, batched, flush_size=args.flush_size), args.rows)
+        timed(f"append_expenses (flush {args.flush_size}, fsync)",
+              lambda: append_expenses(data, synced, flush_size=args.flush_size, fsync=True), args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: incremental deduplicated backups vs full copies.
+
+Builds a ledger of N rows, then takes K backups with a batch of appended
+rows (and one edited row) between each. Reports the storage used by the
+chunk store against K full copies, the dedup ratio and backup/restore
+throughput.
+
+Run from the project root:
+    python -m benchmarks.bench_backup --rows 1000000 --backups 10
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from src import backup_store
+from src.expense import Expense
+from src.file_manager import save_expenses, append_expenses, update_expense, compact_journal
+from src.utils import CATEGORIES
+
+
+def synthetic_rows(n, seed):
+    rnd = random.Random(seed)
+    start = date(2022, 1, 1).toordinal()
+    for i in range(n):
+        yield Expense(rnd.randrange(100, 500000) / 100, rnd.choice(CATEGORIES),
+                      date.fromordinal(start + rnd.randrange(3 * 365)).isoformat(), f"txn {seed}-{i}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--backups", type=int, default=10)
+    parser.add_argument("--appends", type=int, default=1000, help="rows appended between backups")
+    parser.add_argument("--compression", choices=sorted(backup_store.COMPRESSORS), default="gzip")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger, store = Path(tmp) / "expenses.csv", Path(tmp) / "backups"
+        save_expenses(synthetic_rows(args.rows, 0), ledger)
+
+        full_copies, results = 0, []
+        for k in range(args.backups):
+            if k:
+                append_expenses(synthetic_rows(args.appends, k), ledger)
+                update_expense(k, Expense(1, "Other", "2024-01-01", f"edit {k}"), ledger)
+                # Fold the journal so the base file itself changes mid-file
+                compact_journal(ledger)
+            full_copies += ledger.stat().st_size
+            results.append(backup_store.backup(ledger, store, args.compression))
+
+        t0 = time.perf_counter()
+        restored = backup_store.restore(results[-1].path, Path(tmp) / "restored.csv")
+        restore_seconds = time.perf_counter() - t0
+        stats = backup_store.store_stats(store)
+
+    first, rest = results[0], results[1:]
+    print(f"Rows: {args.rows:,}  backups: {args.backups}  appends between backups: {args.appends:,}")
+    print(f"First backup:       {first.bytes / 1e6:8.1f} MB in {first.seconds:.2f}s ({first.mb_per_second:.0f} MB/s)")
+    if rest:
+        avg = sum(r.seconds for r in rest) / len(rest)
+        new = sum(r.stored_bytes for r in rest) / len(rest)
+        print(f"Incremental backup: {avg:.2f}s avg, {new / 1e3:,.1f} KB stored per backup")
+    print(f"Full copies would use {full_copies / 1e6:,.1f} MB; chunk store uses {stats['stored_bytes'] / 1e6:,.1f} MB")
+    print(f"Dedup ratio: {stats['dedup_ratio']:.1f}x")
+    print(f"Restore: {restored.bytes / 1e6:.1f} MB in {restore_seconds:.2f}s ({restored.bytes / 1e6 / restore_seconds:.0f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
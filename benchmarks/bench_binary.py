@@ -0,0 +1,71 @@
+"""
+Benchmark: CSV parsing vs the memory-mapped binary ledger.
+
+Writes N synthetic rows as CSV and as .fmb, then times opening each
+ledger and running summarize() / category totals on it, plus the
+vectorized engine on the mapped columns when pandas is installed.
+
+Run from the project root:
+    python -m benchmarks.bench_binary --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from src import reports, vectorized
+from src.expense import Expense
+from src.file_manager import save_expenses, load_expenses, load_ledger, migrate_to_binary
+from src.summary import summarize
+from src.utils import CATEGORIES
+
+
+def synthetic_rows(n, seed=42):
+    rnd = random.Random(seed)
+    start = date(2020, 1, 1).toordinal()
+    for i in range(n):
+        yield Expense(rnd.randrange(100, 500000) / 100, rnd.choice(CATEGORIES),
+                      date.fromordinal(start + rnd.randrange(6 * 365)).isoformat(), f"txn {i}")
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, bin_path = Path(tmp) / "expenses.csv", Path(tmp) / "expenses.fmb"
+        save_expenses(synthetic_rows(args.rows), csv_path)
+        _, convert = timed(migrate_to_binary, csv_path, bin_path)
+        print(f"Rows: {args.rows:,}  CSV {os.path.getsize(csv_path) / 1e6:.1f} MB  "
+              f"binary {os.path.getsize(bin_path) / 1e6:.1f} MB  (converted in {convert:.2f}s)")
+
+        _, t_objects = timed(load_expenses, csv_path)
+        parsed, t_parse = timed(load_ledger, csv_path)
+        mapped, t_map = timed(load_ledger, bin_path)
+        print(f"{'open':28} load_expenses {t_objects:.3f}s  CSV ledger {t_parse:.3f}s  mmap {t_map * 1000:.2f} ms")
+
+        s1, t1 = timed(summarize, parsed)
+        s2, t2 = timed(summarize, mapped)
+        assert s1 == s2
+        print(f"{'summarize':28} CSV ledger {t1:.3f}s  mmap {t2:.3f}s")
+        print(f"{'open + summarize':28} CSV {t_parse + t1:.3f}s  mmap {t_map + t2:.3f}s  "
+              f"({(t_parse + t1) / (t_map + t2):.1f}x)")
+
+        if vectorized.available():
+            _, tv = timed(reports.category_summary, mapped, "vectorized")
+            print(f"{'category_summary (pandas)':28} mmap {tv:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
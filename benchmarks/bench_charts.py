@@ -0,0 +1,65 @@
+"""
+Benchmark: sequential chart generation vs parallel batch rendering.
+
+Builds L synthetic ledgers of N rows and refreshes the three charts of
+each one: first one chart at a time on the calling thread, then with
+render_charts_batch (one aggregation per ledger, one shared process pool).
+
+Run from the project root:
+    python -m benchmarks.bench_charts --ledgers 8 --rows 20000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from src import reports
+from src.ledger import Ledger
+from src.utils import CATEGORIES
+
+
+def synthetic_ledger(n, seed):
+    rnd = random.Random(seed)
+    start = date(2022, 1, 1).toordinal()
+    ledger = Ledger()
+    for _ in range(n):
+        d = date.fromordinal(start + rnd.randrange(2 * 365)).isoformat()
+        ledger.append(rnd.randrange(100, 500000) / 100, rnd.choice(CATEGORIES), d, "txn")
+    return ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ledgers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    ledgers = [synthetic_ledger(args.rows, seed) for seed in range(args.ledgers)]
+    budgets = {cat: 50_000 for cat in CATEGORIES}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reports.CHARTS_DIR = Path(tmp) / "sequential"
+        t0 = time.perf_counter()
+        for ledger in ledgers:
+            reports.generate_category_chart(ledger, out_dir=tmp, open_file=False)
+            reports.generate_monthly_spending_chart(ledger, out_dir=tmp, open_file=False)
+            reports.generate_budget_vs_actual_chart(ledger, out_dir=tmp, open_file=False)
+        sequential = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        reports.render_charts_batch({Path(tmp) / f"ledger{i}": ledger for i, ledger in enumerate(ledgers)},
+                                    budgets=budgets, max_workers=args.workers)
+        parallel = time.perf_counter() - t0
+
+    print(f"Ledgers: {args.ledgers}  rows each: {args.rows:,}  workers: {args.workers}")
+    print(f"Sequential:        {sequential:.2f}s")
+    print(f"Batch (parallel):  {parallel:.2f}s  ({sequential / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
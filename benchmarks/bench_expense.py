@@ -0,0 +1,71 @@
+"""
+Benchmark: Expense (dataclass) vs CompactExpense (__slots__).
+
+Measures, for N synthetic rows:
+- memory held per object (tracemalloc)
+- time of reports.monthly_summary() over the full list
+
+Run from the project root:
+    python -m benchmarks.bench_expense --rows 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import date
+
+from src.expense import Expense, CompactExpense
+from src.utils import CATEGORIES
+
+
+def synthetic_lines(n, seed=42):
+    # CSV-style text lines, so both classes parse fresh strings like load_expenses()
+    rnd = random.Random(seed)
+    start = date(2020, 1, 1).toordinal()
+    lines = []
+    for _ in range(n):
+        d = date.fromordinal(start + rnd.randrange(6 * 365)).isoformat()
+        lines.append(f"{d},{rnd.choice(CATEGORIES)},{rnd.randrange(100, 500000) / 100:.2f},txn")
+    return lines
+
+
+def build(cls, lines):
+    gc.collect()
+    tracemalloc.start()
+    objs = []
+    for line in lines:
+        d, cat, amt, desc = line.split(",")
+        objs.append(cls(float(amt), cat, d, desc))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objs, current
+
+
+def main():
+    from src.reports import monthly_summary
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lines = synthetic_lines(args.rows)
+    print(f"Rows: {args.rows:,}")
+    print(f"{'class':15} {'bytes/object':>12} {'monthly_summary (s)':>20}")
+
+    results = {}
+    for cls in (Expense, CompactExpense):
+        objs, mem = build(cls, lines)
+        t0 = time.perf_counter()
+        results[cls.__name__] = monthly_summary(objs)
+        elapsed = time.perf_counter() - t0
+        print(f"{cls.__name__:15} {mem / len(objs):12.1f} {elapsed:20.3f}")
+        del objs
+
+    same = results["Expense"].keys() == results["CompactExpense"].keys()
+    print("Month keys identical:", same)
+
+
+if __name__ == "__main__":
+    main()
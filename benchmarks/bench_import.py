@@ -0,0 +1,51 @@
+"""
+Benchmark: bulk CSV import throughput (target: >= 1M rows/minute).
+
+Generates a synthetic bank statement with N rows (about 1% invalid),
+imports it into a temporary ledger and reports rows per minute.
+
+Run from the project root:
+    python -m benchmarks.bench_import --rows 1000000
+"""
+
+import argparse
+import csv
+import random
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from src.importer import import_csv
+from src.utils import CATEGORIES
+
+
+def write_statement(path, n, seed=1):
+    rnd = random.Random(seed)
+    start = date(2022, 1, 1).toordinal()
+    dates = [date.fromordinal(start + d).isoformat() for d in range(3 * 365)]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Category", "Amount", "Description"])
+        for i in range(n):
+            amount = f"{rnd.randrange(100, 500000) / 100:.2f}" if rnd.random() > 0.01 else "oops"
+            writer.writerow([rnd.choice(dates), rnd.choice(CATEGORIES), amount, f"txn {i}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "statement.csv"
+        write_statement(source, args.rows)
+        result = import_csv(source, Path(tmp) / "expenses.csv", chunk_size=args.chunk_size,
+                            rejects_path=Path(tmp) / "rejects.csv")
+
+    print(f"Rows: {args.rows:,}  imported: {result.imported:,}  rejected: {result.rejected:,}")
+    print(f"Time: {result.seconds:.2f}s  →  {result.rows_per_minute:,.0f} rows/minute")
+
+
+if __name__ == "__main__":
+    main()
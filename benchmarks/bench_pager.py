@@ -0,0 +1,77 @@
+"""
+Benchmark: paged viewing and editing vs loading the whole CSV.
+
+Writes N synthetic rows, then times building the line-offset index,
+reopening it from disk, reading one page deep in the file, extending
+it after an append, and editing the last row by its ID, against the
+full load the old view / edit screens needed.
+
+Run from the project root:
+    python -m benchmarks.bench_pager --rows 1000000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from src.expense import Expense
+from src.file_manager import save_expenses, append_expense, load_with_row_ids
+from src.pager import LineIndex, CsvPager
+from src.repository import ExpenseRepository
+from src.utils import CATEGORIES
+
+
+def synthetic_rows(n, seed=42):
+    rnd = random.Random(seed)
+    start = date(2020, 1, 1).toordinal()
+    for i in range(n):
+        yield Expense(rnd.randrange(100, 500000) / 100, rnd.choice(CATEGORIES),
+                      date.fromordinal(start + i * 2190 // n).isoformat(), f"txn {i}")
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "expenses.csv"
+        save_expenses(synthetic_rows(args.rows), path)
+
+        _, t_full = timed(load_with_row_ids, path)
+        index, t_build = timed(lambda: LineIndex(path).refresh())
+        index.save()
+        index, t_reopen = timed(lambda: LineIndex(path).refresh())
+        pager = CsvPager(index, args.page_size)
+        deep = pager.pages * 9 // 10
+        _, t_page = timed(pager.page, deep)
+        _, t_date = timed(pager.page_of_date, "2025-06-01")
+
+        append_expense(Expense(1, "Food", "2025-12-31", "appended"), path)
+        _, t_extend = timed(index.refresh)
+        last = len(index) - 1
+        _, t_edit = timed(ExpenseRepository(path).update_row, last, Expense(2, "Food", "2025-12-31", "edited"))
+
+        print(f"Rows: {args.rows:,}  page size: {args.page_size}")
+        for label, seconds in (("Full load (old screens)", t_full),
+                               ("Build line index (once)", t_build),
+                               ("Reopen saved index", t_reopen),
+                               (f"Read page {deep + 1:,}", t_page),
+                               ("Jump to date", t_date),
+                               ("Extend after append", t_extend),
+                               (f"Edit row {last + 1:,} by ID", t_edit)):
+            print(f"{label + ':':28} {seconds * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: pure-Python vs vectorized (NumPy/pandas) report aggregations.
+
+Builds a Ledger of N synthetic rows and times category_summary,
+monthly_summary and total_and_average with each engine.
+
+Run from the project root:
+    python -m benchmarks.bench_vectorized --rows 1000000
+"""
+
+import argparse
+import random
+import time
+from datetime import date
+
+from src import reports, vectorized
+from src.ledger import Ledger
+from src.utils import CATEGORIES
+
+
+def synthetic_ledger(n, seed=42):
+    rnd = random.Random(seed)
+    start = date(2020, 1, 1).toordinal()
+    ledger = Ledger()
+    for _ in range(n):
+        d = date.fromordinal(start + rnd.randrange(6 * 365)).isoformat()
+        ledger.append(rnd.randrange(100, 500000) / 100, rnd.choice(CATEGORIES), d, "txn")
+    return ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if not vectorized.available():
+        print("pandas is not installed; nothing to compare.")
+        return
+
+    ledger = synthetic_ledger(args.rows)
+    print(f"Rows: {args.rows:,}")
+    print(f"{'aggregation':20} {'python (s)':>11} {'vectorized (s)':>15}")
+    for name in ("category_summary", "monthly_summary", "total_and_average"):
+        func = getattr(reports, name)
+        timings = []
+        for engine in ("python", "vectorized"):
+            t0 = time.perf_counter()
+            func(ledger, engine=engine)
+            timings.append(time.perf_counter() - t0)
+        print(f"{name:20} {timings[0]:>11.3f} {timings[1]:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Load test: requests per second and latency percentiles of src.server.
+
+Starts the server in a subprocess on a temporary ledger of N synthetic
+rows, then opens C keep-alive connections that each send requests
+back to back for D seconds. The mix is mostly reads (summary, alerts,
+filtered listings), with a small share of POST /expenses writes.
+
+Run from the project root:
+    python -m benchmarks.load_test --rows 100000 --clients 50 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from src.expense import Expense
+from src.file_manager import save_expenses
+from src.utils import CATEGORIES
+
+
+def synthetic_rows(n, seed=3):
+    rnd = random.Random(seed)
+    start = date(2023, 1, 1).toordinal()
+    for i in range(n):
+        yield Expense(rnd.randrange(100, 500000) / 100, rnd.choice(CATEGORIES),
+                      date.fromordinal(start + rnd.randrange(730)).isoformat(), f"txn {i}")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"Transfer-Encoding: chunked" in head:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    else:
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+    return status
+
+
+def pick_request(rnd, write_ratio):
+    if rnd.random() < write_ratio:
+        body = json.dumps({"amount": rnd.randrange(1, 1000), "category": rnd.choice(CATEGORIES),
+                           "date": "2024-06-01", "description": "load test"}).encode()
+        return "POST", "/expenses", body
+    path = rnd.choice(["/summary", "/alerts", "/summary/2024-03",
+                       "/expenses?min=4990&max=5000", "/expenses?from=2024-03-01&to=2024-03-02"])
+    return "GET", path, b""
+
+
+async def client(port, deadline, latencies, errors, write_ratio, seed):
+    rnd = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    while time.perf_counter() < deadline:
+        method, path, body = pick_request(rnd, write_ratio)
+        t0 = time.perf_counter()
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        status = await read_response(reader)
+        latencies.append(time.perf_counter() - t0)
+        if status >= 400:
+            errors.append(status)
+    writer.close()
+
+
+async def wait_until_up(port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run(args, port):
+    await wait_until_up(port)
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    deadline = t0 + args.duration
+    await asyncio.gather(*(client(port, deadline, latencies, errors, args.write_ratio, seed)
+                           for seed in range(args.clients)))
+    return latencies, errors, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / "expenses.csv"
+        save_expenses(synthetic_rows(args.rows), data_file)
+        port = free_port()
+        proc = subprocess.Popen([sys.executable, "-m", "src.server", "--port", str(port), "--data", str(data_file)],
+                                stdout=subprocess.DEVNULL)
+        try:
+            latencies, errors, elapsed = asyncio.run(run(args, port))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"Rows: {args.rows:,}  clients: {args.clients}  duration: {elapsed:.1f}s  writes: {args.write_ratio:.0%}")
+    print(f"Requests: {len(latencies):,}  errors: {len(errors)}")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"Latency: p50 {pct(0.50):.2f} ms  p99 {pct(0.99):.2f} ms  max {latencies[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
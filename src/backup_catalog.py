@@ -0,0 +1,199 @@
+"""
+Catalog of the backups in a backup directory.
+
+backups/catalog.json records one entry per backup:
+
+    {"name": "expenses_backup_20240301_101500.manifest.json",
+     "created": "2024-03-01T10:15:00", "rows": 48210, "size": 2093311,
+     "sha256": "…", "manifest_sha256": "…"}
+
+Listing backups reads this one small file instead of scanning and
+sorting the directory. A missing catalog is rebuilt once from the
+files on disk (older full-copy CSV backups included).
+
+- prune(): grandfather-father-son retention. The newest backup of each
+  of the last N days, weeks and months is kept, everything else is
+  deleted and the chunks no backup refers to any more are collected.
+- verify(): quick integrity check from metadata only (the manifest's
+  own checksum and the presence of every chunk, or the size of a CSV
+  copy); verify(full=True) also decompresses and re-hashes the data.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from src import backup_store
+from src.locking import file_lock, atomic_write
+
+CATALOG_FILE = "catalog.json"
+
+# Default grandfather-father-son retention
+KEEP_DAILY = 7
+KEEP_WEEKLY = 4
+KEEP_MONTHLY = 12
+
+
+@dataclass
+class CatalogEntry:
+    """
+        One backup: its file name in the backup directory and what it holds.
+    """
+    name: str
+    created: str            # ISO timestamp, seconds
+    rows: int
+    size: int               # bytes of the backed-up CSV
+    sha256: str             # of the backed-up CSV
+    manifest_sha256: str = ""   # of the manifest file ('' for CSV copies)
+
+    @property
+    def is_manifest(self):
+        return backup_store.is_manifest(self.name)
+
+
+def catalog_path(backup_dir):
+    return Path(backup_dir) / CATALOG_FILE
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def entry_for(path):
+    """Builds the catalog entry for a backup file (manifest or CSV copy)."""
+    path = Path(path)
+    if backup_store.is_manifest(path):
+        manifest = backup_store.load_manifest(path)
+        return CatalogEntry(path.name, manifest["created"], manifest.get("rows", 0),
+                            manifest["size"], manifest["sha256"], _sha256_file(path))
+    # Full-copy CSV: expenses_backup_YYYYmmdd_HHMMSS.csv
+    try:
+        created = datetime.strptime(path.stem[-15:], "%Y%m%d_%H%M%S")
+    except ValueError:
+        created = datetime.fromtimestamp(path.stat().st_mtime)
+    with open(path, 'rb') as f:
+        lines = sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+    return CatalogEntry(path.name, created.isoformat(timespec="seconds"), max(lines - 1, 0),
+                        path.stat().st_size, _sha256_file(path))
+
+
+def _save(backup_dir, entries):
+    with atomic_write(catalog_path(backup_dir)) as f:
+        json.dump([asdict(e) for e in entries], f, indent=1)
+
+
+def rebuild(backup_dir):
+    """Scans the backup directory and rewrites the catalog."""
+    backup_dir = Path(backup_dir)
+    with file_lock(catalog_path(backup_dir)):
+        entries = [entry_for(p) for p in backup_dir.iterdir()
+                   if not p.name.startswith('.') and p.name != CATALOG_FILE
+                   and (p.suffix == '.csv' or backup_store.is_manifest(p))]
+        entries.sort(key=lambda e: (e.created, e.name))
+        _save(backup_dir, entries)
+    return entries
+
+
+def load(backup_dir):
+    """Catalog entries, oldest first."""
+    try:
+        with open(catalog_path(backup_dir), 'r', encoding='utf-8') as f:
+            return [CatalogEntry(**e) for e in json.load(f)]
+    except FileNotFoundError:
+        if not os.path.isdir(backup_dir):
+            return []
+        return rebuild(backup_dir)
+    except (ValueError, TypeError):
+        # Corrupt or from an unknown version
+        return rebuild(backup_dir)
+
+
+def add(backup_dir, path):
+    """Records a new backup file; returns its entry."""
+    entry = entry_for(path)
+    with file_lock(catalog_path(backup_dir)):
+        entries = [e for e in load(backup_dir) if e.name != entry.name]
+        entries.append(entry)
+        entries.sort(key=lambda e: (e.created, e.name))
+        _save(backup_dir, entries)
+    return entry
+
+
+def verify(backup_dir, entry, full=False):
+    """
+        Problems found with one backup ([] if it is intact).
+        The quick check never reads the backed-up data itself.
+    """
+    path = Path(backup_dir) / entry.name
+    if not path.exists():
+        return ["file is missing"]
+    if not entry.is_manifest:
+        if path.stat().st_size != entry.size:
+            return ["size differs from the catalog"]
+        if full and _sha256_file(path) != entry.sha256:
+            return ["checksum mismatch"]
+        return []
+    if _sha256_file(path) != entry.manifest_sha256:
+        return ["manifest was modified"]
+    missing = backup_store.missing_chunks(path)
+    if missing:
+        return [f"{len(missing)} chunk(s) missing"]
+    if full and not backup_store.check(path):
+        return ["checksum mismatch"]
+    return []
+
+
+def retained(entries, daily=KEEP_DAILY, weekly=KEEP_WEEKLY, monthly=KEEP_MONTHLY):
+    """
+        Names of the entries kept by grandfather-father-son retention:
+        the newest backup of each of the `daily` most recent days with a
+        backup, likewise for ISO weeks and months. The newest is always kept.
+    """
+    keep = set()
+    periods = (
+        (daily, lambda d: d.date()),
+        (weekly, lambda d: d.isocalendar()[:2]),
+        (monthly, lambda d: (d.year, d.month)),
+    )
+    newest_first = sorted(entries, key=lambda e: (e.created, e.name), reverse=True)
+    if newest_first:
+        keep.add(newest_first[0].name)
+    for limit, period_of in periods:
+        seen = set()
+        for e in newest_first:
+            period = period_of(datetime.fromisoformat(e.created))
+            if period in seen:
+                continue
+            if len(seen) >= limit:
+                break
+            seen.add(period)
+            keep.add(e.name)
+    return keep
+
+
+def prune(backup_dir, daily=KEEP_DAILY, weekly=KEEP_WEEKLY, monthly=KEEP_MONTHLY, dry_run=False):
+    """
+        Deletes the backups retention does not keep; returns their entries.
+        Chunks only they referred to are removed from the store as well.
+    """
+    with file_lock(catalog_path(backup_dir)):
+        entries = load(backup_dir)
+        keep = retained(entries, daily, weekly, monthly)
+        removed = [e for e in entries if e.name not in keep]
+        if dry_run or not removed:
+            return removed
+        for e in removed:
+            try:
+                os.remove(Path(backup_dir) / e.name)
+            except FileNotFoundError:
+                pass
+        _save(backup_dir, [e for e in entries if e.name in keep])
+        if any(e.is_manifest for e in removed):
+            backup_store.collect_garbage(backup_dir)
+    return removed
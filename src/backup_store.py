@@ -0,0 +1,242 @@
+"""
+Deduplicated, compressed, incremental backups.
+
+Instead of a full copy of expenses.csv per backup, the file is cut
+into content-defined chunks that are stored once, compressed, in a
+content-addressed object store:
+
+    backups/
+    ├── objects/
+    │   └── 3f/3fa1…e9.gz          one chunk (sha256 of the raw bytes)
+    └── expenses_backup_20240301_101500.manifest.json
+
+Chunk boundaries are chosen from the content (a line whose crc32 hits
+a mask, within min/max chunk sizes), never from byte offsets. Appending
+rows therefore only changes the last chunk, and an edit changes the
+chunk around it, so each new backup stores little more than the change.
+
+A manifest lists the chunk hashes in order plus the size and sha256 of
+the whole file; restore() reassembles the chunks and checks both.
+"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from src.locking import atomic_write
+
+MANIFEST_SUFFIX = ".manifest.json"
+OBJECTS_DIR = "objects"
+
+# Chunking: ~64 KiB on average for typical ledger lines
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 256 * 1024
+BOUNDARY_MASK = (1 << 10) - 1   # a line ends a chunk 1 time in 1024
+
+# name -> (file suffix, compress, decompress)
+COMPRESSORS = {
+    "gzip": (".gz", lambda data: gzip.compress(data, compresslevel=6), gzip.decompress),
+    "lzma": (".xz", lzma.compress, lzma.decompress),
+}
+
+
+@dataclass
+class BackupResult:
+    """
+        Outcome of one backup or restore.
+    """
+    path: str
+    bytes: int            # logical size of the ledger file
+    chunks: int
+    new_chunks: int
+    stored_bytes: int     # compressed bytes added to the store
+    seconds: float
+    rows: int = 0         # data lines, header excluded
+
+    @property
+    def dedup_ratio(self):
+        """Logical bytes per byte actually written (higher is better)."""
+        return self.bytes / self.stored_bytes if self.stored_bytes else float("inf")
+
+    @property
+    def mb_per_second(self):
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def iter_chunks(f):
+    """Content-defined chunks of a binary file, always cut at line ends."""
+    chunk, size = [], 0
+    for line in f:
+        chunk.append(line)
+        size += len(line)
+        if size >= MAX_CHUNK or (size >= MIN_CHUNK and zlib.crc32(line) & BOUNDARY_MASK == 0):
+            yield b"".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+def _object_path(store, digest, compression):
+    suffix = COMPRESSORS[compression][0]
+    return Path(store) / OBJECTS_DIR / digest[:2] / f"{digest}{suffix}"
+
+
+def _find_object(store, digest):
+    # A chunk may have been stored with any compressor
+    for compression in COMPRESSORS:
+        path = _object_path(store, digest, compression)
+        if path.exists():
+            return path, compression
+    return None, None
+
+
+def is_manifest(path):
+    return str(path).endswith(MANIFEST_SUFFIX)
+
+
+def load_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def backup(source, store, compression="gzip", label="expenses_backup"):
+    """
+        Stores `source` as a new backup in `store`; returns a BackupResult.
+        Only chunks not already in the store are compressed and written.
+    """
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Unknown compression: {compression}")
+    compress = COMPRESSORS[compression][1]
+    store = Path(store)
+    start = time.perf_counter()
+
+    digests, total, new_chunks, stored, lines = [], 0, 0, 0, 0
+    whole = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for chunk in iter_chunks(f):
+            digest = hashlib.sha256(chunk).hexdigest()
+            whole.update(chunk)
+            total += len(chunk)
+            lines += chunk.count(b"\n")
+            digests.append(digest)
+            if _find_object(store, digest)[0] is None:
+                path = _object_path(store, digest, compression)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with atomic_write(path, 'wb') as out:
+                    stored += out.write(compress(chunk))
+                new_chunks += 1
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    manifest_path = store / f"{label}_{timestamp}{MANIFEST_SUFFIX}"
+    n = 1
+    while manifest_path.exists():
+        # Two backups in the same second
+        manifest_path = store / f"{label}_{timestamp}_{n}{MANIFEST_SUFFIX}"
+        n += 1
+    manifest = {
+        "version": 1,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "source": Path(source).name,
+        "size": total,
+        "rows": max(lines - 1, 0),
+        "sha256": whole.hexdigest(),
+        "chunks": digests,
+    }
+    with atomic_write(manifest_path) as f:
+        json.dump(manifest, f, indent=1)
+    stored += manifest_path.stat().st_size
+
+    return BackupResult(str(manifest_path), total, len(digests), new_chunks, stored,
+                        time.perf_counter() - start, manifest["rows"])
+
+
+def _read_chunks(manifest, store):
+    for digest in manifest["chunks"]:
+        path, compression = _find_object(store, digest)
+        if path is None:
+            raise ValueError(f"Backup is missing chunk {digest}")
+        with open(path, 'rb') as f:
+            yield COMPRESSORS[compression][2](f.read())
+
+
+def restore(manifest_path, target):
+    """
+        Rebuilds the backed-up file at `target` (atomically).
+        Raises ValueError if a chunk is missing or the checksum differs.
+    """
+    start = time.perf_counter()
+    manifest = load_manifest(manifest_path)
+    whole = hashlib.sha256()
+    size = 0
+    with atomic_write(target, 'wb') as out:
+        for chunk in _read_chunks(manifest, Path(manifest_path).parent):
+            whole.update(chunk)
+            size += out.write(chunk)
+        if size != manifest["size"] or whole.hexdigest() != manifest["sha256"]:
+            raise ValueError("Restored data does not match the backup checksum")
+    return BackupResult(str(target), size, len(manifest["chunks"]), 0, 0, time.perf_counter() - start,
+                        manifest.get("rows", 0))
+
+
+def missing_chunks(manifest_path):
+    """Chunks of a backup that are not in the store (existence check only)."""
+    store = Path(manifest_path).parent
+    return [d for d in load_manifest(manifest_path)["chunks"] if _find_object(store, d)[0] is None]
+
+
+def check(manifest_path):
+    """
+        Decompresses every chunk and compares size and sha256 with the
+        manifest, without writing anything; returns True if they match.
+    """
+    manifest = load_manifest(manifest_path)
+    whole = hashlib.sha256()
+    size = 0
+    try:
+        for chunk in _read_chunks(manifest, Path(manifest_path).parent):
+            whole.update(chunk)
+            size += len(chunk)
+    except (ValueError, OSError, EOFError, zlib.error, lzma.LZMAError):
+        return False
+    return size == manifest["size"] and whole.hexdigest() == manifest["sha256"]
+
+
+def store_stats(store):
+    """
+        Whole-store figures: logical bytes of all backups vs bytes on disk.
+    """
+    store = Path(store)
+    manifests = sorted(store.glob(f"*{MANIFEST_SUFFIX}"))
+    logical = sum(load_manifest(m)["size"] for m in manifests)
+    on_disk = sum(p.stat().st_size for p in (store / OBJECTS_DIR).glob("*/*")) if (store / OBJECTS_DIR).exists() else 0
+    on_disk += sum(m.stat().st_size for m in manifests)
+    return {
+        "backups": len(manifests),
+        "logical_bytes": logical,
+        "stored_bytes": on_disk,
+        "dedup_ratio": logical / on_disk if on_disk else 0.0,
+    }
+
+
+def collect_garbage(store):
+    """
+        Deletes chunks no manifest refers to; returns the number removed.
+        Dot-files are temp files of a chunk being written (atomic_write)
+        and are left alone.
+    """
+    store = Path(store)
+    live = set()
+    for m in store.glob(f"*{MANIFEST_SUFFIX}"):
+        live.update(load_manifest(m)["chunks"])
+    removed = 0
+    for path in (store / OBJECTS_DIR).glob("*/*"):
+        if not path.name.startswith(".") and path.name.split(".")[0] not in live:
+            os.remove(path)
+            removed += 1
+    return removed
@@ -0,0 +1,247 @@
+"""
+Fixed-width binary ledger format, read through mmap.
+
+Used by file_manager when the data file has a .fmb suffix
+(FINANCE_STORAGE=binary → data/expenses.fmb). Parsing CSV text costs
+a float(), a date parse and a dict per row; this format stores the
+values already decoded, so opening a ledger is an mmap() and a few
+memoryview slices:
+
+    header      magic, version, row count, section offsets (HEADER)
+    amounts     int64[rows]     paise
+    desc_ends   uint64[rows+1]  byte offsets into the heap
+    dates       int32[rows]     day ordinals (date.toordinal())
+    categories  uint16[rows]    codes into the category table
+    heap        UTF-8 descriptions, back to back
+    table       JSON list of category names (code → name)
+
+Each field is one contiguous, 8-byte aligned block of fixed-width
+records, so memoryview.cast() gives typed column views without NumPy
+and np.frombuffer() gives zero-copy arrays with it. MappedLedger
+exposes these views with the Ledger interface, so summarize(), the
+reports and the vectorized engine aggregate them without creating an
+object per row.
+
+The file is immutable: writes build a new file and atomically replace
+the old one (readers keep the mapping of the file they opened).
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from datetime import date
+from src.expense import Expense, CompactExpense
+from src.ledger import Ledger
+from src.locking import atomic_write
+from src.utils import to_paise
+
+MAGIC = b"FMLEDGER"
+VERSION = 1
+SUFFIX = ".fmb"
+
+# magic, version, reserved, category count, rows,
+# then (offset, length) of amounts, desc_ends, dates, categories, heap, table
+HEADER = struct.Struct("<8sHHIQ12Q")
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+class MappedLedger(Ledger):
+    """
+        Read-only Ledger over a memory-mapped .fmb file.
+
+        amounts / dates / category_codes / desc_offsets are memoryviews
+        into the mapping; descriptions are decoded only when a row is read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        if len(buf) < HEADER.size:
+            raise ValueError(f"Not a binary ledger: {path}")
+        magic, version, _, n_categories, rows, *sections = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f"Not a binary ledger: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary ledger version {version}: {path}")
+        blocks = [buf[off:off + length] for off, length in zip(sections[::2], sections[1::2])]
+        amounts, desc_ends, dates, codes, self.heap, table = blocks
+        self.amounts = amounts.cast('q')
+        self.desc_offsets = desc_ends.cast('Q')
+        self.dates = dates.cast('i')
+        self.category_codes = codes.cast('H')
+        self.categories = json.loads(bytes(table)) if n_categories else []
+        self._category_index = {cat: code for code, cat in enumerate(self.categories)}
+        if not len(self.amounts) == len(self.dates) == len(self.category_codes) == rows:
+            raise ValueError(f"Corrupt binary ledger: {path}")
+
+    def append(self, amount, category, date_str, description):
+        raise TypeError("MappedLedger is read-only; write through binary_ledger.append()")
+
+    def description(self, i):
+        i = self._index(i)
+        return str(self.heap[self.desc_offsets[i]:self.desc_offsets[i + 1]], 'utf-8')
+
+    def where_keyword(self, keyword):
+        kw = keyword.lower()
+        cat_hit = [kw in cat.lower() for cat in self.categories]
+        return [i for i, c in enumerate(self.category_codes)
+                if cat_hit[c] or kw in self.description(i).lower()]
+
+    def close(self):
+        """Releases the mapping (once no NumPy array still refers to it)."""
+        try:
+            for view in (self.amounts, self.desc_offsets, self.dates, self.category_codes, self.heap):
+                view.release()
+            self._mmap.close()
+        except BufferError:
+            # Still exported (e.g. np.frombuffer views); freed with them
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _Columns:
+    """Column buffers of a file being written (optionally seeded from an existing one)."""
+
+    def __init__(self, base=None):
+        self.amounts, self.dates, self.codes = array('q'), array('i'), array('H')
+        self.desc_ends = array('Q', [0])
+        self.heap = bytearray()
+        self.categories = []
+        self.skipped = 0
+        if base is not None:
+            # Raw byte copies of the mapped blocks, no per-row work
+            self.amounts.frombytes(base.amounts.cast('B'))
+            self.dates.frombytes(base.dates.cast('B'))
+            self.codes.frombytes(base.category_codes.cast('B'))
+            self.desc_ends = array('Q')
+            self.desc_ends.frombytes(base.desc_offsets.cast('B'))
+            self.heap += base.heap
+            self.categories = list(base.categories)
+        self._index = {cat: code for code, cat in enumerate(self.categories)}
+
+    @classmethod
+    def from_ledger(cls, ledger):
+        # Columns copied as they are; only descriptions need encoding
+        columns = cls()
+        columns.amounts = array('q', ledger.amounts)
+        columns.dates = array('i', ledger.dates)
+        columns.codes = array('H', ledger.category_codes)
+        columns.categories = list(ledger.categories)
+        text = ledger._descriptions()
+        if text.isascii():
+            # One byte per character: the offsets carry over unchanged
+            columns.heap = bytearray(text, 'ascii')
+            columns.desc_ends = array('Q', ledger.desc_offsets)
+        else:
+            for i in range(len(ledger)):
+                columns.heap += ledger.description(i).encode('utf-8')
+                columns.desc_ends.append(len(columns.heap))
+        return columns
+
+    def add(self, expense):
+        # Rows without a valid date cannot be stored (load_ledger drops them too)
+        ordinal = getattr(expense, "ordinal", None)
+        if ordinal is None:
+            try:
+                ordinal = date.fromisoformat(expense.date).toordinal()
+            except (TypeError, ValueError):
+                self.skipped += 1
+                return
+        code = self._index.get(expense.category)
+        if code is None:
+            code = self._index[expense.category] = len(self.categories)
+            self.categories.append(expense.category)
+        self.amounts.append(to_paise(expense.amount))
+        self.dates.append(ordinal)
+        self.codes.append(code)
+        self.heap += expense.description.encode('utf-8')
+        self.desc_ends.append(len(self.heap))
+
+    def write(self, path):
+        table = json.dumps(self.categories, ensure_ascii=False).encode('utf-8')
+        blocks = [self.amounts.tobytes(), self.desc_ends.tobytes(), self.dates.tobytes(),
+                  self.codes.tobytes(), bytes(self.heap), table]
+        sections, offset = [], _align(HEADER.size)
+        for block in blocks:
+            sections += [offset, len(block)]
+            offset = _align(offset + len(block))
+        with atomic_write(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(self.categories), len(self.amounts), *sections))
+            for block, start in zip(blocks, sections[::2]):
+                f.write(b"\0" * (start - f.tell()))
+                f.write(block)
+        return len(self.amounts)
+
+
+def open_ledger(path):
+    return MappedLedger(path)
+
+
+def write(path, expenses):
+    """
+        Writes any iterable of expenses (or a Ledger, column by column)
+        as a new binary ledger.
+        Returns (rows written, rows skipped for an invalid date).
+    """
+    if isinstance(expenses, Ledger) and not isinstance(expenses, MappedLedger):
+        columns = _Columns.from_ledger(expenses)
+    else:
+        columns = _Columns()
+        for e in expenses:
+            columns.add(e)
+    return columns.write(path), columns.skipped
+
+
+def append(path, expenses):
+    """
+        Adds rows by rewriting the file: existing columns are copied as
+        raw bytes, so the cost is a file copy, not a re-parse.
+        Returns the number of rows added.
+    """
+    with open_ledger(path) as base:
+        columns = _Columns(base)
+    before = len(columns.amounts)
+    for e in expenses:
+        columns.add(e)
+    return columns.write(path) - before
+
+
+def iter_expenses(path, start=None, end=None, categories=None, compact=False):
+    """
+        Streams rows in file order with the same filters as the CSV
+        reader (start / end compared as 'YYYY-MM-DD' text).
+    """
+    with open_ledger(path) as ledger:
+        wanted = None
+        if categories is not None:
+            names = set(categories)
+            wanted = {code for code, cat in enumerate(ledger.categories) if cat in names}
+        iso_of = {}   # ordinal -> 'YYYY-MM-DD', once per distinct day
+        for i in range(len(ledger)):
+            code = ledger.category_codes[i]
+            if wanted is not None and code not in wanted:
+                continue
+            ordinal = ledger.dates[i]
+            if start is not None or end is not None or not compact:
+                d = iso_of.get(ordinal)
+                if d is None:
+                    d = iso_of[ordinal] = date.fromordinal(ordinal).isoformat()
+                if (start is not None and d < start) or (end is not None and d > end):
+                    continue
+            if compact:
+                yield CompactExpense.from_parts(ledger.amounts[i], ledger.categories[code],
+                                                ordinal, ledger.description(i))
+            else:
+                yield Expense(amount=ledger.amounts[i] / 100, category=ledger.categories[code],
+                              date=d, description=ledger.description(i))
@@ -3,12 +3,18 @@ Manages monthly budget limits per category.
 
 Uses a dictionary-based storage model:
     { "Food": 5000, "Transport": 2000 }
+
+Changes are read-modify-write under budgets.json's advisory lock and
+saved with an atomic rename (see locking.py).
 """
 
 import json
 import os
 from collections import defaultdict
-from src.utils import PROJECT_ROOT
+from src.ledger import Ledger
+from src.locking import file_lock, atomic_write
+from src.summary import Summary
+from src.utils import PROJECT_ROOT, to_paise
 
 BUDGET_FILE = PROJECT_ROOT / "data" / "budgets.json"
 
@@ -28,8 +34,8 @@ def save_budgets(budgets):
     """
     Saves a budget for a category.
     """
-    os.makedirs("../data", exist_ok=True)
-    with open(BUDGET_FILE, 'w', encoding='utf-8') as f:
+    os.makedirs(BUDGET_FILE.parent, exist_ok=True)
+    with file_lock(BUDGET_FILE), atomic_write(BUDGET_FILE, newline=None) as f:
         json.dump(budgets, f, indent=4)
 
 
@@ -37,29 +43,48 @@ def set_budget(category, amount):
     """
     Sets or updates a budget for a category.
     """
-    budgets = load_budgets()
-    budgets[category] = float(amount)
-    save_budgets(budgets)
+    with file_lock(BUDGET_FILE):
+        budgets = load_budgets()
+        budgets[category] = float(amount)
+        save_budgets(budgets)
 
 
 def delete_budget(category):
     """
     Removes specific budget for a category.
     """
-    budgets = load_budgets()
-    if category in budgets:
-        del budgets[category]
-        save_budgets(budgets)
+    with file_lock(BUDGET_FILE):
+        budgets = load_budgets()
+        if category in budgets:
+            del budgets[category]
+            save_budgets(budgets)
 
 
 def calculate_category_spend(expenses):
     """
     Calculates and shows the category wise spends
+    Accepts expenses, a Ledger or a Summary from reports.summarize().
     """
-    totals = defaultdict(float)
+    if isinstance(expenses, Summary):
+        return expenses.by_category
+    if isinstance(expenses, Ledger):
+        return expenses.category_totals()
+    # Summed in integer paise so the result does not depend on row order
+    totals = defaultdict(int)
     for e in expenses:
-        totals[e.category] += e.amount
-    return dict(totals)
+        totals[e.category] += to_paise(e.amount)
+    return {cat: paise / 100 for cat, paise in totals.items()}
+
+
+def _alert_for(cat, used, limit):
+    # Alert text for one category, or None when below the warning threshold
+    pct = (used / limit * 100) if limit > 0 else 0
+
+    if pct >= 100:
+        return f"🔴 {cat}: Budget exceeded ({used:.2f}/{limit:.2f})"
+    elif pct >= 80:
+        return f"🟡 {cat}: {pct:.0f}% of budget used ({used:.2f}/{limit:.2f})"
+    return None
 
 
 def budget_alerts(expenses):
@@ -76,12 +101,99 @@ def budget_alerts(expenses):
 
     alerts = []
     for cat, limit in budgets.items():
-        used = spend.get(cat, 0)
-        pct = (used / limit * 100) if limit > 0 else 0
-
-        if pct >= 100:
-            alerts.append(f"🔴 {cat}: Budget exceeded ({used:.2f}/{limit:.2f})")
-        elif pct >= 80:
-            alerts.append(f"🟡 {cat}: {pct:.0f}% of budget used ({used:.2f}/{limit:.2f})")
+        alert = _alert_for(cat, spend.get(cat, 0), limit)
+        if alert:
+            alerts.append(alert)
 
     return alerts
+
+
+class BudgetAlertEngine:
+    """
+    Incremental version of budget_alerts().
+
+    Keeps running spend totals per category and per (month, category)
+    in integer paise. add / remove / replace update them in O(1) and
+    re-evaluate only the categories they touch, so checking alerts after
+    adding an expense no longer re-aggregates the whole history.
+
+    Budgets are re-read only when budgets.json changes on disk
+    (or pass an explicit `budgets` dict to pin them).
+
+    Can be registered as an ExpenseRepository listener.
+    """
+
+    def __init__(self, expenses=(), budgets=None):
+        self._pinned = budgets is not None
+        self.budgets = dict(budgets) if self._pinned else {}
+        self._budget_stamp = None
+        self.spend = defaultdict(int)        # category -> paise
+        self.month_spend = defaultdict(lambda: defaultdict(int))  # month -> category -> paise
+        self._alerts = {}                    # category -> alert text / None
+        self.reset(expenses)
+
+    def _sync_budgets(self):
+        # Reload budgets (and re-evaluate everything) only if the file changed
+        if self._pinned:
+            return
+        try:
+            st = os.stat(BUDGET_FILE)
+            stamp = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            stamp = None
+        if stamp != self._budget_stamp:
+            self._budget_stamp = stamp
+            self.budgets = load_budgets()
+            self._evaluate_all()
+
+    def _apply(self, e, sign):
+        paise = sign * to_paise(e.amount)
+        self.spend[e.category] += paise
+        try:
+            self.month_spend[e.month][e.category] += paise
+        except ValueError:
+            pass  # unparseable date: counts towards totals only
+
+    def _evaluate(self, cat):
+        limit = self.budgets.get(cat)
+        if limit is None:
+            self._alerts.pop(cat, None)
+        else:
+            self._alerts[cat] = _alert_for(cat, self.spend.get(cat, 0) / 100, limit)
+
+    def _evaluate_all(self):
+        self._alerts = {}
+        for cat in self.budgets:
+            self._evaluate(cat)
+
+    def reset(self, expenses, row_ids=None):
+        """Rebuild all totals from scratch (e.g. after a full reload)."""
+        self.spend.clear()
+        self.month_spend.clear()
+        for e in expenses:
+            self._apply(e, +1)
+        self._budget_stamp = None
+        self._evaluate_all()
+
+    def add(self, expense, row_id=None):
+        self._apply(expense, +1)
+        self._evaluate(expense.category)
+
+    def remove(self, row_id, expense):
+        self._apply(expense, -1)
+        self._evaluate(expense.category)
+
+    def replace(self, row_id, old, new):
+        self._apply(old, -1)
+        self._apply(new, +1)
+        self._evaluate(old.category)
+        self._evaluate(new.category)
+
+    def alerts(self):
+        """Same output (and order) as budget_alerts() over the tracked expenses."""
+        self._sync_budgets()
+        return [self._alerts[cat] for cat in self.budgets if self._alerts.get(cat)]
+
+    def month_totals(self, month):
+        """Returns {category: amount} spent in one 'YYYY-MM' month."""
+        return {cat: paise / 100 for cat, paise in self.month_spend.get(month, {}).items() if paise}
@@ -0,0 +1,319 @@
+"""
+Non-interactive command-line interface.
+
+    python -m src.main add --amount 250 --category Food --date 2024-03-01 -d "Lunch"
+    python -m src.main import statement.csv --map date="Txn Date" --map amount=Debit
+    python -m src.main summary
+    python -m src.main report --month 2024-03
+    python -m src.main charts [--open]
+    python -m src.main backup [--prune]
+    python -m src.main search groceries | --category Food | --from 2024-01-01 --to 2024-01-31
+    python -m src.main batch nightly.txt
+
+`batch` reads one command per line (same syntax, without the program
+name; blank lines and '#' comments are skipped) and runs them all
+against one Session, so the ledger is parsed and indexed only once.
+
+Without a command, src.main starts the interactive menu as before.
+"""
+
+import argparse
+import shlex
+import sys
+from src import backup_catalog
+from src.locking import file_lock
+from src.file_manager import DATA_FILE, BACKUP_DIR, backup_data, iter_expenses, file_stamp
+from src.importer import import_csv, import_jsonl
+from src.indexes import SecondaryIndexes
+from src.expense import Expense
+from src.repository import ExpenseRepository
+from src.rollups import RollupStore
+from src.search_index import KeywordIndex
+from src.budget_manager import budget_alerts
+from src.utils import validate_amount, validate_date, validate_category, format_currency
+
+
+# Upper bound for `search --min` without --max
+MAX_AMOUNT = 10 ** 12
+
+
+class CommandError(Exception):
+    """A command could not be carried out (bad input, missing file...)."""
+
+
+class Session:
+    """
+        One repository and its derived indexes, shared by every command
+        of a process (a single command or a whole batch file).
+    """
+
+    def __init__(self, data_file=DATA_FILE):
+        self.data_file = data_file
+        self.repo = ExpenseRepository(data_file)
+        self.rollups = RollupStore(data_file)
+        self.keyword_index = KeywordIndex(data_file)
+        self.indexes = SecondaryIndexes()
+        self.in_batch = False
+        for listener in (self.rollups, self.keyword_index, self.indexes):
+            self.repo.add_listener(listener)
+
+    def close(self):
+        # Same housekeeping as leaving the menu; compaction writes out the
+        # loaded rows (no re-parse), and indexes are only saved when they
+        # reflect the current file
+        self.repo.compact()
+        if self.repo.is_fresh():
+            self.keyword_index.save()
+            self.rollups.save()
+
+
+# ----------------------------------------------------------------------
+# Commands: each takes (session, args) and prints its result
+# ----------------------------------------------------------------------
+
+def _validated(validator, value):
+    ok, result = validator(value)
+    if not ok:
+        raise CommandError(result)
+    return result
+
+
+def cmd_add(session, args):
+    exp = Expense(
+        amount=_validated(validate_amount, args.amount),
+        category=_validated(validate_category, args.category),
+        date=_validated(validate_date, args.date),
+        description=args.description.strip(),
+    )
+    repo, rollups = session.repo, session.rollups
+    with file_lock(session.data_file):
+        # Without loaded rows the append writes one row and parses nothing;
+        # rollups saved for the file before it then follow the new row
+        follow = not repo.is_fresh() and rollups.load()
+        repo.append(exp)
+        if follow:
+            rollups.add(exp)
+            rollups.save()
+    print(f"Added: {exp}")
+    for alert in budget_alerts(rollups.refresh(repo).summary()):
+        print(alert)
+
+
+def _parse_mapping(pairs):
+    mapping = {}
+    for pair in pairs or ():
+        field, sep, column = pair.partition("=")
+        if not sep or field not in ("date", "category", "amount", "description"):
+            raise CommandError(f"Invalid mapping '{pair}' (expected field=Column)")
+        mapping[field] = column
+    return mapping
+
+
+def cmd_import(session, args):
+    fmt = args.format or ("jsonl" if str(args.path).lower().endswith((".jsonl", ".ndjson")) else "csv")
+    options = {"chunk_size": args.chunk_size}
+    if args.rejects:
+        options["rejects_path"] = args.rejects
+    try:
+        if fmt == "jsonl":
+            result = import_jsonl(args.path, session.data_file, _parse_mapping(args.map), **options)
+        else:
+            result = import_csv(args.path, session.data_file, _parse_mapping(args.map),
+                                delimiter=args.delimiter, **options)
+    except FileNotFoundError:
+        raise CommandError(f"File not found: {args.path}")
+    print(f"Imported {result.imported} row(s), rejected {result.rejected} "
+          f"({result.rows_per_minute:,.0f} rows/minute)")
+    if result.rejected:
+        print(f"Rejected rows: {result.rejects_path}")
+
+
+def cmd_summary(session, args):
+    summary = session.rollups.refresh(session.repo).summary()
+    if not summary:
+        print("No expenses.")
+        return
+    for cat, amt in sorted(summary.by_category.items(), key=lambda x: -x[1]):
+        print(f"{cat:15} {format_currency(amt)}")
+    print("Total:", format_currency(summary.total))
+    print("Average per record:", format_currency(summary.average))
+    for alert in budget_alerts(summary):
+        print(alert)
+
+
+def cmd_report(session, args):
+    from src.reports import generate_monthly_report
+    # Rows of the month only, and none when the data file is unchanged
+    source = file_stamp(session.data_file)
+    rows = iter_expenses(session.data_file, start=args.month, end=args.month + "-31")
+    print(generate_monthly_report(rows, args.month, source=source))
+
+
+def cmd_charts(session, args):
+    from src.reports import render_all_charts
+    paths = render_all_charts(session.rollups.refresh(session.repo).summary(), open_files=args.open)
+    if not paths:
+        print("No expenses available for chart generation.")
+    for path in paths.values():
+        print(path)
+
+
+def cmd_backup(session, args):
+    result = backup_data(session.data_file)
+    print(result.path)
+    print(f"{result.bytes:,} bytes in {result.seconds:.2f}s ({result.mb_per_second:.1f} MB/s), "
+          f"{result.new_chunks} new chunk(s)")
+    if args.prune:
+        for entry in backup_catalog.prune(BACKUP_DIR):
+            print("Pruned", entry.name)
+
+
+def cmd_search(session, args):
+    session.repo.sync()
+    indexes = session.indexes
+    if args.category:
+        rows = indexes.in_category(args.category)
+    elif args.on:
+        rows = indexes.on_date(_validated(validate_date, args.on))
+    elif args.date_from or args.date_to:
+        if not (args.date_from and args.date_to):
+            raise CommandError("--from and --to must be used together")
+        rows = indexes.date_between(_validated(validate_date, args.date_from),
+                                    _validated(validate_date, args.date_to))
+    elif args.min is not None or args.max is not None:
+        try:
+            rows = indexes.amount_between(args.min if args.min is not None else 0,
+                                          args.max if args.max is not None else MAX_AMOUNT)
+        except ValueError as e:
+            raise CommandError(str(e))
+    elif args.query:
+        rows = session.keyword_index.search(" ".join(args.query))
+    else:
+        raise CommandError("Nothing to search for")
+    print(f"Found {len(rows)} result(s):")
+    for exp in session.repo.rows(rows):
+        print(exp)
+
+
+def cmd_batch(session, args):
+    failures = run_batch(session, args.file, stop_on_error=args.stop_on_error)
+    if failures:
+        raise CommandError(f"{failures} command(s) failed")
+
+
+# ----------------------------------------------------------------------
+# Parser / dispatch
+# ----------------------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="Personal Finance Manager")
+    parser.add_argument("--data", default=DATA_FILE, help="data file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", metavar="command")
+
+    p = sub.add_parser("add", help="add one expense")
+    p.add_argument("--amount", required=True)
+    p.add_argument("--category", required=True)
+    p.add_argument("--date", required=True, help="YYYY-MM-DD")
+    p.add_argument("-d", "--description", default="")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("import", help="bulk import a CSV / JSONL file")
+    p.add_argument("path")
+    p.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    p.add_argument("--map", action="append", metavar="FIELD=COLUMN",
+                   help="source column for date/category/amount/description (repeatable)")
+    p.add_argument("--delimiter", default=",")
+    p.add_argument("--chunk-size", type=int, default=10000)
+    p.add_argument("--rejects", help="where to write rejected rows")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("summary", help="category-wise summary and budget alerts")
+    p.set_defaults(func=cmd_summary)
+
+    p = sub.add_parser("report", help="write a monthly (or yearly) CSV report")
+    p.add_argument("--month", required=True, help="YYYY-MM or YYYY")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("charts", help="render all charts")
+    p.add_argument("--open", action="store_true", help="open the images afterwards")
+    p.set_defaults(func=cmd_charts)
+
+    p = sub.add_parser("backup", help="create a backup of the data file")
+    p.add_argument("--prune", action="store_true",
+                   help="then apply the daily/weekly/monthly retention policy")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("search", help="search by keyword, category, date or amount")
+    p.add_argument("query", nargs="*", help="keywords (prefixes, 'OR' for any)")
+    p.add_argument("--category")
+    p.add_argument("--on", metavar="DATE")
+    p.add_argument("--from", dest="date_from", metavar="DATE")
+    p.add_argument("--to", dest="date_to", metavar="DATE")
+    p.add_argument("--min", type=float)
+    p.add_argument("--max", type=float)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("batch", help="run a file of commands in one process")
+    p.add_argument("file")
+    p.add_argument("--stop-on-error", action="store_true")
+    p.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def run_command(session, argv, parser=None):
+    """
+        Parses and runs one command against `session`.
+        Returns 0 on success, 1 on failure (the error is printed).
+    """
+    parser = parser or build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        # argparse already printed the usage error
+        return e.code or 0
+    if args.command is None:
+        parser.print_help()
+        return 1
+    if args.command == "batch" and session.in_batch:
+        print("Error: batch files cannot be nested", file=sys.stderr)
+        return 1
+    try:
+        args.func(session, args)
+    except (CommandError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_batch(session, path, stop_on_error=False):
+    """Runs every command of a batch file; returns the number of failures."""
+    parser = build_parser()
+    failures = 0
+    session.in_batch = True
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, start=1):
+                argv = shlex.split(line, comments=True)
+                if not argv:
+                    continue
+                print(f"$ {' '.join(argv)}")
+                if run_command(session, argv, parser):
+                    failures += 1
+                    print(f"Error: line {line_no} failed", file=sys.stderr)
+                    if stop_on_error:
+                        break
+    finally:
+        session.in_batch = False
+    return failures
+
+
+def main(argv):
+    """Entry point for `python -m src.main <command> ...`; returns the exit code."""
+    parser = build_parser()
+    data = parser.parse_known_args(argv)[0].data
+    session = Session(data)
+    try:
+        return run_command(session, argv, parser)
+    finally:
+        session.close()
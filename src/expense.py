@@ -6,6 +6,8 @@ Represents a single financial transaction.
 """
 
 from dataclasses import dataclass
+from datetime import date as _date, datetime
+from src.utils import to_paise
 
 
 @dataclass
@@ -29,6 +31,11 @@ class Expense:
         # ensure amount is float
         self.amount = float(self.amount)
 
+    @property
+    def month(self):
+        """'YYYY-MM' key of the transaction date (parsed on every access)."""
+        return datetime.strptime(self.date, "%Y-%m-%d").strftime("%Y-%m")
+
     def to_row(self):
         """Return list representing CSV row"""
         # Converts object into CSV-compatible row
@@ -37,3 +44,78 @@ class Expense:
     def __str__(self):
         # User-friendly string representation for CLI display
         return f"{self.date} | {self.category}: ₹{self.amount:.2f} - {self.description}"
+
+
+class CompactExpense:
+    """
+        Memory-lean Expense variant for large ledgers.
+
+        Same public interface as Expense (amount, category, date,
+        description, month, to_row, __str__) but:
+        - __slots__, so no per-instance __dict__
+        - amount stored as integer paise
+        - date stored as a day ordinal, parsed once on assignment
+        - month key ('YYYY-MM') computed once and cached
+    """
+    __slots__ = ('paise', 'category', 'ordinal', 'description', '_month')
+
+    def __init__(self, amount, category, date, description):
+        self.amount = amount
+        self.category = category
+        self.date = date
+        self.description = description
+
+    @classmethod
+    def from_parts(cls, paise, category, ordinal, description):
+        # Build directly from already-parsed values (no float / date parsing)
+        obj = cls.__new__(cls)
+        obj.paise = paise
+        obj.category = category
+        obj.ordinal = ordinal
+        obj.description = description
+        obj._month = None
+        return obj
+
+    @property
+    def amount(self):
+        return self.paise / 100
+
+    @amount.setter
+    def amount(self, value):
+        self.paise = to_paise(value)
+
+    @property
+    def date(self):
+        return _date.fromordinal(self.ordinal).isoformat()
+
+    @date.setter
+    def date(self, value):
+        # Raises ValueError for anything that is not YYYY-MM-DD
+        self.ordinal = datetime.strptime(value, "%Y-%m-%d").toordinal()
+        self._month = None
+
+    @property
+    def month(self):
+        if self._month is None:
+            d = _date.fromordinal(self.ordinal)
+            self._month = f"{d.year:04d}-{d.month:02d}"
+        return self._month
+
+    def to_row(self):
+        """Return list representing CSV row"""
+        return [self.date, self.category, f"{self.amount:.2f}", self.description]
+
+    def __str__(self):
+        return f"{self.date} | {self.category}: ₹{self.amount:.2f} - {self.description}"
+
+    def __repr__(self):
+        return (f"CompactExpense(amount={self.amount!r}, category={self.category!r}, "
+                f"date={self.date!r}, description={self.description!r})")
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactExpense):
+            return NotImplemented
+        return ((self.paise, self.category, self.ordinal, self.description) ==
+                (other.paise, other.category, other.ordinal, other.description))
+
+    __hash__ = None
@@ -6,67 +6,311 @@ Responsibilities:
 - Load expenses from CSV
 - Save expenses to CSV
 - Append records
-- Create backups
+- Create backups (incremental, deduplicated: see backup_store.py)
 - Restore backups
+
+Storage backends:
+- CSV (default)      data/expenses.csv
+- SQLite             data/expenses.db  (FINANCE_STORAGE=sqlite)
+- Month partitions   data/expenses/YYYY/MM.csv  (FINANCE_STORAGE=partitioned)
+- Binary, mmap-ed    data/expenses.fmb  (FINANCE_STORAGE=binary, see binary_ledger.py)
+Every function dispatches on the path it is given, so the formats
+can be used side by side (e.g. for migration).
+
+On the single-file CSV, edits and deletes are appended to a journal
+(see journal.py) and replayed on load until compact_journal() runs.
+
+All writes hold the file's advisory lock and rewrites go through a temp
+file + rename (see locking.py), so several processes can write safely.
 """
 
 import csv
+import io
 import os
 import shutil
-from datetime import datetime
-from src.expense import Expense
-from src.utils import PROJECT_ROOT
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from src import backup_catalog, backup_store, binary_ledger, journal, partitions, sqlite_store
+from src.expense import Expense, CompactExpense
+from src.ledger import Ledger
+from src.locking import file_lock, atomic_write
+from src.utils import PROJECT_ROOT, CSV_HEADER
 
 DATA_DIR = PROJECT_ROOT / "data"
 BACKUP_DIR = PROJECT_ROOT / "backups"
-DATA_FILE = DATA_DIR / "expenses.csv"
+CSV_FILE = DATA_DIR / "expenses.csv"
+SQLITE_FILE = DATA_DIR / "expenses.db"
+PARTITION_DIR = DATA_DIR / "expenses"
+BINARY_FILE = DATA_DIR / "expenses.fmb"
+
+# Storage backend: "csv" (default), "sqlite", "partitioned" or "binary"
+STORAGE_BACKEND = os.environ.get("FINANCE_STORAGE", "csv").lower()
+DATA_FILE = {"sqlite": SQLITE_FILE, "partitioned": PARTITION_DIR,
+             "binary": BINARY_FILE}.get(STORAGE_BACKEND, CSV_FILE)
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def is_sqlite(filename):
+    # SQLite backend is selected by file suffix
+    return Path(filename).suffix.lower() in SQLITE_SUFFIXES
+
+
+def is_partitioned(filename):
+    # Partitioned ledgers are directories (data/expenses/ with its manifest);
+    # a path that does not exist yet and has no file suffix becomes a new one
+    path = Path(filename)
+    if path.exists():
+        return path.is_dir()
+    return path.suffix == ""
+
+
+def is_binary(filename):
+    return Path(filename).suffix.lower() == binary_ledger.SUFFIX
+
+
+def is_journaled(filename):
+    # Single-file CSV: edits and deletes go to the journal
+    return not (is_sqlite(filename) or is_partitioned(filename) or is_binary(filename))
+
+
+def stamp_paths(filename):
+    """Files whose stat changes on every write to this ledger."""
+    if is_sqlite(filename):
+        # WAL mode: committed writes may only touch the -wal file
+        return [filename, f"{filename}-wal"]
+    if is_partitioned(filename):
+        return [Path(filename) / partitions.MANIFEST_NAME]
+    if is_binary(filename):
+        return [filename]
+    return [filename, journal.journal_path_for(filename)]
 
-CSV_HEADER = ['Date', 'Category', 'Amount', 'Description']
 
+def file_stamp(filename):
+    """
+        Change detector for caches: (inode, size, mtime_ns) of every file
+        in stamp_paths(), None for missing ones.
+    """
+    stamp = []
+    for path in stamp_paths(filename):
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
 
-def ensure_dirs():
+
+def ensure_dirs(filename=DATA_FILE):
     """
-        Ensures required directories exist before file operations.
+        Ensures the data file `filename` and its directory exist before
+        file operations (only what that target needs; backup_data()
+        creates the backup directory itself).
         Prevents runtime FileNotFound errors.
     """
-    DATA_DIR.mkdir(exist_ok=True)
-    BACKUP_DIR.mkdir(exist_ok=True)
+    Path(filename).parent.mkdir(parents=True, exist_ok=True)
 
-    # ensure file exists with header
-    if not os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'w', newline='', encoding='utf-8') as f:
+    # ensure file exists with header (or schema, for SQLite)
+    if is_sqlite(filename):
+        if not os.path.exists(filename):
+            sqlite_store.init(filename)
+    elif is_partitioned(filename):
+        os.makedirs(filename, exist_ok=True)
+    elif is_binary(filename):
+        if not os.path.exists(filename):
+            binary_ledger.write(filename, [])
+    elif not os.path.exists(filename):
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(CSV_HEADER)
 
 
-def load_expenses(filename=DATA_FILE):
+def iter_expenses(filename=DATA_FILE, *, start=None, end=None, categories=None, compact=False,
+                  keep_undated=False):
+    """
+        Streams expenses from CSV one row at a time (constant memory).
+
+        Filters are checked on the raw CSV fields, before any Expense
+        object is built:
+        - start / end: inclusive date bounds as 'YYYY-MM-DD' strings.
+          ISO dates sort as text, so a prefix such as '2024-01' also works.
+        - categories: iterable of category names to keep
+        - keep_undated: with compact=True, a row whose date is not
+          YYYY-MM-DD comes back as a plain Expense instead of being skipped
+    """
+    ensure_dirs(filename)
+    if is_sqlite(filename):
+        yield from sqlite_store.iter_expenses(filename, start, end, categories, compact, keep_undated)
+    elif is_partitioned(filename):
+        # Only partitions overlapping [start, end] are opened
+        for part in partitions.partition_files(filename, start, end):
+            for _, exp in _iter_csv(part, start, end, categories, compact, keep_undated=keep_undated):
+                yield exp
+    elif is_binary(filename):
+        yield from binary_ledger.iter_expenses(filename, start, end, categories, compact)
+    else:
+        f, overlay = _open_journaled(filename)
+        with f:
+            for _, exp in _read_csv(f, start, end, categories, compact, overlay, keep_undated):
+                yield exp
+
+
+def _open_journaled(filename):
+    """
+        Opens a single-file CSV and replays its journal under a shared
+        lock, so a compaction (new base file, journal removed) can't fall
+        between the two. The open file keeps reading that same base file
+        after the lock is released.
+        Returns (file, (updates, deleted)).
+    """
+    with file_lock(filename, shared=True):
+        f = open(filename, newline='', encoding='utf-8')
+        try:
+            return f, journal.load_journal(filename)
+        except BaseException:
+            f.close()
+            raise
+
+
+def _iter_csv(filename, start, end, categories, compact, overlay=None, keep_undated=False):
+    """
+        Row reader shared by the single-file and partitioned CSV layouts.
+        Yields (row_id, expense); row_id counts every data row of the file.
+        overlay = (updates, deleted) from the edit journal, if any.
+        The generator returns the number of data rows read (the next row id).
+    """
+    with open(filename, newline='', encoding='utf-8') as f:
+        return (yield from _read_csv(f, start, end, categories, compact, overlay, keep_undated))
+
+
+def _read_csv(f, start, end, categories, compact, overlay=None, keep_undated=False):
+    # _iter_csv() over an open file
+    updates, deleted = overlay or ({}, set())
+    wanted = set(categories) if categories is not None else None
+    reader = csv.DictReader(f)
+    row_id = -1
+    for row_id, row in enumerate(reader):
+        if row_id in deleted:
+            continue
+        row = updates.get(row_id, row)
+        d = row.get('Date') or ""
+        if start is not None and d < start:
+            continue
+        if end is not None and d > end:
+            continue
+        if wanted is not None and row.get('Category') not in wanted:
+            continue
+        exp = row_to_expense(row, compact, keep_undated)
+        if exp is not None:
+            yield row_id, exp
+    return row_id + 1
+
+
+def row_to_expense(row, compact=False, keep_undated=False):
+    """
+        Builds an Expense (CompactExpense) from one CSV row dict;
+        None for blank or malformed rows, which every reader skips.
+        A CompactExpense needs a YYYY-MM-DD date: with keep_undated such
+        a row is returned as a plain Expense, otherwise it is skipped.
+    """
+    if not row or all(((row.get(h) or "").strip() == "") for h in CSV_HEADER):
+        return None
+    try:
+        fields = dict(
+            amount=float(row['Amount']),
+            category=row['Category'],
+            date=row.get('Date') or "",
+            description=row['Description']
+        )
+    except Exception:
+        return None
+    if compact:
+        try:
+            return CompactExpense(**fields)
+        except ValueError:
+            if not keep_undated:
+                return None
+    return Expense(**fields)
+
+
+def load_expenses(filename=DATA_FILE, compact=False, keep_undated=False):
     """
         Loads expenses from CSV file into Expense objects.
 
         Algorithm:
-        - Read CSV rows
+        - Read CSV rows (see iter_expenses)
         - Validate content
         - Convert rows → Expense objects
+          (CompactExpense when compact=True; rows with bad dates are
+          skipped, or kept as plain Expense objects with keep_undated=True)
     """
-    ensure_dirs()
-    expenses = []
+    return list(iter_expenses(filename, compact=compact, keep_undated=keep_undated))
+
+
+def load_with_row_ids(filename=DATA_FILE, compact=False, keep_undated=False):
+    """
+        Loads a single-file CSV (or SQLite) ledger together with the stable
+        row ids: base-file row ids, or primary keys on SQLite.
+        Returns (expenses, row_ids, next_row_id); next_row_id is the id
+        the next appended row will get (None on SQLite, which assigns it).
+        The CSV and its journal are read under one shared lock, so no
+        write can land between them; the row count comes from the same pass.
+    """
+    ensure_dirs(filename)
+    if is_sqlite(filename):
+        return (*sqlite_store.load_with_ids(filename, compact, keep_undated), None)
+    row_ids, expenses = [], []
+    with file_lock(filename, shared=True):
+        overlay = journal.load_journal(filename)
+        rows = _iter_csv(filename, None, None, None, compact, overlay, keep_undated)
+        while True:
+            try:
+                row_id, exp = next(rows)
+            except StopIteration as done:
+                # Every physical row counted in the same pass
+                return expenses, row_ids, done.value
+            row_ids.append(row_id)
+            expenses.append(exp)
+
+
+def count_rows(filename):
+    # Physical data rows in a CSV file (what the next row id will be)
+    with open(filename, newline='', encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+def load_ledger(filename=DATA_FILE):
+    """
+        Loads expenses from CSV file into a columnar Ledger.
+
+        Same row rules as load_expenses(), but no Expense object is
+        kept per row; rows with an unparseable date are skipped too.
+        A binary ledger is memory-mapped instead of parsed (read-only).
+    """
+    ensure_dirs(filename)
+    if is_binary(filename):
+        return binary_ledger.open_ledger(filename)
+    if is_sqlite(filename) or is_partitioned(filename) or journal.has_journal(filename):
+        return Ledger.from_expenses(iter_expenses(filename, compact=True))
+    ledger = Ledger()
     with open(filename, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            if not row or all((row.get(h, "").strip() == "") for h in CSV_HEADER):
+            if not row or all(((row.get(h) or "").strip() == "") for h in CSV_HEADER):
                 continue
             try:
-                exp = Expense(
-                    amount=float(row['Amount']),
-                    category=row['Category'],
-                    date=row['Date'],
-                    description=row['Description']
+                ledger.append(
+                    float(row['Amount']),
+                    row['Category'],
+                    row['Date'],
+                    row['Description']
                 )
-                expenses.append(exp)
             except Exception:
                 # skip malformed rows
                 continue
-    return expenses
+    return ledger
 
 
 def save_expenses(expenses, filename=DATA_FILE):
@@ -74,41 +318,312 @@ def save_expenses(expenses, filename=DATA_FILE):
         Saves a list of Expense objects into CSV.
         Overwrites existing data safely.
     """
-    ensure_dirs()
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(CSV_HEADER)
-        for e in expenses:
-            writer.writerow(e.to_row())
+    ensure_dirs(filename)
+    if is_sqlite(filename):
+        sqlite_store.insert_many(filename, expenses, replace=True)
+        return
+    with file_lock(filename):
+        if is_partitioned(filename):
+            partitions.write_partitions(filename, expenses)
+            return
+        if is_binary(filename):
+            binary_ledger.write(filename, expenses)
+            return
+        with atomic_write(filename) as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for e in expenses:
+                writer.writerow(e.to_row())
+        # Row ids restart with the new base file, so old journal records are void
+        journal.remove_journal(filename)
+
+
+def _append_rows(filename, expenses, fsync=False):
+    # One locked write per call; the header is added if the file is new
+    if is_binary(filename):
+        with file_lock(filename):
+            if os.path.exists(filename):
+                binary_ledger.append(filename, expenses)
+            else:
+                binary_ledger.write(filename, expenses)
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerows(e.to_row() for e in expenses)
+    with file_lock(filename):
+        new_file = not os.path.exists(filename)
+        with open(filename, 'a', newline='', encoding='utf-8') as f:
+            if new_file:
+                csv.writer(f).writerow(CSV_HEADER)
+            f.write(buf.getvalue())
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
 
 
 def append_expense(expense: Expense, filename=DATA_FILE):
-    ensure_dirs()
+    ensure_dirs(filename)
+    if is_sqlite(filename):
+        sqlite_store.insert(filename, expense)
+        return
+    if is_partitioned(filename):
+        with file_lock(filename):
+            partitions.append_partitioned(filename, expense)
+        return
     # append single expense
-    with open(filename, 'a', newline='', encoding='utf-8') as f:
+    _append_rows(filename, [expense])
+
+
+class ExpenseWriter:
+    """
+        Buffered appender that writes rows in group commits.
+
+        Usage:
+            with ExpenseWriter() as writer:
+                for e in feed:
+                    writer.write(e)
+
+        Rows are buffered and committed together once `flush_size` rows
+        are pending or `flush_interval` seconds have passed since the
+        last commit (checked on write), and on close. Each commit is one
+        write under the file lock, so writers in several processes never
+        interleave rows; fsync=True forces every commit to disk.
+
+        Attributes:
+        - rows_written (int): rows committed so far
+        - commits (int): number of group commits
+    """
+
+    def __init__(self, filename=DATA_FILE, flush_size=1000, flush_interval=1.0, fsync=False):
+        self.filename = filename
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.rows_written = 0
+        self.commits = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def open(self):
+        ensure_dirs(self.filename)
+        return self
+
+    def write(self, expense: Expense):
+        self._buffer.append(expense)
+        if (len(self._buffer) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def write_many(self, expenses):
+        for e in expenses:
+            self.write(e)
+
+    def flush(self):
+        """Commits all buffered rows as one write."""
+        if self._buffer:
+            if is_sqlite(self.filename):
+                sqlite_store.insert_many(self.filename, self._buffer)
+            elif is_partitioned(self.filename):
+                with file_lock(self.filename):
+                    partitions.append_many(self.filename, self._buffer)
+            else:
+                # Reopened per commit: another process may have replaced the file
+                _append_rows(self.filename, self._buffer, self.fsync)
+            self.rows_written += len(self._buffer)
+            self.commits += 1
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def append_expenses(expenses, filename=DATA_FILE, flush_size=1000, flush_interval=1.0, fsync=False):
+    """
+        Bulk append of any iterable of expenses through an ExpenseWriter.
+        Returns the number of rows written.
+    """
+    with ExpenseWriter(filename, flush_size, flush_interval, fsync) as writer:
+        writer.write_many(expenses)
+    return writer.rows_written
+
+
+def update_expense(index, expense: Expense, filename=DATA_FILE):
+    """
+        Replaces the expense at 0-based position `index`.
+        SQLite: single-row UPDATE. CSV: journal record (no rewrite).
+        Partitioned / binary: load, replace, rewrite.
+    """
+    if is_sqlite(filename):
+        ensure_dirs(filename)
+        sqlite_store.update_expense(filename, sqlite_store.id_at(filename, index), expense)
+        return
+    with file_lock(filename):
+        if not is_journaled(filename):
+            expenses = load_expenses(filename)
+            expenses[index] = expense
+            save_expenses(expenses, filename)
+            return
+        _, row_ids, _ = load_with_row_ids(filename)
+        journal.record_update(filename, row_ids[index], expense)
+
+
+def delete_expense(index, filename=DATA_FILE):
+    """
+        Deletes the expense at 0-based position `index`.
+        SQLite: single-row DELETE. CSV: journal tombstone (no rewrite).
+        Partitioned / binary: load, pop, rewrite.
+    """
+    if is_sqlite(filename):
+        ensure_dirs(filename)
+        sqlite_store.delete_expense(filename, sqlite_store.id_at(filename, index))
+        return
+    with file_lock(filename):
+        if not is_journaled(filename):
+            expenses = load_expenses(filename)
+            expenses.pop(index)
+            save_expenses(expenses, filename)
+            return
+        _, row_ids, _ = load_with_row_ids(filename)
+        journal.record_delete(filename, row_ids[index])
+
+
+def compact_journal(filename=DATA_FILE):
+    """
+        Folds the edit journal back into a clean base CSV.
+        Returns True if there was a journal to compact.
+    """
+    if not is_journaled(filename):
+        return False
+    with file_lock(filename):
+        if not journal.has_journal(filename):
+            return False
+        save_expenses(load_expenses(filename), filename)
+    return True
+
+
+def migrate_to_sqlite(csv_path=CSV_FILE, db_path=SQLITE_FILE):
+    """
+        One-shot CSV → SQLite migration.
+        Replaces the table contents; returns the number of rows migrated.
+    """
+    return sqlite_store.insert_many(db_path, iter_expenses(csv_path), replace=True)
+
+
+def migrate_to_partitions(csv_path=CSV_FILE, root=PARTITION_DIR):
+    """
+        One-shot CSV → month-partitioned layout migration.
+        Returns the number of rows written.
+    """
+    return partitions.write_partitions(root, iter_expenses(csv_path))
+
+
+def migrate_to_binary(csv_path=CSV_FILE, bin_path=BINARY_FILE):
+    """
+        One-shot CSV → binary ledger migration (journal replayed).
+        Returns (rows written, rows skipped): the binary format has no
+        room for a row whose date is not YYYY-MM-DD, so such rows are
+        counted instead of being dropped silently.
+    """
+    with file_lock(bin_path):
+        return binary_ledger.write(bin_path, iter_expenses(csv_path, compact=True, keep_undated=True))
+
+
+def export_csv(filename=DATA_FILE, csv_path=CSV_FILE):
+    """
+        Writes any ledger (binary, SQLite, partitioned) out as a plain CSV.
+        Returns the number of rows written.
+    """
+    rows = 0
+    with file_lock(csv_path), atomic_write(csv_path) as f:
         writer = csv.writer(f)
-        writer.writerow(expense.to_row())
+        writer.writerow(CSV_HEADER)
+        for e in iter_expenses(filename):
+            writer.writerow(e.to_row())
+            rows += 1
+        journal.remove_journal(csv_path)
+    return rows
+
+
+def backup_data(filename=DATA_FILE, backup_dir=BACKUP_DIR, compression="gzip"):
+    """
+        Incremental backup into the deduplicated chunk store (backup_store.py),
+        recorded in the backup catalog (backup_catalog.py).
+        Returns the backup_store.BackupResult (manifest path, sizes, MB/s);
+        backup_store.store_stats() reports dedup over the whole store.
+    """
+    ensure_dirs(filename)
+    os.makedirs(backup_dir, exist_ok=True)
+    # The catalog lock also keeps a concurrent prune from collecting new chunks
+    with file_lock(backup_catalog.catalog_path(backup_dir)):
+        if not is_journaled(filename) or journal.has_journal(filename):
+            # Backups stay portable CSV whatever the storage backend (journal replayed)
+            start = time.perf_counter()
+            export = _temp_csv(backup_dir, ".export.")
+            try:
+                save_expenses(iter_expenses(filename), export)
+                result = backup_store.backup(export, backup_dir, compression)
+            finally:
+                os.remove(export)
+            result = replace(result, seconds=time.perf_counter() - start)
+        else:
+            with file_lock(filename):
+                result = backup_store.backup(filename, backup_dir, compression)
+        backup_catalog.add(backup_dir, result.path)
+    return result
 
 
-def backup_data():
-    ensure_dirs()
-    # Backup all saved expenses
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_name = os.path.join(BACKUP_DIR, f"expenses_backup_{timestamp}.csv")
-    shutil.copy2(DATA_FILE, backup_name)
-    return backup_name
+def _temp_csv(directory, prefix):
+    # Unique dot-file for a CSV export: concurrent backups / restores
+    # never share one, and the chunk GC skips dot-files
+    fd, path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".csv")
+    os.close(fd)
+    return path
 
 
-def list_backups():
-    ensure_dirs()
-    # list out all saved backups
-    files = sorted(os.listdir(BACKUP_DIR))
-    return [os.path.join(BACKUP_DIR, f) for f in files if f.endswith('.csv')]
+def list_backups(backup_dir=BACKUP_DIR):
+    # list out all saved backups (oldest first) from the catalog
+    return [os.path.join(backup_dir, e.name) for e in backup_catalog.load(backup_dir)]
 
 
-def restore_backup(backup_path):
-    ensure_dirs()
-    # Restored saved backup to the existing data
+def restore_backup(backup_path, filename=DATA_FILE):
+    """
+        Restores a saved backup over the data file.
+        Returns a backup_store.BackupResult for the restored file.
+    """
+    ensure_dirs(filename)
     if not os.path.exists(backup_path):
         raise FileNotFoundError("Backup not found.")
-    shutil.copy2(backup_path, DATA_FILE)
\ No newline at end of file
+    start = time.perf_counter()
+    if backup_store.is_manifest(backup_path):
+        if not is_journaled(filename):
+            export = _temp_csv(os.path.dirname(backup_path), ".restore.")
+            try:
+                result = backup_store.restore(backup_path, export)
+                save_expenses(load_expenses(export), filename)
+            finally:
+                os.remove(export)
+        else:
+            with file_lock(filename):
+                result = backup_store.restore(backup_path, filename)
+                journal.remove_journal(filename)
+        return replace(result, path=str(filename), seconds=time.perf_counter() - start)
+    # Legacy plain CSV backup
+    if not is_journaled(filename):
+        restored = load_expenses(backup_path)
+        save_expenses(restored, filename)
+        rows = len(restored)
+    else:
+        with file_lock(filename):
+            with atomic_write(filename, 'wb') as dst, open(backup_path, 'rb') as src:
+                shutil.copyfileobj(src, dst)
+            journal.remove_journal(filename)
+        rows = count_rows(filename)
+    return backup_store.BackupResult(str(filename), os.path.getsize(backup_path), 0, 0, 0,
+                                     time.perf_counter() - start, rows)
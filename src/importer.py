@@ -0,0 +1,172 @@
+"""
+Bulk import of external expense files (bank statements, exports).
+
+Supported inputs:
+- CSV with a configurable column mapping
+- JSONL (one JSON object per line) with the same mapping
+
+Pipeline:
+- Stream the source file, chunk_size records at a time
+- Validate every record with utils.validate_amount / validate_date /
+  validate_category
+- Write valid rows straight to storage through an ExpenseWriter
+  (one group commit per chunk)
+- Write rejected rows, with line number and reason, to a CSV report
+  (created on the first reject only, under a unique name)
+"""
+
+import csv
+import json
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from src.expense import Expense
+from src.file_manager import DATA_FILE, ExpenseWriter
+from src.utils import PROJECT_ROOT, validate_amount, validate_date, validate_category
+
+REJECTS_DIR = PROJECT_ROOT / "reports"
+
+# Our field -> source column; override per bank format
+DEFAULT_MAPPING = {
+    "date": "Date",
+    "category": "Category",
+    "amount": "Amount",
+    "description": "Description",
+}
+
+REJECTS_HEADER = ['Line', 'Reason', 'Record']
+
+
+@dataclass
+class ImportResult:
+    """
+        Outcome of one import run.
+    """
+    imported: int
+    rejected: int
+    rejects_path: str       # None when no row was rejected
+    seconds: float
+
+    @property
+    def rows_per_minute(self):
+        total = self.imported + self.rejected
+        return total / self.seconds * 60 if self.seconds else 0.0
+
+
+def _csv_records(path, delimiter, encoding):
+    # (line number, record dict); header is line 1
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        for record in reader:
+            yield reader.line_num, record
+
+
+def _jsonl_records(path, encoding):
+    with open(path, encoding=encoding) as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_no, record if isinstance(record, dict) else {"_raw": line.rstrip("\n")}
+
+
+def _open_rejects(rejects_path):
+    # (file, path) of a new rejects report; by default a unique file in
+    # reports/, so two imports in the same second never share one
+    if rejects_path is not None:
+        return open(rejects_path, 'w', newline='', encoding='utf-8'), rejects_path
+    REJECTS_DIR.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=REJECTS_DIR, suffix=".csv",
+                                prefix=f"import_rejects_{datetime.now().strftime('%Y%m%d_%H%M%S')}_")
+    return os.fdopen(fd, 'w', newline='', encoding='utf-8'), path
+
+
+def validate_record(record, mapping, date_cache):
+    """
+        Returns (Expense, None) for a valid record, (None, reason) otherwise.
+        date_cache memoises validate_date: statements repeat the same dates.
+    """
+    raw_amount = record.get(mapping["amount"])
+    raw_date = record.get(mapping["date"])
+    raw_category = record.get(mapping["category"])
+    if raw_amount is None or raw_date is None or raw_category is None:
+        return None, "Missing required column(s)."
+
+    ok, amount = validate_amount(str(raw_amount).strip().replace(",", ""))
+    if not ok:
+        return None, amount
+
+    raw_date = str(raw_date).strip()
+    checked = date_cache.get(raw_date)
+    if checked is None:
+        checked = date_cache[raw_date] = validate_date(raw_date)
+    ok, date = checked
+    if not ok:
+        return None, date
+
+    ok, category = validate_category(str(raw_category))
+    if not ok:
+        return None, category
+
+    description = record.get(mapping["description"]) or ""
+    return Expense(amount=amount, category=category, date=date, description=str(description).strip()), None
+
+
+def import_records(records, target=DATA_FILE, mapping=None, chunk_size=10000, rejects_path=None, fsync=False):
+    """
+        Validates and imports (line_no, record) pairs in chunks.
+        Returns an ImportResult.
+    """
+    mapping = {**DEFAULT_MAPPING, **(mapping or {})}
+
+    start = time.perf_counter()
+    imported = rejected = 0
+    date_cache = {}
+    records = iter(records)
+    rejects = None
+    with ExitStack() as stack:
+        writer = stack.enter_context(
+            ExpenseWriter(target, flush_size=chunk_size, flush_interval=float("inf"), fsync=fsync))
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            valid = []
+            for line_no, record in chunk:
+                exp, reason = validate_record(record, mapping, date_cache)
+                if exp is None:
+                    if rejects is None:
+                        rf, rejects_path = _open_rejects(rejects_path)
+                        rejects = csv.writer(stack.enter_context(rf))
+                        rejects.writerow(REJECTS_HEADER)
+                    rejects.writerow([line_no, reason, json.dumps(record, ensure_ascii=False)])
+                    rejected += 1
+                else:
+                    valid.append(exp)
+            writer.write_many(valid)
+            writer.flush()
+            imported += len(valid)
+
+    return ImportResult(imported, rejected, str(rejects_path) if rejected else None, time.perf_counter() - start)
+
+
+def import_csv(path, target=DATA_FILE, mapping=None, delimiter=",", encoding="utf-8", **options):
+    """
+        Imports a CSV file; `mapping` maps date/category/amount/description
+        to the file's column names. Options: chunk_size, rejects_path, fsync.
+    """
+    return import_records(_csv_records(path, delimiter, encoding), target, mapping, **options)
+
+
+def import_jsonl(path, target=DATA_FILE, mapping=None, encoding="utf-8", **options):
+    """
+        Imports a JSONL file (one object per line) with the same mapping rules.
+    """
+    return import_records(_jsonl_records(path, encoding), target, mapping, **options)
@@ -0,0 +1,148 @@
+"""
+Sorted secondary indexes for date, amount and category lookups.
+
+- RangeIndex: keys kept sorted in an array, with the row id of each
+  key alongside; point and range lookups are two bisects, so
+  O(log n + k) instead of scanning every row.
+- SecondaryIndexes: date-ordinal and amount (paise) RangeIndexes plus a
+  category → row ids map. It follows an ExpenseRepository as a
+  listener, so it stays in sync with appends, edits and deletes.
+  Rows are keyed by the repository's stable row ids: a delete removes
+  one entry per index and leaves every other row's id alone.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from src.utils import to_paise
+
+
+class RangeIndex:
+    """
+        Sorted (key, row) pairs stored as two parallel arrays.
+    """
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.keys = array('q', (k for k, _ in pairs))
+        self.rows = array('q', (r for _, r in pairs))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def insert(self, key, row):
+        # Keep equal keys in row order
+        i = bisect_right(self.keys, key)
+        while i > 0 and self.keys[i - 1] == key and self.rows[i - 1] > row:
+            i -= 1
+        self.keys.insert(i, key)
+        self.rows.insert(i, row)
+
+    def remove(self, key, row):
+        i, j = bisect_left(self.keys, key), bisect_right(self.keys, key)
+        for k in range(i, j):
+            if self.rows[k] == row:
+                del self.keys[k]
+                del self.rows[k]
+                return
+
+    def between(self, lo, hi):
+        """Row ids with lo <= key <= hi, in key order."""
+        return self.rows[bisect_left(self.keys, lo):bisect_right(self.keys, hi)].tolist()
+
+    def equal(self, key):
+        return self.between(key, key)
+
+
+def _paise_bound(amount):
+    # ±inf compares with the int keys as is
+    amount = float(amount)
+    return amount if math.isinf(amount) else to_paise(amount)
+
+
+def _ordinal(expense):
+    # CompactExpense already carries the ordinal; Expense needs one parse.
+    # None for a row without a valid date (left out of the date index)
+    ordinal = getattr(expense, "ordinal", None)
+    if ordinal is not None:
+        return ordinal
+    try:
+        return date.fromisoformat(expense.date).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+class SecondaryIndexes:
+    """
+        Date / amount / category indexes over one ledger's row ids.
+    """
+
+    def __init__(self, expenses=()):
+        self.reset(expenses)
+
+    def reset(self, expenses, row_ids=None):
+        # row_ids: the rows' ids, positions when not given
+        dated, amounts = [], []
+        self.by_category = {}
+        for i, e in zip(range(len(expenses)) if row_ids is None else row_ids, expenses):
+            ordinal = _ordinal(e)
+            if ordinal is not None:
+                dated.append((ordinal, i))
+            amounts.append((to_paise(e.amount), i))
+            self.by_category.setdefault(e.category.lower(), []).append(i)
+        self.by_date = RangeIndex(dated)
+        self.by_amount = RangeIndex(amounts)
+        self.rows = len(self.by_amount)
+
+    def _insert(self, row, e):
+        ordinal = _ordinal(e)
+        if ordinal is not None:
+            self.by_date.insert(ordinal, row)
+        self.by_amount.insert(to_paise(e.amount), row)
+        insort(self.by_category.setdefault(e.category.lower(), []), row)
+
+    def _remove(self, row, e):
+        ordinal = _ordinal(e)
+        if ordinal is not None:
+            self.by_date.remove(ordinal, row)
+        self.by_amount.remove(to_paise(e.amount), row)
+        rows = self.by_category.get(e.category.lower(), [])
+        i = bisect_left(rows, row)
+        if i < len(rows) and rows[i] == row:
+            rows.pop(i)
+
+    def add(self, expense, row_id):
+        self._insert(row_id, expense)
+        self.rows += 1
+
+    def replace(self, row_id, old, new):
+        self._remove(row_id, old)
+        self._insert(row_id, new)
+
+    def remove(self, row_id, expense):
+        self._remove(row_id, expense)
+        self.rows -= 1
+
+    # ------------------------------------------------------------------
+    # Queries (row ids)
+    # ------------------------------------------------------------------
+
+    def on_date(self, date_str):
+        return self.by_date.equal(date.fromisoformat(date_str).toordinal())
+
+    def date_between(self, start, end):
+        """Rows dated start..end inclusive ('YYYY-MM-DD'), oldest first."""
+        return self.by_date.between(date.fromisoformat(start).toordinal(),
+                                    date.fromisoformat(end).toordinal())
+
+    def amount_between(self, min_amount, max_amount):
+        """
+            Rows with min <= amount <= max, cheapest first. An infinite
+            bound is no bound; ValueError for nan.
+        """
+        return self.by_amount.between(_paise_bound(min_amount), _paise_bound(max_amount))
+
+    def in_category(self, category):
+        # Case-insensitive, like the menu's category search
+        return list(self.by_category.get(category.lower(), []))
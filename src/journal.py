@@ -0,0 +1,102 @@
+"""
+Append-only edit journal for the single-file CSV ledger.
+
+Editing or deleting one expense used to rewrite the whole CSV. Instead,
+the change is appended to a small journal next to it
+(data/expenses.csv → data/expenses.journal):
+
+    Op,RowId,Date,Category,Amount,Description
+    U,17,2024-01-05,Transport,460.00,Auto rickshaw     ← update
+    D,3,,,,                                           ← tombstone
+
+RowId is the stable position of the row in the base CSV (0 = first
+data row), so a single edit or delete costs O(1) I/O. Readers replay
+the journal over the base file; compaction folds it back into a clean
+base file and removes the journal (see file_manager.compact_journal).
+"""
+
+import csv
+import os
+from pathlib import Path
+from src.locking import file_lock
+
+JOURNAL_HEADER = ['Op', 'RowId', 'Date', 'Category', 'Amount', 'Description']
+
+# Compact once the journal grows past this share of the base file size
+COMPACT_RATIO = 0.10
+
+
+def journal_path_for(data_file):
+    """data/expenses.csv → data/expenses.journal"""
+    return Path(data_file).with_suffix(".journal")
+
+
+def _append(data_file, record):
+    # Same lock as the data file: a record can't race a compaction
+    path = journal_path_for(data_file)
+    with file_lock(data_file):
+        new_file = not path.exists()
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(JOURNAL_HEADER)
+            writer.writerow(record)
+
+
+def record_update(data_file, row_id, expense):
+    """Journal a replacement of base row `row_id`."""
+    _append(data_file, ['U', row_id, *expense.to_row()])
+
+
+def record_delete(data_file, row_id):
+    """Journal a tombstone for base row `row_id`."""
+    _append(data_file, ['D', row_id, '', '', '', ''])
+
+
+def load_journal(data_file):
+    """
+        Replays the journal.
+        Returns (updates, deleted):
+        - updates: {row_id: CSV row dict} latest version of edited rows
+        - deleted: set of tombstoned row ids
+    """
+    updates, deleted = {}, set()
+    path = journal_path_for(data_file)
+    if not path.exists():
+        return updates, deleted
+    with open(path, newline='', encoding='utf-8') as f:
+        for rec in csv.DictReader(f):
+            try:
+                row_id = int(rec['RowId'])
+            except (TypeError, ValueError):
+                continue
+            if rec['Op'] == 'D':
+                deleted.add(row_id)
+                updates.pop(row_id, None)
+            elif rec['Op'] == 'U' and row_id not in deleted:
+                updates[row_id] = {h: rec[h] for h in ('Date', 'Category', 'Amount', 'Description')}
+    return updates, deleted
+
+
+def has_journal(data_file):
+    return journal_path_for(data_file).exists()
+
+
+def remove_journal(data_file):
+    try:
+        os.remove(journal_path_for(data_file))
+    except FileNotFoundError:
+        pass
+
+
+def needs_compaction(data_file, ratio=COMPACT_RATIO):
+    """True once the journal is large relative to the base file."""
+    try:
+        journal_size = os.path.getsize(journal_path_for(data_file))
+    except FileNotFoundError:
+        return False
+    try:
+        base_size = os.path.getsize(data_file)
+    except FileNotFoundError:
+        base_size = 0
+    return journal_size > base_size * ratio
@@ -0,0 +1,185 @@
+"""
+Columnar, array-backed storage for large expense histories.
+
+Instead of keeping one Expense object per row, the Ledger stores every
+field in its own compact column:
+- amounts      → array('q') of integer paise
+- dates        → array('i') of day ordinals (date.toordinal())
+- categories   → array('H') of codes into a small category table
+- descriptions → one packed string buffer + array('Q') of offsets
+
+CompactExpense views are only created on demand (indexing / iteration), so
+existing menu code keeps working while aggregations run on the columns.
+"""
+
+from array import array
+from collections import defaultdict
+from datetime import date
+
+from src.expense import Expense, CompactExpense
+from src.utils import to_paise
+
+
+class Ledger:
+    """
+        Column store of expenses.
+
+        Rows are addressed by position (0 .. len-1), in insertion order.
+    """
+
+    def __init__(self):
+        self.amounts = array('q')          # paise
+        self.dates = array('i')            # day ordinals
+        self.category_codes = array('H')   # index into self.categories
+        self.categories = []               # code -> category name
+        self._category_index = {}          # category name -> code
+        self.desc_offsets = array('Q', [0])
+        self._desc_buffer = ""
+        self._desc_pending = []            # appended but not yet packed
+
+    @classmethod
+    def from_expenses(cls, expenses):
+        """Build a ledger from any iterable of Expense objects."""
+        ledger = cls()
+        for e in expenses:
+            ledger.append_expense(e)
+        return ledger
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def category_code(self, category):
+        # Dictionary-encode a category name to a small integer
+        code = self._category_index.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_index[category] = code
+        return code
+
+    def append(self, amount, category, date_str, description):
+        """
+            Append one row.
+            Raises ValueError if the date is not YYYY-MM-DD.
+        """
+        ordinal = date.fromisoformat(date_str).toordinal()
+        paise = to_paise(amount)
+        code = self.category_code(category)
+
+        self.amounts.append(paise)
+        self.dates.append(ordinal)
+        self.category_codes.append(code)
+        self._desc_pending.append(description)
+        self.desc_offsets.append(self.desc_offsets[-1] + len(description))
+
+    def append_expense(self, expense: Expense):
+        self.append(expense.amount, expense.category, expense.date, expense.description)
+
+    def _descriptions(self):
+        # Pack pending descriptions into the shared buffer in one join
+        if self._desc_pending:
+            self._desc_buffer = self._desc_buffer + "".join(self._desc_pending)
+            self._desc_pending = []
+        return self._desc_buffer
+
+    # ------------------------------------------------------------------
+    # Row access (lazy Expense views)
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __bool__(self):
+        return len(self.amounts) > 0
+
+    def _index(self, i):
+        n = len(self.amounts)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("ledger index out of range")
+        return i
+
+    def amount(self, i):
+        return self.amounts[self._index(i)] / 100
+
+    def category(self, i):
+        return self.categories[self.category_codes[self._index(i)]]
+
+    def date(self, i):
+        return date.fromordinal(self.dates[self._index(i)]).isoformat()
+
+    def description(self, i):
+        i = self._index(i)
+        return self._descriptions()[self.desc_offsets[i]:self.desc_offsets[i + 1]]
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        return CompactExpense.from_parts(
+            self.amounts[i],
+            self.categories[self.category_codes[i]],
+            self.dates[i],
+            self.description(i)
+        )
+
+    def __iter__(self):
+        for i in range(len(self.amounts)):
+            yield self[i]
+
+    def rows(self, indices):
+        """Yield CompactExpense views for the given row positions."""
+        for i in indices:
+            yield self[i]
+
+    # ------------------------------------------------------------------
+    # Column aggregations (no per-row objects)
+    # ------------------------------------------------------------------
+
+    def total_paise(self):
+        return sum(self.amounts)
+
+    def category_totals(self):
+        """Returns {category: total_amount} computed on the code column."""
+        per_code = [0] * len(self.categories)
+        for code, paise in zip(self.category_codes, self.amounts):
+            per_code[code] += paise
+        return {cat: per_code[code] / 100 for code, cat in enumerate(self.categories)}
+
+    def month_totals(self):
+        """Returns {'YYYY-MM': total_amount} computed on the date column."""
+        month_of = {}  # ordinal -> 'YYYY-MM', parsed once per distinct day
+        totals = defaultdict(int)
+        for ordinal, paise in zip(self.dates, self.amounts):
+            m = month_of.get(ordinal)
+            if m is None:
+                m = date.fromordinal(ordinal).strftime("%Y-%m")
+                month_of[ordinal] = m
+            totals[m] += paise
+        return {m: p / 100 for m, p in totals.items()}
+
+    # ------------------------------------------------------------------
+    # Column filters (return row positions)
+    # ------------------------------------------------------------------
+
+    def where_date(self, date_str):
+        ordinal = date.fromisoformat(date_str).toordinal()
+        return [i for i, d in enumerate(self.dates) if d == ordinal]
+
+    def where_category(self, category):
+        # Case-insensitive match resolved once against the category table
+        wanted = {code for code, cat in enumerate(self.categories) if cat.lower() == category.lower()}
+        return [i for i, c in enumerate(self.category_codes) if c in wanted]
+
+    def where_amount(self, min_amount, max_amount):
+        lo, hi = to_paise(min_amount), to_paise(max_amount)
+        return [i for i, p in enumerate(self.amounts) if lo <= p <= hi]
+
+    def where_keyword(self, keyword):
+        # Substring match on description or category (case-insensitive)
+        kw = keyword.lower()
+        cat_hit = [kw in cat.lower() for cat in self.categories]
+        buf = self._descriptions()
+        offsets = self.desc_offsets
+        return [i for i, c in enumerate(self.category_codes)
+                if cat_hit[c] or kw in buf[offsets[i]:offsets[i + 1]].lower()]
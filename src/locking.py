@@ -0,0 +1,118 @@
+"""
+Inter-process coordination for writes to the data files.
+
+- file_lock(path): exclusive advisory lock (fcntl.flock) on a sidecar
+  file (data/expenses.csv → data/expenses.csv.lock). The sidecar is
+  never replaced, so the lock survives atomic rewrites of the data file
+  itself. Re-entrant within a thread, so a locked operation can call
+  another locked helper for the same file. file_lock(path, shared=True)
+  is the reader's variant: several readers at once, but no writer. A
+  shared lock is never upgraded: asking for the exclusive lock while
+  holding only the shared one raises LockUpgradeError.
+- atomic_write(path): write to a temp file in the same directory, then
+  os.replace() it over the target; readers see the old or the new file,
+  never a half-written one.
+
+Every write path in file_manager, journal, partitions and budget_manager
+goes through these, so several ingest processes can append to one
+ledger in parallel. On platforms without fcntl (Windows) locking is a
+no-op and only the atomic rename remains.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_held = threading.local()
+
+
+class LockUpgradeError(RuntimeError):
+    """An exclusive file_lock() was requested inside a shared one."""
+
+
+def lock_path_for(path):
+    """data/expenses.csv → data/expenses.csv.lock"""
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+        Holds an exclusive (or, with shared=True, a shared) lock for
+        `path` for the duration of the block. A nested lock reuses the
+        one already held by the thread: a shared lock inside an exclusive
+        one is fine, an exclusive one inside a shared one raises
+        LockUpgradeError (flock would swap the lock non-atomically, and
+        the outer reader would lose its consistent view).
+    """
+    key = str(Path(path).resolve())
+    depth = getattr(_held, "depth", None)
+    if depth is None:
+        depth = _held.depth = {}
+        _held.shared = set()
+    if depth.get(key):
+        # Already held by this thread
+        if not shared and key in _held.shared:
+            raise LockUpgradeError(f"exclusive lock requested while holding a shared lock on {path}")
+        depth[key] += 1
+        try:
+            yield
+        finally:
+            depth[key] -= 1
+        return
+
+    lock_file = lock_path_for(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        depth[key] = 1
+        if shared:
+            _held.shared.add(key)
+        try:
+            yield
+        finally:
+            depth.pop(key, None)
+            _held.shared.discard(key)
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path, mode='w', newline='', encoding='utf-8', fsync=False):
+    """
+        Opens a temp file next to `path`; on success it replaces `path`,
+        on error it is removed and `path` is left untouched.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        kwargs = {} if 'b' in mode else {"newline": newline, "encoding": encoding}
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the target's permissions
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
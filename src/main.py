@@ -5,20 +5,29 @@ This file initializes the application and launches the
 command-line menu loop.
 
 Execution starts here when running:
-    python -m src.main
+    python -m src.main                 (interactive menu)
+    python -m src.main <command> ...   (see src/cli.py)
 """
 
-from src.menu import main_menu_loop
+import sys
 from src.file_manager import ensure_dirs
 
 
 # Testing for commit and
 
-def main():
-    ensure_dirs()
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Non-interactive subcommands (see src/cli.py); file operations
+        # create only the --data target they use
+        from src.cli import main as cli_main
+        return cli_main(argv)
     # Start the interactive CLI menu
+    ensure_dirs()
+    from src.menu import main_menu_loop
     main_menu_loop()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -11,14 +11,41 @@ Responsibilities:
 
 import os
 from time import sleep
-from src.file_manager import load_expenses, append_expense, save_expenses, backup_data, list_backups, restore_backup
+from src.file_manager import DATA_FILE, BACKUP_DIR, iter_expenses, backup_data, restore_backup, is_journaled, file_stamp
+from src import backup_catalog
+from src.backup_store import store_stats
+from src.repository import ExpenseRepository
+from src.search_index import KeywordIndex
+from src.indexes import SecondaryIndexes
+from src.rollups import RollupStore
 from src.expense import Expense
-from src.utils import validate_amount, validate_date, validate_category, CATEGORIES, format_currency, truncate
-from src.reports import total_and_average, category_summary, monthly_summary, generate_monthly_report
-from src.budget_manager import set_budget, delete_budget, load_budgets, budget_alerts
-from src.file_manager import load_expenses
-from src.budget_manager import budget_alerts
-from src.reports import generate_category_chart, generate_monthly_spending_chart, generate_budget_vs_actual_chart
+from src.utils import validate_amount, validate_date, validate_category, CATEGORIES, format_currency
+from src.reports import generate_monthly_report
+from src.budget_manager import set_budget, delete_budget, load_budgets, budget_alerts, BudgetAlertEngine
+from src.reports import (generate_category_chart, generate_monthly_spending_chart, generate_budget_vs_actual_chart,
+                         render_all_charts, CHARTS_DIR)
+from src.output_cache import cache_for
+from src.locking import file_lock
+from src.pager import LineIndex, CsvPager, LedgerPager
+
+# Parsed ledger shared by all menu actions of this session
+repo = ExpenseRepository()
+# Running per-category totals, kept in sync by the repository
+alert_engine = BudgetAlertEngine()
+repo.add_listener(alert_engine)
+# Keyword search index, saved next to the data file on exit
+keyword_index = KeywordIndex(DATA_FILE)
+repo.add_listener(keyword_index)
+# Sorted date / amount / category indexes for O(log n) lookups
+secondary_indexes = SecondaryIndexes()
+repo.add_listener(secondary_indexes)
+
+# Month × category totals, persisted next to the data file
+rollups = RollupStore(DATA_FILE)
+repo.add_listener(rollups)
+
+# Row offsets of the CSV for the paged screens, saved on exit
+line_index = LineIndex(DATA_FILE)
 
 
 def clear():
@@ -76,11 +103,12 @@ def add_new_expense():
         break
     desc = input("Enter description: ").strip()
     exp = Expense(amount=amount, category=category, date=date, description=desc)
-    append_expense(exp)
+    repo.append(exp)
     print("\n✅ Expense added successfully!")
 
-    # 🔔 CHECK BUDGET ALERTS
-    alerts = budget_alerts(load_expenses())
+    # 🔔 CHECK BUDGET ALERTS (the engine follows the loaded rows)
+    repo.sync()
+    alerts = alert_engine.alerts()
     if alerts:
         print("\n⚠️ BUDGET ALERTS:")
         for a in alerts:
@@ -89,37 +117,91 @@ def add_new_expense():
     pause()
 
 
+def _pager():
+    # The CSV is paged straight from the file; other backends from the
+    # cached rows (positions as used by repo.update_row / delete_row)
+    if is_journaled(DATA_FILE):
+        return CsvPager(line_index)
+    return LedgerPager(repo.expenses())
+
+
+def _browse(pager, title, select_prompt=None):
+    """
+        Shows `pager` one page at a time until the user quits.
+        With select_prompt, a number entered is taken as an Expense ID
+        and returned (0-based); None means nothing was chosen.
+    """
+    k = 0
+    while True:
+        clear()
+        print(f"{title} (page {k + 1}/{pager.pages}, {len(pager)} expenses)")
+        for row_id, e in pager.page(k):
+            print(f"[{row_id + 1}] {e}")
+        print("\n[Enter] next  p: previous  f/l: first/last  g N: page N  d YYYY-MM-DD: date  i N: ID N  q: quit")
+        cmd = input(select_prompt or "> ").strip()
+        word, _, arg = cmd.partition(" ")
+        arg = arg.strip()
+        if cmd.lower() == 'q':
+            return None
+        if not cmd:
+            if k + 1 >= pager.pages and not select_prompt:
+                return None
+            k = min(k + 1, pager.pages - 1)
+        elif cmd.isdigit():
+            if select_prompt:
+                return int(cmd) - 1
+            k = min(max(int(cmd) - 1, 0), pager.pages - 1)
+        elif word.lower() == 'p':
+            k = max(k - 1, 0)
+        elif word.lower() == 'f':
+            k = 0
+        elif word.lower() == 'l':
+            k = pager.pages - 1
+        elif word.lower() == 'g' and arg.isdigit():
+            k = min(max(int(arg) - 1, 0), pager.pages - 1)
+        elif word.lower() == 'd':
+            ok, val = validate_date(arg)
+            found = pager.page_of_date(val) if ok else None
+            if found is None:
+                input("No expenses on or after that date. Press Enter...")
+            else:
+                k = found
+        elif word.lower() == 'i' and arg.isdigit():
+            found = pager.page_of_id(int(arg) - 1)
+            if found is None:
+                input("No expense with that ID. Press Enter...")
+            else:
+                k = found
+
+
 def view_all_expenses():
-    # View all saved expenses
+    # View all saved expenses, one page at a time
     clear()
-    exps = load_expenses()
-    print("ALL EXPENSES:")
-    if not exps:
+    pager = _pager()
+    if not len(pager):
+        print("ALL EXPENSES:")
         print("No expenses recorded.")
-    else:
-        for idx, e in enumerate(exps, start=1):
-            print(f"[{idx}] {e}")
-    pause()
+        pause()
+        return
+    _browse(pager, "ALL EXPENSES")
 
 
 def view_category_summary():
     # View summary of all category wise expenses
     clear()
-    exps = load_expenses()
-    if not exps:
+    # Answered from the rollups: no pass over the rows
+    summary = rollups.refresh(repo).summary()
+    if not summary:
         print("No expenses.")
         pause();
         return
-    summary = category_summary(exps)
-    total, avg = total_and_average(exps)
     print("CATEGORY-WISE SUMMARY:")
-    for cat, amt in sorted(summary.items(), key=lambda x: -x[1]):
+    for cat, amt in sorted(summary.by_category.items(), key=lambda x: -x[1]):
         print(f"{cat:15} {format_currency(amt)}")
-    print("\nTotal:", format_currency(total))
-    print("Average per record:", format_currency(avg))
+    print("\nTotal:", format_currency(summary.total))
+    print("Average per record:", format_currency(summary.average))
 
-    from budget_manager import budget_alerts
-    alerts = budget_alerts(exps)
+    alerts = budget_alerts(summary)
     if alerts:
         print("\n⚠️ BUDGET ALERTS:")
         for a in alerts:
@@ -131,14 +213,13 @@ def view_category_summary():
 def generate_month_report():
     # Generate report for the specific month
     clear()
-    exps = load_expenses()
-    if not exps:
-        print("No expenses.")
-        pause();
-        return
-    month = input("Enter month (YYYY-MM) e.g. 2024-01: ").strip()
+    month = input("Enter month (YYYY-MM) or year (YYYY) e.g. 2024-01: ").strip()
     try:
-        path = generate_monthly_report(exps, month)
+        # Only rows inside the requested month reach the report writer, and
+        # none is read when the data file is unchanged since the last report
+        source = file_stamp(DATA_FILE)
+        exps = iter_expenses(start=month, end=month + "-31")
+        path = generate_monthly_report(exps, month, source=source)
         print(f"Monthly report saved to: {path}")
 
     except Exception as e:
@@ -149,36 +230,44 @@ def generate_month_report():
 def search_expenses():
     # Search any required expense using Date, Cat, Amount, Keyword.
     clear()
-    exps = load_expenses()
-    if not exps:
+    if not len(repo):
         print("No expenses.")
         pause();
         return
-    print("SEARCH BY: 1) Date  2) Category  3) Amount range  4) Keyword")
-    choice = input("Choice (1-4): ").strip()
+    print("SEARCH BY: 1) Date  2) Category  3) Amount range  4) Keyword  5) Date range")
+    choice = input("Choice (1-5): ").strip()
     results = []
     if choice == '1':
         d = input("Enter date (YYYY-MM-DD): ").strip()
-        results = [e for e in exps if e.date == d]
+        ok, d = validate_date(d)
+        results = secondary_indexes.on_date(d) if ok else []
     elif choice == '2':
         c = input("Enter category: ").strip()
-        results = [e for e in exps if e.category.lower() == c.lower()]
+        results = secondary_indexes.in_category(c)
     elif choice == '3':
         mn = input("Min amount: ").strip();
         mx = input("Max amount: ").strip()
         try:
             mn = float(mn);
             mx = float(mx)
-            results = [e for e in exps if mn <= e.amount <= mx]
+            results = secondary_indexes.amount_between(mn, mx)
         except ValueError:
             print("Invalid numbers.")
             pause();
             return
+    elif choice == '5':
+        ok_from, d_from = validate_date(input("From date (YYYY-MM-DD): ").strip())
+        ok_to, d_to = validate_date(input("To date (YYYY-MM-DD): ").strip())
+        if not (ok_from and ok_to):
+            print("Error: Date must be in YYYY-MM-DD format.")
+            pause();
+            return
+        results = secondary_indexes.date_between(d_from, d_to)
     else:
-        kw = input("Enter keyword: ").strip().lower()
-        results = [e for e in exps if kw in e.description.lower() or kw in e.category.lower()]
+        kw = input("Enter keyword(s) (prefixes, 'OR' for any): ").strip()
+        results = keyword_index.search(kw)
     print(f"\nFound {len(results)} result(s):")
-    for r in results:
+    for r in repo.rows(results):
         print(r)
     pause()
 
@@ -190,37 +279,70 @@ def backup_menu():
     print("1. Create backup")
     print("2. List backups")
     print("3. Restore from backup")
-    ch = input("Choice (1-3): ").strip()
+    print("4. Verify backups")
+    print(f"5. Prune old backups (keep {backup_catalog.KEEP_DAILY} daily, "
+          f"{backup_catalog.KEEP_WEEKLY} weekly, {backup_catalog.KEEP_MONTHLY} monthly)")
+    ch = input("Choice (1-5): ").strip()
     if ch == '1':
-        path = backup_data()
-        print("Backup created:", path)
+        result = backup_data()
+        print("Backup created:", result.path)
+        print(f"{result.bytes:,} bytes in {result.seconds:.2f}s ({result.mb_per_second:.1f} MB/s), "
+              f"{result.new_chunks} new chunk(s)")
+        stats = store_stats(BACKUP_DIR)
+        print(f"{stats['backups']} backup(s), {stats['logical_bytes']:,} bytes stored as "
+              f"{stats['stored_bytes']:,} (dedup ratio {stats['dedup_ratio']:.1f}x)")
     elif ch == '2':
-        for p in list_backups():
-            print(p)
+        for e in backup_catalog.load(BACKUP_DIR):
+            print(_backup_line(e))
     elif ch == '3':
-        backups = list_backups()
+        backups = backup_catalog.load(BACKUP_DIR)
         if not backups:
             print("No backups available.")
             pause();
             return
-        for idx, p in enumerate(backups, start=1):
-            print(f"{idx}. {p}")
+        for idx, e in enumerate(backups, start=1):
+            print(f"{idx}. {_backup_line(e)}")
         sel = input("Choose backup number to restore: ").strip()
         try:
             sel_i = int(sel) - 1
-            if sel_i < 0 or sel_i >= len(backups):
-                print("Invalid selection.")
-            else:
-                restore_backup(backups[sel_i])
-                print("Restored backup to data file.")
         except ValueError:
+            sel_i = None
             print("Invalid input.")
+        if sel_i is not None and (sel_i < 0 or sel_i >= len(backups)):
+            print("Invalid selection.")
+        elif sel_i is not None:
+            # Quick check from the catalog before overwriting the data file
+            problems = backup_catalog.verify(BACKUP_DIR, backups[sel_i])
+            if problems:
+                print("Backup is damaged:", "; ".join(problems))
+            else:
+                try:
+                    result = restore_backup(os.path.join(BACKUP_DIR, backups[sel_i].name))
+                    print(f"Restored backup to data file ({result.rows} rows, "
+                          f"{result.mb_per_second:.1f} MB/s).")
+                except ValueError as e:
+                    print("Restore failed:", e)
+    elif ch == '4':
+        full = input("Full check (decompress and re-hash)? (y/n): ").strip().lower() == 'y'
+        for e in backup_catalog.load(BACKUP_DIR):
+            problems = backup_catalog.verify(BACKUP_DIR, e, full=full)
+            print(f"{e.name}: {'; '.join(problems) if problems else 'OK'}")
+    elif ch == '5':
+        removed = backup_catalog.prune(BACKUP_DIR)
+        print(f"Removed {len(removed)} backup(s).")
+        for e in removed:
+            print("  ", e.name)
     pause()
 
 
+def _backup_line(entry):
+    return f"{entry.created.replace('T', ' ')}  {entry.rows:>9,} rows  {entry.size:>12,} bytes  {entry.name}"
+
+
 def generate_charts_menu():
     clear()
-    exps = load_expenses()
+    # Charts only need totals: drawn from the rollups
+    exps = rollups.refresh(repo).summary()
 
     if not exps:
         print("No expenses available for chart generation.")
@@ -231,9 +353,10 @@ def generate_charts_menu():
     print("1. Category-wise Spending Chart")
     print("2. Monthly Spending Chart")
     print("3. Budget vs Actual Chart")
-    print("4. Back")
+    print("4. Render All Charts")
+    print("5. Back")
 
-    choice = input("Choice (1-4): ").strip()
+    choice = input("Choice (1-5): ").strip()
 
     if choice == '1': # Generates category wise chart summary
         path = generate_category_chart(exps)
@@ -259,6 +382,16 @@ def generate_charts_menu():
             print(f"\n📊 Budget vs Actual chart generated successfully!\nSaved at: {path}")
         pause()
 
+    elif choice == '4':  # All three charts, rendered in parallel
+        open_files = input("Open charts after rendering? (y/N): ").strip().lower() == 'y'
+        paths = render_all_charts(exps, open_files=open_files)
+        print(f"\n📊 {len(paths)} charts generated successfully!")
+        for path in paths.values():
+            print(f"Saved at: {path}")
+        stats = cache_for(CHARTS_DIR).stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses this session")
+        pause()
+
 
 def main_menu_loop():
     """
@@ -308,6 +441,11 @@ def main_menu_loop():
         elif choice == '10':
             generate_charts_menu()
         elif choice == '0':
+            repo.compact()
+            if repo.is_fresh():
+                keyword_index.save()
+                rollups.save()
+            line_index.save()
             print("Goodbye!")
             break
         else:
@@ -315,28 +453,48 @@ def main_menu_loop():
             sleep(1)
 
 
-def edit_expense():
-    # Edit any existing expense based on the Expense ID
+def _pick_expense(action):
+    # Browse for an Expense ID; returns (pager, id, expense) or None
     clear()
-    exps = load_expenses()
-    if not exps:
-        print("No expenses to edit.")
+    pager = _pager()
+    if not len(pager):
+        print(f"No expenses to {action}.")
         pause()
-        return
-
-    for idx, e in enumerate(exps, start=1):
-        print(f"[{idx}] {e}")
-
-    try:
-        choice = int(input("\nEnter Expense ID to edit: "))
-        if choice < 1 or choice > len(exps):
-            raise ValueError
-    except ValueError:
+        return None
+    row_id = _browse(pager, f"{action.upper()} EXPENSE", f"\nEnter Expense ID to {action}: ")
+    if row_id is None:
+        return None
+    old = pager.get(row_id)
+    if old is None:
         print("Invalid Expense ID.")
         pause()
+        return None
+    return pager, row_id, old
+
+
+def _apply(pager, write, row_id, *args):
+    # IDs are only valid for the file they were read from
+    with file_lock(DATA_FILE):
+        if not pager.unchanged():
+            print("\nThe data file was rewritten meanwhile; please try again.")
+            return False
+        try:
+            write(row_id, *args)
+        except IndexError:
+            print("\nThat expense no longer exists; please try again.")
+            return False
+    return True
+
+
+def edit_expense():
+    # Edit any existing expense based on the Expense ID
+    picked = _pick_expense("edit")
+    if picked is None:
         return
+    pager, row_id, old = picked
 
-    exp = exps[choice - 1]
+    # Edit a copy so the alert engine can see both old and new values
+    exp = Expense(old.amount, old.category, old.date, old.description)
     print("\nPress Enter to keep existing value.")
 
     new_amt = input(f"Amount ({exp.amount}): ").strip()
@@ -359,31 +517,18 @@ def edit_expense():
     if new_desc:
         exp.description = new_desc
 
-    save_expenses(exps)
-    print("\n✏️ Expense updated successfully!")
+    if _apply(pager, repo.update_row, row_id, exp):
+        print("\n✏️ Expense updated successfully!")
     pause()
 
 
 def delete_expense():
     # Delete any existing expense based on Expense ID
-    clear()
-    exps = load_expenses()
-    if not exps:
-        print("No expenses to delete.")
-        pause()
-        return
-
-    for idx, e in enumerate(exps, start=1):
-        print(f"[{idx}] {e}")
-
-    try:
-        choice = int(input("\nEnter Expense ID to delete: "))
-        if choice < 1 or choice > len(exps):
-            raise ValueError
-    except ValueError:
-        print("Invalid Expense ID.")
-        pause()
+    picked = _pick_expense("delete")
+    if picked is None:
         return
+    pager, row_id, old = picked
+    print(old)
 
     confirm = input("Are you sure you want to delete this expense? (y/n): ").lower()
     if confirm != 'y':
@@ -391,11 +536,9 @@ def delete_expense():
         pause()
         return
 
-    deleted = exps.pop(choice - 1)
-    save_expenses(exps)
-
-    print("\n🗑️ Deleted:")
-    print(deleted)
+    if _apply(pager, repo.delete_row, row_id):
+        print("\n🗑️ Deleted:")
+        print(old)
     pause()
 
 
@@ -0,0 +1,171 @@
+"""
+Fingerprinted cache for generated charts and reports.
+
+Every artifact in charts/ or reports/ is recorded in a small index in
+the same directory (.output_cache.json) together with a fingerprint of
+the inputs it was built from: the aggregated data, budgets and
+rendering options.
+
+    {"category_spending.png": {"fingerprint": "9f2c…", "size": 48213, "mtime_ns": …, "used": 1718000000.0}}
+
+- Same fingerprint and the file is still the one the cache recorded
+  (size and mtime) → hit, nothing is redrawn
+- Otherwise → miss; the caller regenerates the file and calls store()
+- An entry may also carry a cheap `source` fingerprint (e.g. the data
+  file stamp) so lookup_source() can answer before any row is read
+- The directory is bounded in size: least recently used artifacts
+  are deleted once the total goes over max_bytes; a file changed since
+  the cache recorded it is only forgotten, never deleted
+- Hits only update the recency in memory; it is written with the next
+  store() or by flush() (at exit)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+INDEX_NAME = ".output_cache.json"
+
+# Default size bound per output directory
+MAX_BYTES = 50 * 1024 * 1024
+
+
+def fingerprint(*parts):
+    """Stable hash of JSON-serialisable inputs (dict key order does not matter)."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class OutputCache:
+    """
+        Fingerprint index and LRU bound for one output directory.
+
+        Attributes:
+        - hits / misses / evictions (int): statistics since creation
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.index_path = self.directory / INDEX_NAME
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=4)
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    def flush(self):
+        """Writes the recency of the hits since the last save."""
+        if self._dirty:
+            self._save()
+
+    def _recorded(self, name, entry):
+        # True while the file is still the one store() recorded
+        try:
+            st = os.stat(self.directory / name)
+        except FileNotFoundError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def _hit(self, name, matches):
+        entry = self._load().get(name)
+        if entry and matches(entry) and self._recorded(name, entry):
+            self.hits += 1
+            entry["used"] = time.time()
+            self._dirty = True
+            return self.directory / name
+        self.misses += 1
+        return None
+
+    def lookup(self, name, fp):
+        """Path of artifact `name` if it was built from fingerprint `fp`, else None."""
+        return self._hit(name, lambda entry: entry["fingerprint"] == fp)
+
+    def lookup_source(self, name, source):
+        """Like lookup(), matched on the cheap `source` fingerprint given to store()."""
+        return self._hit(name, lambda entry: entry.get("source") == source)
+
+    def store(self, name, fp, source=None):
+        """Records a freshly written artifact and evicts old ones over the size bound."""
+        entries = self._load()
+        path = self.directory / name
+        st = path.stat()
+        entries[name] = {"fingerprint": fp, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "used": time.time()}
+        if source is not None:
+            entries[name]["source"] = source
+        self._evict(keep=name)
+        self._save()
+        return path
+
+    def _evict(self, keep):
+        entries = self._entries
+        total = sum(e["size"] for e in entries.values())
+        for name in sorted(entries, key=lambda n: entries[n]["used"]):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            entry = entries.pop(name)
+            total -= entry["size"]
+            # Only a file the cache wrote is deleted; one replaced or
+            # edited since (e.g. by the user) is just forgotten
+            if self._recorded(name, entry):
+                os.remove(self.directory / name)
+                self.evictions += 1
+
+    def stats(self):
+        entries = self._load()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "artifacts": len(entries),
+            "bytes": sum(e["size"] for e in entries.values()),
+        }
+
+
+_caches = {}
+
+
+def cache_for(directory):
+    """Shared OutputCache per directory for the running process."""
+    key = Path(directory).resolve()
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = OutputCache(directory)
+    return cache
+
+
+def cache_stats():
+    """{directory: stats} for every cache used in this process."""
+    return {str(d): c.stats() for d, c in _caches.items()}
+
+
+@atexit.register
+def flush_all():
+    """Saves the hit recency of every cache used in this process."""
+    for cache in _caches.values():
+        try:
+            cache.flush()
+        except OSError:
+            pass
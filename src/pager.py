@@ -0,0 +1,332 @@
+"""
+Paged access to the ledger for the menu's view / edit / delete screens.
+
+Printing every expense before asking for an ID stops being usable (and
+fast) after a few thousand rows. A pager shows one page at a time and
+can jump to a page, to a date or to an expense ID.
+
+On the single-file CSV, the pager never parses the whole file:
+- LineIndex keeps the byte offset of every data row and its date
+  (day ordinal), saved next to the data file (data/expenses.lineidx).
+  It is built once; when rows are appended only the new bytes are
+  read, and a rewritten file (new inode) is indexed again.
+- CsvPager combines it with the edit journal: IDs are the stable
+  journal row ids, tombstoned rows are skipped and edited rows show
+  their latest version. A page is one seek and one read of its rows.
+
+Other backends (SQLite, partitions, binary) page over the repository's
+rows by position (LedgerPager).
+"""
+
+import csv
+import io
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+from src import journal
+from src.file_manager import row_to_expense
+from src.ledger import Ledger
+from src.locking import atomic_write
+
+PAGE_SIZE = 20
+
+# magic, data file inode, indexed bytes, rows, crc32 of the indexed tail
+_META = struct.Struct("<8sQQQI")
+_MAGIC = b"FMLINES2"   # 2: lines of spaces are rows
+_TAIL = 64
+
+
+def line_index_path_for(data_file):
+    """data/expenses.csv → data/expenses.lineidx"""
+    return Path(data_file).with_suffix(".lineidx")
+
+
+def _ordinal(record, cache):
+    # Day ordinal of the record's first field (Date); 0 if it is not a date
+    field = record.split(b",", 1)[0].strip().strip(b'"')
+    ordinal = cache.get(field)
+    if ordinal is None:
+        try:
+            ordinal = date.fromisoformat(field.decode('utf-8')).toordinal()
+        except ValueError:
+            ordinal = 0
+        cache[field] = ordinal
+    return ordinal
+
+
+class LineIndex:
+    """
+        Byte offsets of the data rows of one CSV file.
+
+        offsets[i] .. offsets[i + 1] holds data row i (row id i, blank
+        lines aside), ordinals[i] is its date as a day ordinal.
+    """
+
+    def __init__(self, data_file, path=None):
+        self.data_file = data_file
+        self.path = path or line_index_path_for(data_file)
+        self._reset()
+        self._loaded = False
+
+    def _reset(self, inode=None):
+        self.inode = inode
+        self.size = 0                # bytes of the data file indexed so far
+        self.offsets = array('Q')
+        self.ordinals = array('i')
+        self.tail_crc = 0
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def load(self):
+        """Reads the saved index, if any (validated by refresh())."""
+        self._loaded = True
+        try:
+            with open(self.path, 'rb') as f:
+                magic, inode, size, rows, tail_crc = _META.unpack(f.read(_META.size))
+                if magic != _MAGIC:
+                    return False
+                offsets, ordinals = array('Q'), array('i')
+                offsets.fromfile(f, rows + 1)
+                ordinals.fromfile(f, rows)
+        except (OSError, EOFError, struct.error, ValueError):
+            return False
+        self.inode, self.size, self.tail_crc = inode, size, tail_crc
+        self.offsets, self.ordinals = offsets, ordinals
+        return True
+
+    def save(self):
+        if not self.offsets:
+            return
+        with atomic_write(self.path, 'wb') as f:
+            f.write(_META.pack(_MAGIC, self.inode or 0, self.size, len(self), self.tail_crc))
+            self.offsets.tofile(f)
+            self.ordinals.tofile(f)
+
+    def _tail_crc(self, f, size):
+        start = max(0, size - _TAIL)
+        f.seek(start)
+        return zlib.crc32(f.read(size - start))
+
+    def refresh(self):
+        """
+            Brings the index up to date with the data file: appended rows
+            are indexed from where the last scan stopped, a rewritten file
+            is indexed from scratch. Returns self.
+        """
+        if not self._loaded:
+            self.load()
+        try:
+            st = os.stat(self.data_file)
+        except FileNotFoundError:
+            self._reset()
+            return self
+        if st.st_ino == self.inode and st.st_size == self.size:
+            return self
+        with open(self.data_file, 'rb') as f:
+            appended = (st.st_ino == self.inode and st.st_size > self.size
+                        and self._tail_crc(f, self.size) == self.tail_crc)
+            if not appended:
+                self._reset(st.st_ino)
+            self._scan(f)
+        return self
+
+    def _scan(self, f):
+        # A record ends at a newline outside quotes (even number of '"' so far)
+        if self.offsets and self.offsets[-1] > self.size:
+            # The last record had no newline: it is read again, as it may
+            # have been completed since (see below)
+            self.offsets.pop()
+            if self.offsets:
+                self.ordinals.pop()
+        f.seek(self.size)
+        pos = self.size
+        record, quotes = [], 0
+        header = not self.offsets
+        dates = {}
+        for line in f:
+            pos += len(line)
+            record.append(line)
+            quotes += line.count(b'"')
+            if quotes % 2 or not line.endswith(b"\n"):
+                continue
+            if header:
+                header = False
+                self.offsets.append(pos)
+            elif len(record) > 1 or line not in (b"\n", b"\r\n"):
+                # csv.DictReader only skips empty lines: they get no row
+                # id, but a line of spaces is a (blank) row
+                self.ordinals.append(_ordinal(record[0], dates))
+                self.offsets.append(pos)
+            self.size = pos
+            record, quotes = [], 0
+        if record and not quotes % 2:
+            # Last row without a trailing newline: csv reads it, so it is
+            # indexed, but self.size stays before it (scanned again next time)
+            if header:
+                self.offsets.append(pos)
+            else:
+                self.ordinals.append(_ordinal(record[0], dates))
+                self.offsets.append(pos)
+        # A row with an open quote is still being written: picked up by
+        # the next refresh
+        self.tail_crc = self._tail_crc(f, self.size)
+
+    def header(self):
+        with open(self.data_file, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), [])
+
+    def read(self, first, last):
+        """Raw CSV row dicts of rows first..last (inclusive), in one read."""
+        with open(self.data_file, 'rb') as f:
+            f.seek(self.offsets[first])
+            data = f.read(self.offsets[last + 1] - self.offsets[first])
+        text = io.StringIO(data.decode('utf-8'), newline='')
+        return list(csv.DictReader(text, fieldnames=self.header()))
+
+
+class CsvPager:
+    """
+        Pages of (row id, expense) over a LineIndex and the edit journal.
+    """
+
+    def __init__(self, line_index, page_size=PAGE_SIZE):
+        self.index = line_index.refresh()
+        self.page_size = page_size
+        self.inode = line_index.inode
+        self.updates, deleted = journal.load_journal(line_index.data_file)
+        self.deleted = sorted(d for d in deleted if d < len(line_index))
+        self._deleted = set(self.deleted)
+
+    def __len__(self):
+        return len(self.index) - len(self.deleted)
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self) // self.page_size))
+
+    def unchanged(self):
+        """False once the data file was rewritten (row ids renumbered)."""
+        try:
+            return os.stat(self.index.data_file).st_ino == self.inode
+        except FileNotFoundError:
+            return False
+
+    def _row_id_at(self, pos):
+        # Visible position → row id, skipping tombstones
+        row_id = pos
+        while True:
+            moved = pos + bisect_right(self.deleted, row_id)
+            if moved == row_id:
+                return row_id
+            row_id = moved
+
+    def position_of(self, row_id):
+        if not 0 <= row_id < len(self.index) or row_id in self._deleted:
+            return None
+        return row_id - bisect_left(self.deleted, row_id)
+
+    def _rows(self, first, last):
+        for row_id, row in zip(range(first, last + 1), self.index.read(first, last)):
+            if row_id in self._deleted:
+                continue
+            exp = row_to_expense(self.updates.get(row_id, row))
+            if exp is not None:
+                yield row_id, exp
+
+    def page(self, k):
+        """(row id, expense) pairs of page k (0-based)."""
+        start = k * self.page_size
+        if not 0 <= start < len(self):
+            return []
+        first = self._row_id_at(start)
+        last = self._row_id_at(min(start + self.page_size, len(self)) - 1)
+        return list(self._rows(first, last))
+
+    def get(self, row_id):
+        """The expense with this row id, or None."""
+        if self.position_of(row_id) is None:
+            return None
+        return next((exp for _, exp in self._rows(row_id, row_id)), None)
+
+    def page_of_id(self, row_id):
+        pos = self.position_of(row_id)
+        return None if pos is None else pos // self.page_size
+
+    def page_of_date(self, date_str):
+        """
+            Page of the first row on that date (or, failing that, on the
+            nearest later date); None if there is none.
+        """
+        target = date.fromisoformat(date_str).toordinal()
+        ordinals = self.index.ordinals
+        # Edited rows may have moved to another date
+        edited = {}
+        for row_id, row in self.updates.items():
+            try:
+                edited[row_id] = date.fromisoformat(row.get('Date') or "").toordinal()
+            except ValueError:
+                edited[row_id] = 0
+        best, best_id = None, None
+        for row_id, ordinal in enumerate(ordinals):
+            ordinal = edited.get(row_id, ordinal)
+            if ordinal < target or row_id in self._deleted:
+                continue
+            if best is None or ordinal < best:
+                best, best_id = ordinal, row_id
+                if ordinal == target:
+                    break
+        return None if best_id is None else self.page_of_id(best_id)
+
+
+class LedgerPager:
+    """
+        Same interface over an in-memory Ledger or list of expenses;
+        IDs are row positions.
+    """
+
+    def __init__(self, ledger, page_size=PAGE_SIZE):
+        self.ledger = ledger
+        self.page_size = page_size
+
+    def __len__(self):
+        return len(self.ledger)
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self) // self.page_size))
+
+    def unchanged(self):
+        return True
+
+    def page(self, k):
+        start = k * self.page_size
+        positions = range(max(start, 0), min(start + self.page_size, len(self.ledger)))
+        return [(pos, self.ledger[pos]) for pos in positions]
+
+    def get(self, pos):
+        return self.ledger[pos] if 0 <= pos < len(self.ledger) else None
+
+    def page_of_id(self, pos):
+        return pos // self.page_size if 0 <= pos < len(self.ledger) else None
+
+    def page_of_date(self, date_str):
+        target = date.fromisoformat(date_str).toordinal()
+        if isinstance(self.ledger, Ledger):
+            ordinals = self.ledger.dates
+        else:
+            # Rows without a valid date (plain Expense) never match
+            ordinals = (getattr(e, "ordinal", None) for e in self.ledger)
+        best, best_pos = None, None
+        for pos, ordinal in enumerate(ordinals):
+            if ordinal is None:
+                continue
+            if ordinal >= target and (best is None or ordinal < best):
+                best, best_pos = ordinal, pos
+                if ordinal == target:
+                    break
+        return None if best_pos is None else best_pos // self.page_size
@@ -0,0 +1,188 @@
+"""
+Month-partitioned CSV layout for large ledgers.
+
+Instead of one growing data/expenses.csv, rows are stored per month:
+
+    data/expenses/
+    ├── manifest.json        {"2024-01": {"rows": 5, "total_paise": 565000}, ...}
+    ├── 2024/
+    │   ├── 01.csv
+    │   └── 02.csv
+    └── undated.csv          rows whose date is not YYYY-MM-DD (kept as written)
+
+A monthly report only opens one partition, a yearly report only the
+partitions of that year, and month totals come straight from the
+manifest without reading any rows.
+
+Used by file_manager when the data path is a directory
+(FINANCE_STORAGE=partitioned).
+"""
+
+import csv
+import json
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+from src.locking import atomic_write
+from src.utils import CSV_HEADER, to_paise
+
+MANIFEST_NAME = "manifest.json"
+# Manifest key of the partition holding rows without a valid date
+UNDATED = "undated"
+
+
+def partition_path(root, month):
+    """data/expenses/YYYY/MM.csv for month 'YYYY-MM' (undated.csv for UNDATED)."""
+    if month == UNDATED:
+        return Path(root) / f"{UNDATED}.csv"
+    year, mm = month.split("-")
+    return Path(root) / year / f"{mm}.csv"
+
+
+def _month_of(expense):
+    # Partition key of a row: its month, or UNDATED for an invalid date
+    try:
+        return expense.month
+    except ValueError:
+        return UNDATED
+
+
+def load_manifest(root):
+    path = Path(root) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(root, manifest):
+    # Written to a temp file first so readers never see a half-written manifest
+    with atomic_write(Path(root) / MANIFEST_NAME) as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=4)
+
+
+def in_range(month, start=None, end=None):
+    # Compare on the month part only; 'YYYY' and 'YYYY-MM-DD' bounds both work.
+    # Undated rows only match an unbounded range.
+    if month == UNDATED:
+        return start is None and end is None
+    if start is not None and month < start[:7]:
+        return False
+    if end is not None and month > end[:7]:
+        return False
+    return True
+
+
+def partition_files(root, start=None, end=None):
+    """
+        Partition files overlapping [start, end], oldest first.
+        Only the manifest is read to decide which files to open.
+    """
+    return [partition_path(root, m) for m in sorted(load_manifest(root))
+            if in_range(m, start, end)]
+
+
+def append_partitioned(root, expense):
+    """Appends one row to its month partition and updates the manifest."""
+    append_many(root, [expense])
+
+
+def append_many(root, expenses):
+    """
+        Appends a batch of rows: one open per touched partition and a
+        single manifest update for the whole batch.
+    """
+    by_month = defaultdict(list)
+    for e in expenses:
+        by_month[_month_of(e)].append(e)
+
+    manifest = load_manifest(root)
+    for month, rows in by_month.items():
+        path = partition_path(root, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not path.exists()
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(CSV_HEADER)
+            writer.writerows(e.to_row() for e in rows)
+
+        entry = manifest.setdefault(month, {"rows": 0, "total_paise": 0})
+        entry["rows"] += len(rows)
+        entry["total_paise"] += sum(to_paise(e.amount) for e in rows)
+    save_manifest(root, manifest)
+
+
+def write_partitions(root, expenses):
+    """
+        Rewrites the whole partitioned ledger from any iterable (streamed).
+        Rows without a valid date go to the undated partition.
+        Returns the number of rows written.
+
+        Every partition is written to a temp file and only replaces the
+        old one once all rows are written; the manifest follows, and
+        months that no longer have rows are removed last. A failure part
+        way leaves the previous ledger in place.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    old_months = load_manifest(root)
+
+    manifest = defaultdict(lambda: {"rows": 0, "total_paise": 0})
+    writers = {}
+    count = 0
+    with ExitStack() as stack:
+        for e in expenses:
+            month = _month_of(e)
+            writer = writers.get(month)
+            if writer is None:
+                path = partition_path(root, month)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writer = writers[month] = csv.writer(stack.enter_context(atomic_write(path)))
+                writer.writerow(CSV_HEADER)
+            writer.writerow(e.to_row())
+            manifest[month]["rows"] += 1
+            manifest[month]["total_paise"] += to_paise(e.amount)
+            count += 1
+    save_manifest(root, manifest)
+
+    for month in old_months:
+        if month not in manifest:
+            path = partition_path(root, month)
+            if path.exists():
+                path.unlink()
+    return count
+
+
+def rebuild_manifest(root):
+    """Recomputes the manifest by scanning every partition file."""
+    manifest = {}
+    paths = sorted(Path(root).glob("*/*.csv"))
+    if partition_path(root, UNDATED).exists():
+        paths.append(partition_path(root, UNDATED))
+    for path in paths:
+        rows, paise = 0, 0
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    paise += to_paise(row['Amount'])
+                except (TypeError, ValueError):
+                    continue
+                rows += 1
+        month = UNDATED if path.stem == UNDATED else f"{path.parent.name}-{path.stem}"
+        manifest[month] = {"rows": rows, "total_paise": paise}
+    save_manifest(root, manifest)
+    return manifest
+
+
+def month_totals(root, start=None, end=None):
+    """{'YYYY-MM': amount} answered from the manifest alone."""
+    return {m: entry["total_paise"] / 100 for m, entry in sorted(load_manifest(root).items())
+            if entry["rows"] and m != UNDATED and in_range(m, start, end)}
+
+
+def total_and_count(root):
+    manifest = load_manifest(root)
+    paise = sum(entry["total_paise"] for entry in manifest.values())
+    rows = sum(entry["rows"] for entry in manifest.values())
+    return paise / 100, rows
@@ -2,195 +2,400 @@
 Responsible for analytical computations and report generation.
 
 Includes:
-- Aggregations
+- Aggregations (single-pass summarize(), see summary.py)
 - Monthly summaries
 - CSV reports
-- Chart generation (matplotlib)
+- Chart generation (matplotlib, imported on first use)
+- Output cache: unchanged charts / reports are not regenerated (output_cache.py)
 """
 
 from collections import defaultdict
-from datetime import datetime
-from utils import format_currency
 from typing import List
-from expense import Expense
-import matplotlib.pyplot as plt
+from src.expense import Expense
+from src.ledger import Ledger
+from src import vectorized
+from src.summary import Summary, summarize
+from src.output_cache import cache_for, fingerprint
 import csv
+import hashlib
 import os
 import platform
 import subprocess
+from pathlib import Path
 from src.utils import PROJECT_ROOT
 
 REPORTS_DIR = PROJECT_ROOT / "reports"
 CHARTS_DIR = PROJECT_ROOT / "charts"
 
-REPORTS_DIR.mkdir(exist_ok=True)
-CHARTS_DIR.mkdir(exist_ok=True)
 
+def _pyplot():
+    # matplotlib takes longer to import than the rest of the app together,
+    # so it is only loaded when the first chart is drawn. Charts are only
+    # saved to files, so the headless Agg backend is always enough.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
-def total_and_average(expenses: List[Expense]):
+
+# Output directories already created by this process
+_created = set()
+
+
+def _output_dir(path, default=None):
+    # path (or `default` when None) as a Path, created on first write
+    # rather than at import time, and only once per process
+    path = Path(default if path is None else path)
+    if path not in _created:
+        path.mkdir(parents=True, exist_ok=True)
+        _created.add(path)
+    return path
+
+
+# Ledgers at least this large are aggregated by the vectorized engine
+# (when pandas is installed); below it the Python loops are faster.
+VECTORIZE_MIN_ROWS = 50_000
+
+
+def _use_vectorized(expenses, engine):
+    # engine: "auto" (default), "vectorized" or "python"
+    if engine == "vectorized":
+        return vectorized.available()
+    return (engine == "auto" and isinstance(expenses, Ledger)
+            and len(expenses) >= VECTORIZE_MIN_ROWS and vectorized.available())
+
+
+def total_and_average(expenses: List[Expense], engine="auto"):
     # Shows the total and average of all listed expenses while exporting the monthly report
-    total = sum(e.amount for e in expenses)
-    average = (total / len(expenses)) if expenses else 0.0
+    if isinstance(expenses, Summary):
+        return expenses.total, expenses.average
+    if _use_vectorized(expenses, engine):
+        return vectorized.total_and_average(expenses)
+    if isinstance(expenses, Ledger):
+        total = expenses.total_paise() / 100
+        return total, (total / len(expenses)) if expenses else 0.0
+    # Single pass, so any iterable (e.g. iter_expenses()) works in constant memory
+    total, count = 0.0, 0
+    for e in expenses:
+        total += e.amount
+        count += 1
+    average = (total / count) if count else 0.0
     return total, average
 
 
-def category_summary(expenses: List[Expense]):
+def category_summary(expenses: List[Expense], engine="auto"):
     # Fetch the category wise summary of all listed expenses
+    if isinstance(expenses, Summary):
+        return expenses.by_category
+    if _use_vectorized(expenses, engine):
+        return vectorized.category_summary(expenses)
+    if isinstance(expenses, Ledger):
+        return expenses.category_totals()
     summary = defaultdict(float)
     for e in expenses:
         summary[e.category] += e.amount
     return dict(summary)
 
 
-def monthly_summary(expenses: List[Expense]):
+def monthly_summary(expenses: List[Expense], engine="auto"):
     # Fetch monthly summary for listed expenses
+    if isinstance(expenses, Summary):
+        return expenses.by_month
+    if _use_vectorized(expenses, engine):
+        return vectorized.monthly_summary(expenses)
+    if isinstance(expenses, Ledger):
+        return expenses.month_totals()
     months = defaultdict(float)  # 'YYYY-MM' -> amount
     for e in expenses:
         try:
-            m = datetime.strptime(e.date, "%Y-%m-%d").strftime("%Y-%m")
+            m = e.month
         except Exception:
             continue
         months[m] += e.amount
     return dict(months)
 
 
-def generate_monthly_report(expenses: List[Expense], month_str: str, out_dir="reports"):
+def generate_monthly_report(expenses: List[Expense], month_str: str, out_dir=None, source=None):
     """
-    month_str: 'YYYY-MM' e.g. '2024-01'
+    month_str: 'YYYY-MM' e.g. '2024-01' (a 'YYYY' prefix gives a yearly report)
+    out_dir: where the report is written (default: reports/ of the project)
+
+    Rows are streamed straight into the report file, so `expenses`
+    can be a generator such as iter_expenses().
+
+    source: optional cheap fingerprint of where the rows come from, taken
+    before reading them (e.g. file_stamp() of the data file). When the
+    cached report was built from the same source it is returned without
+    reading a single row from `expenses`.
+
+    Otherwise the rows are fingerprinted while they are written; when the
+    result is identical to the cached report the existing file is kept
+    untouched.
     """
-    os.makedirs(out_dir, exist_ok=True)
-    rows = [e for e in expenses if e.date.startswith(month_str)]
-    total, avg = total_and_average(rows)
-    file_path = REPORTS_DIR / f"report_{month_str}.csv"
-    with open(file_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["Date", "Category", "Amount", "Description"])
-        for r in rows:
-            writer.writerow([r.date, r.category, f"{r.amount:.2f}", r.description])
-        writer.writerow([])
-        writer.writerow(["Total", f"{total:.2f}"])
-        writer.writerow(["Average", f"{avg:.2f}"])
+    reports_dir = _output_dir(out_dir, REPORTS_DIR)
+    name = f"report_{month_str}.csv"
+    file_path = reports_dir / name
+    cache = cache_for(reports_dir)
+    if source is not None:
+        source = fingerprint("report", REPORT_FORMAT_VERSION, month_str, source)
+        if cache.lookup_source(name, source):
+            return file_path
+
+    total, count = 0.0, 0
+    tmp_path = file_path.with_suffix(".tmp")
+    digest = hashlib.sha256(f"report:{REPORT_FORMAT_VERSION}:{month_str}".encode("utf-8"))
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Date", "Category", "Amount", "Description"])
+            for r in expenses:
+                if not r.date.startswith(month_str):
+                    continue
+                row = [r.date, r.category, f"{r.amount:.2f}", r.description]
+                writer.writerow(row)
+                digest.update("\x1f".join(row).encode("utf-8") + b"\x1e")
+                total += r.amount
+                count += 1
+            avg = (total / count) if count else 0.0
+            writer.writerow([])
+            writer.writerow(["Total", f"{total:.2f}"])
+            writer.writerow(["Average", f"{avg:.2f}"])
+
+        fp = digest.hexdigest()
+        if not cache.lookup(name, fp):
+            os.replace(tmp_path, file_path)
+        # Also records the new source of an unchanged report
+        cache.store(name, fp, source)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     return file_path
 
 
-def generate_category_chart(expenses, out_dir="reports"):
-    """
-    Generates a pie chart for category-wise spending
-    Saves it as PNG in reports/ folder
-    """
-    if not expenses:
-        return None
+CHART_FILES = {
+    "category": "category_spending.png",
+    "monthly": "monthly_spending.png",
+    "budget": "budget_vs_actual.png",
+}
 
-    from collections import defaultdict
-    import os
+# Part of every cache fingerprint: bump when the chart / report layout changes
+CHART_STYLE_VERSION = 1
+REPORT_FORMAT_VERSION = 1
 
-    totals = defaultdict(float)
-    for e in expenses:
-        totals[e.category] += e.amount
 
-    categories = list(totals.keys())
-    amounts = list(totals.values())
+def _chart_fingerprint(kind, data):
+    return fingerprint("chart", CHART_STYLE_VERSION, kind, data)
 
-    os.makedirs(out_dir, exist_ok=True)
-    file_path = CHARTS_DIR / "category_spending.png"
 
-    plt.figure()
-    plt.pie(amounts, labels=categories, autopct='%1.1f%%', startangle=90)
-    plt.title("Category-wise Spending")
+def _render_cached(kind, data, charts_dir):
+    # Serve an unchanged chart from the output cache instead of redrawing it
+    cache = cache_for(charts_dir)
+    fp = _chart_fingerprint(kind, data)
+    name = CHART_FILES[kind]
+    path = cache.lookup(name, fp)
+    if path is None:
+        _render(kind, data, charts_dir / name)
+        path = cache.store(name, fp)
+    return path
+
+
+def _render(kind, data, file_path):
+    """
+    Draws one chart from pre-aggregated data and saves it as PNG.
+    Top-level (picklable) so it can run in a worker process.
+    """
+    plt = _pyplot()
+
+    if kind == "category":
+        plt.figure()
+        plt.pie(list(data.values()), labels=list(data.keys()), autopct='%1.1f%%', startangle=90)
+        plt.title("Category-wise Spending")
+
+    elif kind == "monthly":
+        # Sort months chronologically
+        months = sorted(data.keys())
+        plt.figure(figsize=(8,5))
+        plt.bar(months, [data[m] for m in months], color='skyblue')
+        plt.title("Monthly Spending")
+        plt.xlabel("Month")
+        plt.ylabel("Amount (₹)")
+        plt.xticks(rotation=45)
+
+    elif kind == "budget":
+        import numpy as np
+        budgets, actuals = data
+        categories = sorted(set(list(budgets.keys()) + list(actuals.keys())))
+        x = np.arange(len(categories))
+        width = 0.35
+        plt.figure(figsize=(10,5))
+        plt.bar(x - width/2, [budgets.get(cat, 0) for cat in categories], width, label='Budget', color='green', alpha=0.7)
+        plt.bar(x + width/2, [actuals.get(cat, 0) for cat in categories], width, label='Actual', color='red', alpha=0.7)
+        plt.xticks(x, categories, rotation=45)
+        plt.ylabel("Amount (₹)")
+        plt.title("Budget vs Actual Spending per Category")
+        plt.legend()
+
+    else:
+        raise ValueError(f"Unknown chart: {kind}")
+
     plt.tight_layout()
     plt.savefig(file_path)
     plt.close()
-    open_image(file_path)
+    return file_path
+
+
+def generate_category_chart(expenses, out_dir=None, open_file=True):
+    """
+    Generates a pie chart for category-wise spending
+    Saves it as PNG in out_dir (default: charts/)
+    `expenses` may be a list, a Ledger or a Summary from summarize()
+    """
+    if not expenses:
+        return None
+
+    file_path = _render_cached("category", category_summary(expenses), _output_dir(out_dir, CHARTS_DIR))
+    if open_file:
+        open_image(file_path)
 
     return file_path
 
 
-def generate_monthly_spending_chart(expenses, out_dir="reports"):
+def generate_monthly_spending_chart(expenses, out_dir=None, open_file=True):
     """
     Generates a bar chart for monthly spending.
-    Saves PNG in reports/ folder.
+    Saves PNG in out_dir (default: charts/).
+    `expenses` may be a list, a Ledger or a Summary from summarize()
     """
     if not expenses:
         return None
 
-    totals = defaultdict(float)
-
-    for e in expenses:
-        # Extract month-year: YYYY-MM
-        month = datetime.strptime(e.date, "%Y-%m-%d").strftime("%Y-%m")
-        totals[month] += e.amount
-
-    # Sort months chronologically
-    months = sorted(totals.keys())
-    amounts = [totals[m] for m in months]
-
-    os.makedirs(out_dir, exist_ok=True)
-    file_path = CHARTS_DIR / "monthly_spending.png"
-
-    plt.figure(figsize=(8,5))
-    plt.bar(months, amounts, color='skyblue')
-    plt.title("Monthly Spending")
-    plt.xlabel("Month")
-    plt.ylabel("Amount (₹)")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(file_path)
-    plt.close()
-    open_image(file_path)
+    # Extract month-year totals: YYYY-MM
+    file_path = _render_cached("monthly", monthly_summary(expenses), _output_dir(out_dir, CHARTS_DIR))
+    if open_file:
+        open_image(file_path)
 
     return file_path
 
 
-def generate_budget_vs_actual_chart(expenses, out_dir="reports"):
+def generate_budget_vs_actual_chart(expenses, out_dir=None, open_file=True):
     """
     Generates a bar chart comparing budget vs actual spend per category.
+    `expenses` may be a list, a Ledger or a Summary from summarize()
     """
-    from budget_manager import load_budgets
+    from src.budget_manager import load_budgets
 
     if not expenses:
         return None
 
-    budgets = load_budgets()
-    actuals = defaultdict(float)
-
-    for e in expenses:
-        actuals[e.category] += e.amount
-
-    categories = sorted(set(list(budgets.keys()) + list(actuals.keys())))
-    budget_values = [budgets.get(cat, 0) for cat in categories]
-    actual_values = [actuals.get(cat, 0) for cat in categories]
-
-    os.makedirs(out_dir, exist_ok=True)
-    file_path = CHARTS_DIR / "budget_vs_actual.png"
-
-    import numpy as np
-    x = np.arange(len(categories))
-    width = 0.35
-
-    plt.figure(figsize=(10,5))
-    plt.bar(x - width/2, budget_values, width, label='Budget', color='green', alpha=0.7)
-    plt.bar(x + width/2, actual_values, width, label='Actual', color='red', alpha=0.7)
-    plt.xticks(x, categories, rotation=45)
-    plt.ylabel("Amount (₹)")
-    plt.title("Budget vs Actual Spending per Category")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(file_path)
-    plt.close()
-    open_image(file_path)
+    file_path = _render_cached("budget", (load_budgets(), category_summary(expenses)), _output_dir(out_dir, CHARTS_DIR))
+    if open_file:
+        open_image(file_path)
 
     return file_path
 
 
+def _chart_jobs(expenses, budgets):
+    # {chart: pre-aggregated data}; one summarize() pass per ledger
+    summary = summarize(expenses)
+    if not summary:
+        return {}
+    return {
+        "category": summary.by_category,
+        "monthly": summary.by_month,
+        "budget": (budgets, summary.by_category),
+    }
+
+
+# Worker pool shared by every render_charts_batch() call of the process:
+# starting workers (each importing matplotlib) costs more than a chart
+_pool = None
+_pool_workers = None
+
+
+def _chart_pool(max_workers=None):
+    global _pool, _pool_workers
+    workers = max_workers or os.cpu_count() or 1
+    if _pool is None or workers != _pool_workers:
+        from concurrent.futures import ProcessPoolExecutor
+        if _pool is not None:
+            _pool.shutdown()
+        # Workers are started on demand, up to `workers`
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    return _pool
+
+
+def render_charts_batch(ledgers, open_files=False, budgets=None, max_workers=None):
+    """
+    Renders all charts of many ledgers in one process pool, which is
+    kept for later calls (a new one only for a different max_workers).
+
+    ledgers: {charts_dir: expenses}
+    Returns {charts_dir: {chart: path}}.
+    """
+    global _pool
+    from concurrent.futures.process import BrokenProcessPool
+
+    if budgets is None:
+        from src.budget_manager import load_budgets
+        budgets = load_budgets()
+
+    # Aggregate in this process, so workers only receive small dicts;
+    # charts whose inputs are unchanged come straight from the output cache
+    results = {charts_dir: {} for charts_dir in ledgers}
+    jobs = []
+    for charts_dir, expenses in ledgers.items():
+        cache = cache_for(_output_dir(charts_dir))
+        for kind, data in _chart_jobs(expenses, budgets).items():
+            fp = _chart_fingerprint(kind, data)
+            path = cache.lookup(CHART_FILES[kind], fp)
+            if path is None:
+                jobs.append((charts_dir, kind, data, fp))
+            else:
+                results[charts_dir][kind] = path
+
+    if jobs:
+        pool = _chart_pool(max_workers)
+        futures = [(charts_dir, kind, fp, pool.submit(_render, kind, data, Path(charts_dir) / CHART_FILES[kind]))
+                   for charts_dir, kind, data, fp in jobs]
+        try:
+            for charts_dir, kind, fp, future in futures:
+                future.result()
+                results[charts_dir][kind] = cache_for(charts_dir).store(CHART_FILES[kind], fp)
+        except BrokenProcessPool:
+            # A worker died: start a fresh pool on the next call
+            _pool = None
+            raise
+
+    if open_files:
+        for paths in results.values():
+            for path in paths.values():
+                open_image(path)
+    return results
+
+
+def render_all_charts(expenses, charts_dir=None, open_files=False, budgets=None, max_workers=None):
+    """
+    Renders all three charts at once.
+
+    - Aggregates once (summarize), then draws the charts in parallel
+      in a process pool with the headless Agg backend
+    - open_files=True opens the images without waiting for the viewer
+
+    Returns {chart: path}, empty when there are no expenses.
+    """
+    charts_dir = charts_dir or CHARTS_DIR
+    return render_charts_batch({charts_dir: expenses}, open_files, budgets, max_workers)[charts_dir]
+
+
 def open_image(path):
-    """Open image automatically based on OS"""
+    """Open image automatically based on OS (does not wait for the viewer)"""
     if not os.path.exists(path):
         print("❌ File not found:", path)
         return
 
     if platform.system() == "Darwin":       # macOS
-        subprocess.call(["open", path])
+        subprocess.Popen(["open", path])
     elif platform.system() == "Windows":    # Windows
         os.startfile(path)
     else:                                   # Linux
-        subprocess.call(["xdg-open", path])
+        subprocess.Popen(["xdg-open", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
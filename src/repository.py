@@ -0,0 +1,406 @@
+"""
+In-process cache of the parsed expense ledger.
+
+One menu session touches data/expenses.csv many times; the repository
+keeps the parsed rows in memory and only re-reads the file when it has
+changed on disk.
+
+Cache key: (inode, size, mtime_ns) of the data file and its companions
+(edit journal for CSV, -wal file for SQLite, manifest for partitions).
+- Unchanged key  → cache hit, no parsing
+- Changed key    → cache miss, full reload
+- Own writes     → cache updated in place, key refreshed
+  (under the data file's lock, so other processes' writes are seen)
+
+Listeners (e.g. BudgetAlertEngine) can follow every change:
+- reset(expenses, row_ids)   after a full (re)load or save()
+- add(expense, row_id)       after append()
+- replace(row_id, old, new)  after update()
+- remove(row_id, expense)    after delete()
+
+Row ids are stable keys that only grow along the rows: the base-file
+row id for CSV, the primary key for SQLite, the load position for
+partitioned / binary ledgers (which rewrite on delete and then reset).
+
+A binary ledger is not parsed at all: the MappedLedger is the cache,
+and expenses() / rows() build row objects from the mapping only when
+they are read. Writes rewrite the file and map it again.
+A delete does not move the other rows' ids, so indexes keyed by them
+need no renumbering; rows() / positions() map ids back.
+"""
+
+from bisect import bisect_left
+from functools import wraps
+from src import journal, sqlite_store
+from src.expense import Expense, CompactExpense
+from src.file_manager import (DATA_FILE, load_expenses, load_with_row_ids, save_expenses, append_expense, append_expenses,
+                               compact_journal, is_sqlite, is_binary, is_journaled,
+                               file_stamp, load_ledger)
+from src.ledger import Ledger
+from src.locking import file_lock
+
+
+def _locked(method):
+    # The whole refresh → write → re-stamp sequence runs under the file
+    # lock, so a write from another process cannot slip in between
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with file_lock(self.filename):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _cached_row(expense):
+    # Rows are cached as a load returns them: CompactExpense, or a plain
+    # Expense when the date is not YYYY-MM-DD (kept, never dropped)
+    if isinstance(expense, CompactExpense):
+        return expense
+    try:
+        return CompactExpense(expense.amount, expense.category, expense.date, expense.description)
+    except ValueError:
+        return expense
+
+
+class ExpenseRepository:
+    """
+        Owns the parsed expenses of one data file.
+
+        Attributes:
+        - filename (Path): CSV file backing this repository
+        - hits / misses (int): cache statistics
+    """
+
+    def __init__(self, filename=DATA_FILE):
+        self.filename = filename
+        self.hits = 0
+        self.misses = 0
+        self._expenses = None
+        self._ledger = None
+        self._stamp = None
+        self._listeners = []
+        # Stable id of every cached row (see the module docstring)
+        self._journaled = is_journaled(filename)
+        self._sqlite = is_sqlite(filename)
+        # Binary ledgers are memory-mapped and served from the mapping
+        self._binary = is_binary(filename)
+        self._row_ids = None
+        self._next_row_id = 0
+
+    def add_listener(self, listener):
+        """Register an object notified of every change to the rows."""
+        self._listeners.append(listener)
+        if self._expenses is not None:
+            listener.reset(self._expenses, self._row_ids)
+
+    def _notify(self, event, *args):
+        for listener in self._listeners:
+            getattr(listener, event)(*args)
+
+    def _file_stamp(self):
+        return file_stamp(self.filename)
+
+    def is_fresh(self):
+        """True when the cached rows still match the file on disk."""
+        return self._expenses is not None and self._file_stamp() == self._stamp
+
+    def _refresh(self):
+        if self.is_fresh():
+            self.hits += 1
+            return
+        self.misses += 1
+        # Compact rows (slotted objects); rows with an unparseable date stay
+        # plain Expense objects, so a later rewrite keeps them on disk.
+        # Rows and stamp are taken under one shared lock: a write landing
+        # between them would otherwise never be picked up
+        self._ledger = None
+        with file_lock(self.filename, shared=True):
+            if self._journaled or self._sqlite:
+                self._expenses, self._row_ids, self._next_row_id = load_with_row_ids(
+                    self.filename, compact=True, keep_undated=True)
+            elif self._binary:
+                self._map()
+            else:
+                self._expenses = load_expenses(self.filename, compact=True, keep_undated=True)
+                self._renumber()
+            self._stamp = self._file_stamp()
+        self._notify("reset", self._expenses, self._row_ids)
+
+    def _renumber(self):
+        # Partitioned / binary: row ids are the positions of a fresh load
+        rows = len(self._expenses)
+        self._row_ids = range(rows) if self._binary else list(range(rows))
+        self._next_row_id = rows
+
+    def _map(self):
+        # Binary: the mapping is both the Ledger and the row sequence
+        # (Ledger[i] builds one CompactExpense), so nothing is parsed
+        self._ledger = self._expenses = load_ledger(self.filename)
+        self._renumber()
+
+    def _unmap(self):
+        # A rewrite of a binary ledger needs the rows as a list
+        if self._binary:
+            self._expenses, self._row_ids = list(self._expenses), list(self._row_ids)
+
+    def sync(self):
+        """Reloads from disk (notifying listeners) only if the file changed."""
+        self._refresh()
+
+    def expenses(self):
+        """
+            Returns the current expenses as a new list.
+            The list can be reordered/popped freely; pass it to save() to persist.
+        """
+        self._refresh()
+        return list(self._expenses)
+
+    def __len__(self):
+        self._refresh()
+        return len(self._expenses)
+
+    def rows(self, row_ids):
+        """
+            The cached rows with the given row ids, e.g. the results of
+            the listener indexes (which count undated rows too).
+        """
+        self._refresh()
+        return [self._expenses[self._position(row_id)] for row_id in row_ids]
+
+    def positions(self, row_ids):
+        """Positions in expenses() of the rows with the given row ids."""
+        self._refresh()
+        return [self._position(row_id) for row_id in row_ids]
+
+    def ledger(self):
+        """
+            Returns the expenses as a columnar Ledger (built once per load).
+            Rows without a valid date cannot be stored in it, so when there
+            are any its positions differ from expenses(): use rows() for
+            positions from the indexes.
+        """
+        self._refresh()
+        if self._ledger is None:
+            self._ledger = Ledger.from_expenses(e for e in self._expenses if isinstance(e, CompactExpense))
+        return self._ledger
+
+    def row_id(self, index):
+        """Stable base-file row id of the row at position `index` (CSV only)."""
+        self._refresh()
+        return self._row_ids[index] if self._journaled else index
+
+    def _position(self, row_id):
+        # Row ids only grow along the list, so a bisect finds the position
+        pos = bisect_left(self._row_ids, row_id)
+        if pos == len(self._row_ids) or self._row_ids[pos] != row_id:
+            raise IndexError(f"No expense with row id {row_id}")
+        return pos
+
+    def _cached_position(self, row_id):
+        # Position of a cached row; None for a row id the load skipped
+        # (e.g. a malformed line, which still has its base-file row id)
+        try:
+            return self._position(row_id)
+        except IndexError:
+            if not 0 <= row_id < self._next_row_id:
+                raise
+            return None
+
+    @_locked
+    def update_row(self, row_id, expense: Expense):
+        """
+            Like update(), addressed by stable row id (a position on
+            non-CSV backends). When the rows are not loaded, or the row
+            is not among them, the CSV gets one journal record and is not
+            parsed; returns the old expense, or None in that case.
+            Raises IndexError for a row id past the end of the file.
+        """
+        if not self._journaled:
+            return self.update(row_id, expense)
+        if self.is_fresh():
+            index = self._cached_position(row_id)
+            if index is not None:
+                return self.update(index, expense)
+        journal.record_update(self.filename, row_id, expense)
+        self.invalidate()
+        return None
+
+    @_locked
+    def delete_row(self, row_id):
+        """Like delete(), addressed by stable row id (see update_row)."""
+        if not self._journaled:
+            return self.delete(row_id)
+        if self.is_fresh():
+            index = self._cached_position(row_id)
+            if index is not None:
+                return self.delete(index)
+        journal.record_delete(self.filename, row_id)
+        self.invalidate()
+        return None
+
+    @_locked
+    def append(self, expense: Expense):
+        """
+            Appends one row. With the rows loaded and current the cache is
+            updated in place; otherwise only the row is written (the next
+            read has to parse the file anyway, so nothing is loaded now).
+        """
+        if not self.is_fresh():
+            append_expense(expense, self.filename)
+            self.invalidate()
+            return
+        if self._sqlite:
+            row_id = sqlite_store.insert(self.filename, expense)
+        else:
+            append_expense(expense, self.filename)
+            row_id = self._next_row_id
+            self._next_row_id += 1
+        row = _cached_row(expense)
+        if self._binary:
+            # The mapping is read-only; map the rewritten file
+            self._map()
+        else:
+            self._expenses.append(row)
+            self._row_ids.append(row_id)
+            if self._ledger is not None and isinstance(row, CompactExpense):
+                self._ledger.append_expense(row)
+        self._stamp = self._file_stamp()
+        self._notify("add", row, row_id)
+
+    @_locked
+    def append_many(self, expenses, **writer_options):
+        """
+            Bulk append through a group-committing ExpenseWriter
+            (writer_options: flush_size, flush_interval, fsync).
+            Returns the number of rows written. Like append(), a cold
+            cache is not loaded first.
+        """
+        if not self.is_fresh():
+            written = append_expenses(expenses, self.filename, **writer_options)
+            self.invalidate()
+            return written
+        expenses = list(expenses)
+        written = append_expenses(expenses, self.filename, **writer_options)
+        if self._sqlite:
+            # Ids are assigned by SQLite; fetch them (no row data)
+            new_ids = sqlite_store.row_ids(self.filename)[len(self._row_ids):]
+        else:
+            new_ids = range(self._next_row_id, self._next_row_id + len(expenses))
+            self._next_row_id += len(expenses)
+        rows = [_cached_row(expense) for expense in expenses]
+        if self._binary:
+            self._map()
+        else:
+            for row, row_id in zip(rows, new_ids):
+                self._expenses.append(row)
+                self._row_ids.append(row_id)
+                if self._ledger is not None and isinstance(row, CompactExpense):
+                    self._ledger.append_expense(row)
+        self._stamp = self._file_stamp()
+        for row, row_id in zip(rows, new_ids):
+            self._notify("add", row, row_id)
+        return written
+
+    @_locked
+    def update(self, index, expense: Expense):
+        """
+            Replace the row at position `index`; returns the old expense.
+            CSV: one journal record. SQLite: one UPDATE by primary key.
+            Partitioned / binary: rewrite.
+        """
+        self._refresh()
+        self._unmap()
+        old = self._expenses[index]
+        row = self._expenses[index] = _cached_row(expense)
+        if self._journaled:
+            journal.record_update(self.filename, self._row_ids[index], expense)
+        elif self._sqlite:
+            sqlite_store.update_expense(self.filename, self._row_ids[index], expense)
+        else:
+            save_expenses(self._expenses, self.filename)
+        self._ledger = None
+        if self._binary:
+            self._map()
+        self._stamp = self._file_stamp()
+        self._notify("replace", self._row_ids[index], old, row)
+        return old
+
+    @_locked
+    def delete(self, index):
+        """
+            Delete the row at position `index`; returns the deleted expense.
+            CSV: one journal tombstone. SQLite: one DELETE by primary key.
+            Partitioned / binary: rewrite.
+        """
+        self._refresh()
+        self._unmap()
+        deleted = self._expenses.pop(index)
+        row_id = self._row_ids.pop(index)
+        if self._journaled:
+            journal.record_delete(self.filename, row_id)
+        elif self._sqlite:
+            sqlite_store.delete_expense(self.filename, row_id)
+        else:
+            save_expenses(self._expenses, self.filename)
+        self._ledger = None
+        if self._binary:
+            self._map()
+        elif not (self._journaled or self._sqlite):
+            # The rewrite renumbered the rows (ids are load positions here)
+            self._renumber()
+        self._stamp = self._file_stamp()
+        if self._journaled or self._sqlite:
+            self._notify("remove", row_id, deleted)
+        else:
+            self._notify("reset", self._expenses, self._row_ids)
+        return deleted
+
+    @_locked
+    def save(self, expenses):
+        # Full rewrite; the written rows become the cache
+        rows = [_cached_row(e) for e in expenses]
+        try:
+            save_expenses(rows, self.filename)
+        except BaseException:
+            # The cache must not outlive a failed write (the old stamp
+            # could still match the file): reload on next access
+            self.invalidate()
+            raise
+        self._expenses = rows
+        self._ledger = None
+        if self._sqlite:
+            self._row_ids = sqlite_store.row_ids(self.filename)
+        elif self._binary:
+            self._map()
+        else:
+            self._renumber()
+        self._stamp = self._file_stamp()
+        self._notify("reset", self._expenses, self._row_ids)
+
+    @_locked
+    def compact(self, force=False):
+        """
+            Folds the edit journal into the base CSV once it has grown
+            (or always with force=True). Returns True if it compacted.
+        """
+        if not self._journaled or not (force or journal.needs_compaction(self.filename)):
+            return False
+        if self.is_fresh():
+            if not journal.has_journal(self.filename):
+                return False
+            # The rows are loaded: write them out instead of re-parsing
+            # the file; ids become positions and listeners are reset
+            self.save(self._expenses)
+            return True
+        compacted = compact_journal(self.filename)
+        if compacted:
+            # Row ids were renumbered: reload on next access
+            self.invalidate()
+        return compacted
+
+    def invalidate(self):
+        self._expenses = None
+        self._ledger = None
+        self._stamp = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,176 @@
+"""
+Persisted month × category rollups of the ledger.
+
+Past months never change, so instead of re-aggregating every row for
+each summary the totals are kept as a small table:
+
+    {"2024-01": {"Food": [565000, 5], "Transport": [46000, 2]}, ...}
+      month       category  paise   rows
+
+The store follows an ExpenseRepository as a listener: appends, edits
+and deletes adjust one or two cells. save() writes it next to the data
+file (data/expenses.rollups.json) together with the data file stamp
+(which covers the edit journal), and on the next start it is reused as
+long as the data has not changed in between; the stamp alone decides,
+so refresh() can answer from the saved table without parsing any row.
+
+On SQLite, a table that has to be rebuilt is aggregated by the database
+(GROUP BY date, category) instead of loading every row.
+
+summary() turns the table into a reports Summary in
+O(months × categories), so monthly_summary, category_summary and the
+charts answer without touching any rows.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from src import sidecar, sqlite_store
+from src.file_manager import is_sqlite
+from src.locking import file_lock
+from src.summary import Summary
+from src.utils import to_paise
+
+# Month key for rows whose date cannot be parsed (totals only)
+UNDATED = ""
+
+
+def rollup_path_for(data_file):
+    """data/expenses.csv → data/expenses.rollups.json"""
+    return sidecar.sidecar_path(data_file, "rollups")
+
+
+class RollupStore:
+    """
+        Month → category → [paise, rows] table for one ledger.
+    """
+
+    def __init__(self, data_file, path=None):
+        self.data_file = Path(data_file)
+        self.path = Path(path) if path else rollup_path_for(data_file)
+        self.cells = {}
+        self.rows = 0
+        self.dirty = False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Loads the saved rollups if they were built for the current data file."""
+        saved = sidecar.read(self.path, self.data_file)
+        if saved is None:
+            return False
+        self.cells = saved["cells"]
+        self.rows = saved["rows"]
+        self.dirty = False
+        return True
+
+    def save(self):
+        """Writes the rollups next to the data file, keyed to its current stamp."""
+        if not self.dirty and sidecar.read(self.path, self.data_file) is not None:
+            return
+        sidecar.write(self.path, self.data_file, {"rows": self.rows, "cells": self.cells})
+        self.dirty = False
+
+    def refresh(self, repo):
+        """
+            Brings the table up to date with repo's data file: kept by the
+            listener events while its rows are loaded, otherwise read from
+            the saved table if that matches the file. Only when neither
+            holds are the rows parsed (aggregated in the database on
+            SQLite). Returns self.
+        """
+        if not repo.is_fresh() and not self.load():
+            if is_sqlite(self.data_file):
+                self._aggregate()
+            else:
+                repo.sync()
+        return self
+
+    def _aggregate(self):
+        # SQLite: one GROUP BY query; saved with the stamp read under the
+        # same lock, so a concurrent write can't be missed
+        with file_lock(self.data_file, shared=True):
+            groups = sqlite_store.date_category_totals(self.data_file)
+            self.cells, self.rows = {}, 0
+            months = {}
+            for day, category, paise, rows in groups:
+                month = months.get(day)
+                if month is None:
+                    # Same rule as Expense.month
+                    try:
+                        month = datetime.strptime(day, "%Y-%m-%d").strftime("%Y-%m")
+                    except (TypeError, ValueError):
+                        month = UNDATED
+                    months[day] = month
+                cell = self.cells.setdefault(month, {}).setdefault(category, [0, 0])
+                cell[0] += paise
+                cell[1] += rows
+                self.rows += rows
+            self.dirty = True
+            self.save()
+
+    # ------------------------------------------------------------------
+    # Building / repository listener
+    # ------------------------------------------------------------------
+
+    def _apply(self, e, sign):
+        try:
+            month = e.month
+        except ValueError:
+            month = UNDATED
+        cats = self.cells.setdefault(month, {})
+        cell = cats.setdefault(e.category, [0, 0])
+        cell[0] += sign * to_paise(e.amount)
+        cell[1] += sign
+        if cell[1] == 0:
+            del cats[e.category]
+            if not cats:
+                del self.cells[month]
+        self.rows += sign
+
+    def reset(self, expenses, row_ids=None):
+        """Reuse the saved rollups when valid, otherwise rebuild them from rows."""
+        if self.load():
+            return
+        self.cells = {}
+        self.rows = 0
+        for e in expenses:
+            self._apply(e, +1)
+        self.dirty = True
+
+    def add(self, expense, row_id=None):
+        self._apply(expense, +1)
+        self.dirty = True
+
+    def replace(self, row_id, old, new):
+        self._apply(old, -1)
+        self._apply(new, +1)
+        self.dirty = True
+
+    def remove(self, row_id, expense):
+        self._apply(expense, -1)
+        self.dirty = True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def summary(self):
+        """A Summary (as from reports.summarize) built from the table alone."""
+        total, count = 0, 0
+        categories, months, month_cats = {}, {}, {}
+        for month in sorted(self.cells):
+            for cat, (paise, rows) in self.cells[month].items():
+                total += paise
+                count += rows
+                categories[cat] = categories.get(cat, 0) + paise
+                if month != UNDATED:
+                    months[month] = months.get(month, 0) + paise
+                    month_cats.setdefault(month, {})[cat] = paise
+        return Summary(total, count, categories, months, month_cats)
+
+    def month_counts(self):
+        """{'YYYY-MM': rows}"""
+        return {m: sum(rows for _, rows in cats.values())
+                for m, cats in sorted(self.cells.items()) if m != UNDATED}
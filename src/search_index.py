@@ -0,0 +1,176 @@
+"""
+Persistent inverted index for keyword search.
+
+Maps every token of an expense's description and category to the
+sorted list of row ids containing it (the repository's stable row ids,
+so a delete only touches the deleted row's tokens):
+
+    {"groceries": [0, 14, 92], "food": [0, 3, 14, ...], ...}
+
+Queries:
+- every query term is a prefix ("gro" matches "groceries", "grocery")
+- terms are ANDed by default; "cab OR bus" (or mode="or") unions them
+- results are ranked by how many terms match, exact tokens first
+
+The index follows an ExpenseRepository as a listener, so appends,
+edits and deletes update it in memory; save() writes it next to the
+data file (data/expenses.search.json). On the next start it is reused
+as long as the data file has not changed in between.
+"""
+
+import re
+from bisect import bisect_left, insort
+from pathlib import Path
+from src import sidecar
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def expense_tokens(expense):
+    # Distinct tokens of one row (description + category)
+    return set(tokenize(expense.description)) | set(tokenize(expense.category))
+
+
+def index_path_for(data_file):
+    """data/expenses.csv → data/expenses.search.json"""
+    return sidecar.sidecar_path(data_file, "search")
+
+
+class KeywordIndex:
+    """
+        Token → row ids index over one ledger.
+    """
+
+    def __init__(self, data_file, path=None):
+        self.data_file = Path(data_file)
+        self.path = Path(path) if path else index_path_for(data_file)
+        self.postings = {}       # token -> sorted list of row ids
+        self.rows = 0
+        self._sorted_tokens = None
+        self.dirty = False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self, rows):
+        """Loads the saved index if it was built for the current data file."""
+        saved = sidecar.read(self.path, self.data_file)
+        if saved is None or saved.get("rows") != rows:
+            return False
+        self.postings = saved["postings"]
+        self.rows = rows
+        self._sorted_tokens = None
+        self.dirty = False
+        return True
+
+    def save(self):
+        """Writes the index next to the data file (skipped if unchanged)."""
+        if not self.dirty and self.path.exists():
+            return
+        sidecar.write(self.path, self.data_file, {"rows": self.rows, "postings": self.postings})
+        self.dirty = False
+
+    # ------------------------------------------------------------------
+    # Building / repository listener
+    # ------------------------------------------------------------------
+
+    def reset(self, expenses, row_ids=None):
+        """
+            Reuse the saved index when valid, otherwise rebuild it from rows
+            (row_ids: the rows' ids, positions when not given).
+        """
+        if self.load(len(expenses)):
+            return
+        self.postings = {}
+        self.rows = 0
+        for row_id, e in zip(range(len(expenses)) if row_ids is None else row_ids, expenses):
+            for token in expense_tokens(e):
+                self.postings.setdefault(token, []).append(row_id)
+            self.rows += 1
+        self._sorted_tokens = None
+        self.dirty = True
+
+    def _index_row(self, row_id, expense):
+        for token in expense_tokens(expense):
+            posting = self.postings.get(token)
+            if posting is None:
+                self.postings[token] = [row_id]
+                self._sorted_tokens = None
+            else:
+                insort(posting, row_id)
+
+    def _unindex_row(self, row_id, expense):
+        for token in expense_tokens(expense):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            i = bisect_left(posting, row_id)
+            if i < len(posting) and posting[i] == row_id:
+                posting.pop(i)
+            if not posting:
+                del self.postings[token]
+                self._sorted_tokens = None
+
+    def add(self, expense, row_id):
+        self._index_row(row_id, expense)
+        self.rows += 1
+        self.dirty = True
+
+    def replace(self, row_id, old, new):
+        self._unindex_row(row_id, old)
+        self._index_row(row_id, new)
+        self.dirty = True
+
+    def remove(self, row_id, expense):
+        # Other rows keep their ids: only this row's tokens change
+        self._unindex_row(row_id, expense)
+        self.rows -= 1
+        self.dirty = True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def tokens_with_prefix(self, prefix):
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.postings)
+        tokens = self._sorted_tokens
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            yield tokens[i]
+            i += 1
+
+    def search(self, query, mode="and"):
+        """
+            Returns matching row ids, best match first.
+
+            Score per row = terms matched (×2 for an exact token match),
+            ties keep ledger order.
+        """
+        words = query.split()
+        if any(w == "OR" for w in words):
+            mode = "or"
+        terms = [t for w in words if w != "OR" for t in tokenize(w)]
+        if not terms:
+            return []
+
+        scores = {}
+        matched = None
+        for term in terms:
+            hits = {}
+            for token in self.tokens_with_prefix(term):
+                weight = 2 if token == term else 1
+                for pos in self.postings[token]:
+                    if weight > hits.get(pos, 0):
+                        hits[pos] = weight
+            for pos, weight in hits.items():
+                scores[pos] = scores.get(pos, 0) + weight
+            matched = set(hits) if matched is None else (
+                matched & set(hits) if mode == "and" else matched | set(hits))
+
+        return sorted(matched, key=lambda pos: (-scores[pos], pos))
@@ -0,0 +1,409 @@
+"""
+Local HTTP/JSON API over the ledger (stdlib asyncio only).
+
+    python -m src.server --port 8765
+
+Read endpoints (served concurrently from memory):
+    GET  /health
+    GET  /expenses?category=&from=&to=&q=&min=&max=   chunked JSON array
+    GET  /summary                     totals, per category, per month
+    GET  /summary/<YYYY-MM>           per category for one month
+    GET  /budgets
+    GET  /alerts
+
+Write endpoints (queued to a single writer task, applied in order;
+request bodies are limited to MAX_BODY bytes):
+    POST   /expenses                  {"amount", "category", "date", "description"}
+    PUT    /expenses/<id>             same body; <id> = position in /expenses
+    DELETE /expenses/<id>
+    PUT    /budgets/<category>        {"amount"}
+    DELETE /budgets/<category>
+    POST   /backup
+    POST   /reports/<YYYY-MM>         writes the monthly CSV report
+    POST   /charts                    renders all charts
+
+The ledger, its rollups and indexes are loaded once (a cli.Session)
+and kept up to date by the repository listeners, so reads never
+re-parse the data file. Writes go through one asyncio.Queue, so they
+never interleave with each other, and run in a thread: a write waiting
+on the file lock (held by an import or a CLI run) never stalls the
+event loop. Readers that arrive while a write or a reload (after a
+change by another process) is running wait for it in the queue instead
+of reading half-updated indexes. File-heavy jobs (reports, charts) run
+in a thread on a snapshot so readers are not blocked. Listings stream
+from a copy of their rows, taken before the first chunk is sent.
+"""
+
+import argparse
+import asyncio
+import json
+import traceback
+from urllib.parse import urlsplit, parse_qs, unquote
+from src.cli import Session, MAX_AMOUNT
+from src.expense import Expense
+from src.file_manager import DATA_FILE, backup_data, file_stamp
+from src.budget_manager import load_budgets, set_budget, delete_budget, budget_alerts
+from src.utils import validate_amount, validate_date, validate_category
+
+# Rows per chunk when streaming a listing
+CHUNK_ROWS = 500
+
+# Largest request body accepted (bytes)
+MAX_BODY = 64 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _expense_json(exp, pos=None):
+    row = {"date": exp.date, "category": exp.category, "amount": exp.amount, "description": exp.description}
+    if pos is not None:
+        row["id"] = pos
+    return row
+
+
+def _summary_json(summary):
+    return {"total": summary.total, "count": summary.count, "average": summary.average,
+            "by_category": summary.by_category, "by_month": summary.by_month}
+
+
+def _expense_from_body(body):
+    if not isinstance(body, dict):
+        raise HTTPError(400, "Expected a JSON object")
+    values = []
+    for validator, key in ((validate_amount, "amount"), (validate_category, "category"), (validate_date, "date")):
+        ok, value = validator(str(body.get(key, "")))
+        if not ok:
+            raise HTTPError(400, value)
+        values.append(value)
+    amount, category, date = values
+    return Expense(amount=amount, category=category, date=date, description=str(body.get("description", "")).strip())
+
+
+class LedgerServer:
+    """
+        asyncio HTTP server holding one Session in memory.
+    """
+
+    def __init__(self, data_file=DATA_FILE, host="127.0.0.1", port=8765):
+        self.session = Session(data_file)
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._queue = None
+        self._writer_task = None
+        self._server = None
+        self._busy = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self.session.repo.sync()
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self._queue.join()
+        self._writer_task.cancel()
+        self.session.close()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving {self.session.data_file} on http://{self.host}:{self.port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # ------------------------------------------------------------------
+    # Single writer
+    # ------------------------------------------------------------------
+
+    async def _writer(self):
+        while True:
+            func, args, future = await self._queue.get()
+            try:
+                if asyncio.iscoroutinefunction(func):
+                    result = await func(*args)
+                else:
+                    result = await self._off_loop(func, *args)
+                future.set_result(result)
+            except Exception as e:
+                # Handed to the request that queued it (see _handle)
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _off_loop(self, func, *args):
+        # Writer only: a blocking write runs in a thread; readers seeing
+        # _busy wait behind it in the queue (see _fresh)
+        self._busy = True
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            self._busy = False
+
+    async def write(self, func, *args):
+        """Queues a write and waits for the writer task to apply it."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, args, future))
+        return await future
+
+    # ------------------------------------------------------------------
+    # HTTP plumbing
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    # The body is not read, so the connection cannot be reused
+                    status = 413 if length > MAX_BODY else 400
+                    self._send_json(writer, status, {"error": REASONS[status]}, keep_alive=False)
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version != "HTTP/1.0")
+                try:
+                    await self._dispatch(method, target, body, writer, keep_alive)
+                except HTTPError as e:
+                    self._send_json(writer, e.status, {"error": str(e)}, keep_alive)
+                except Exception:
+                    # A bug: the traceback goes to the server log, not to the client
+                    traceback.print_exc()
+                    self._send_json(writer, 500, {"error": REASONS[500]}, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _head(status, content_type, keep_alive, extra):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 f"Content-Type: {content_type}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}", *extra]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def _send_json(self, writer, status, payload, keep_alive=True):
+        data = json.dumps(payload).encode("utf-8")
+        writer.write(self._head(status, "application/json", keep_alive, [f"Content-Length: {len(data)}"]) + data)
+
+    async def _send_chunked(self, writer, pieces, keep_alive=True):
+        # Chunked transfer: the listing is never built as one big string
+        writer.write(self._head(200, "application/json", keep_alive, ["Transfer-Encoding: chunked"]))
+        for piece in pieces:
+            data = piece.encode("utf-8")
+            writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    async def _dispatch(self, method, target, body, writer, keep_alive):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        payload = None
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "Invalid JSON body")
+        session = self.session
+
+        if parts == ["health"] and method == "GET":
+            return self._send_json(writer, 200, {"status": "ok", "rows": session.rollups.rows})
+
+        if parts[:1] == ["expenses"]:
+            if len(parts) == 1 and method == "GET":
+                await self._fresh()
+                try:
+                    rows = self._snapshot(self._select(query))
+                except ValueError as e:
+                    raise HTTPError(400, str(e))
+                return await self._send_chunked(writer, self._listing(rows), keep_alive)
+            if len(parts) == 1 and method == "POST":
+                exp = _expense_from_body(payload)
+                await self.write(session.repo.append, exp)
+                return self._send_json(writer, 201, _expense_json(exp), keep_alive)
+            if len(parts) == 2 and method in ("PUT", "DELETE"):
+                try:
+                    pos = int(parts[1])
+                except ValueError:
+                    raise HTTPError(404, "Unknown expense id")
+                if method == "PUT":
+                    exp = _expense_from_body(payload)
+                    await self.write(self._update, pos, exp)
+                    return self._send_json(writer, 200, _expense_json(exp, pos), keep_alive)
+                removed = await self.write(self._delete, pos)
+                return self._send_json(writer, 200, _expense_json(removed, pos), keep_alive)
+
+        if parts[:1] == ["summary"] and method == "GET":
+            await self._fresh()
+            summary = session.rollups.summary()
+            if len(parts) == 1:
+                return self._send_json(writer, 200, _summary_json(summary), keep_alive)
+            if len(parts) == 2:
+                return self._send_json(writer, 200, summary.month(parts[1]), keep_alive)
+
+        if parts[:1] == ["budgets"]:
+            if len(parts) == 1 and method == "GET":
+                return self._send_json(writer, 200, load_budgets(), keep_alive)
+            if len(parts) == 2 and method == "PUT":
+                ok, amount = validate_amount(str((payload or {}).get("amount", "")))
+                if not ok:
+                    raise HTTPError(400, amount)
+                await self.write(set_budget, parts[1], amount)
+                return self._send_json(writer, 200, load_budgets(), keep_alive)
+            if len(parts) == 2 and method == "DELETE":
+                await self.write(delete_budget, parts[1])
+                return self._send_json(writer, 200, load_budgets(), keep_alive)
+
+        if parts == ["alerts"] and method == "GET":
+            await self._fresh()
+            return self._send_json(writer, 200, budget_alerts(session.rollups.summary()), keep_alive)
+
+        if method == "POST" and parts == ["backup"]:
+            result = await self.write(backup_data, session.data_file)
+            return self._send_json(writer, 201, {"path": result.path, "bytes": result.bytes,
+                                                 "mb_per_second": result.mb_per_second}, keep_alive)
+
+        if method == "POST" and parts[:1] == ["reports"] and len(parts) == 2:
+            path = await self.write(self._report, parts[1])
+            return self._send_json(writer, 201, {"path": str(path)}, keep_alive)
+
+        if method == "POST" and parts == ["charts"]:
+            paths = await self.write(self._charts)
+            return self._send_json(writer, 201, {k: str(p) for k, p in paths.items()}, keep_alive)
+
+        raise HTTPError(404, f"No route for {method} {url.path}")
+
+    async def _fresh(self):
+        # Readers call this first: a reload from disk is queued to the
+        # writer, so it never overlaps a write or another reader
+        if self._busy or not self.session.repo.is_fresh():
+            await self.write(self._reload)
+
+    async def _reload(self):
+        # Writer only
+        if not self.session.repo.is_fresh():
+            await self._off_loop(self.session.repo.sync)
+
+    def _select(self, query):
+        # Row ids from the in-memory indexes (None: every row); the
+        # caller has awaited _fresh()
+        session = self.session
+        if "category" in query:
+            return session.indexes.in_category(query["category"])
+        if "from" in query or "to" in query:
+            return session.indexes.date_between(query.get("from", "0001-01-01"), query.get("to", "9999-12-31"))
+        if "min" in query or "max" in query:
+            return session.indexes.amount_between(float(query.get("min", 0)), float(query.get("max", MAX_AMOUNT)))
+        if "q" in query:
+            return session.keyword_index.search(query["q"])
+        return None
+
+    def _snapshot(self, row_ids):
+        # (position, row) pairs copied before streaming: the writer may
+        # change the repository while the listing waits on drain()
+        repo = self.session.repo
+        if row_ids is None:
+            return list(enumerate(repo.expenses()))
+        return list(zip(repo.positions(row_ids), repo.rows(row_ids)))
+
+    def _listing(self, snapshot):
+        # JSON array text, CHUNK_ROWS rows per piece; ids in the output
+        # are positions, as taken by PUT / DELETE
+        yield "["
+        batch = []
+        first = True
+        for pos, exp in snapshot:
+            batch.append(json.dumps(_expense_json(exp, pos)))
+            if len(batch) >= CHUNK_ROWS:
+                yield ("" if first else ",") + ",".join(batch)
+                first, batch = False, []
+        if batch:
+            yield ("" if first else ",") + ",".join(batch)
+        yield "]"
+
+    # ------------------------------------------------------------------
+    # Write operations (run by the writer task only)
+    # ------------------------------------------------------------------
+
+    def _check_position(self, pos):
+        rows = len(self.session.repo)
+        if not 0 <= pos < rows:
+            raise HTTPError(404, "Unknown expense id")
+
+    def _update(self, pos, exp):
+        self._check_position(pos)
+        self.session.repo.update(pos, exp)
+
+    def _delete(self, pos):
+        self._check_position(pos)
+        return self.session.repo.delete(pos)
+
+    async def _report(self, month):
+        from src.reports import generate_monthly_report
+        await self._reload()
+        rows = self.session.repo.expenses()   # snapshot for the worker thread
+        source = file_stamp(self.session.data_file)
+        return await asyncio.to_thread(generate_monthly_report, rows, month, source=source)
+
+    async def _charts(self):
+        from src.reports import render_all_charts
+        await self._reload()
+        summary = self.session.rollups.summary()
+        return await asyncio.to_thread(render_all_charts, summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API over the expense ledger")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default=DATA_FILE)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(LedgerServer(args.data, args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+JSON files of derived data kept next to a data file.
+
+The keyword index and the rollups are saved as data/expenses.<kind>.json
+together with the data file stamp (file_manager.file_stamp, which covers
+the edit journal). A saved file is only used while the data file still
+has that stamp, so checking it never needs the rows.
+"""
+
+import json
+from pathlib import Path
+from src.file_manager import file_stamp
+from src.locking import atomic_write
+
+
+def sidecar_path(data_file, kind):
+    """data/expenses.csv → data/expenses.<kind>.json"""
+    data_file = Path(data_file)
+    return data_file.with_name(f"{data_file.stem}.{kind}.json")
+
+
+def data_stamp(data_file):
+    # JSON round-trip turns tuples into lists
+    return [list(s) if s else None for s in file_stamp(data_file)]
+
+
+def read(path, data_file):
+    """The saved object if it was written for the current data file, else None."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(saved, dict) or saved.get("stamp") != data_stamp(data_file):
+        return None
+    return saved
+
+
+def write(path, data_file, payload):
+    """Saves payload (a dict) with the data file's current stamp."""
+    with atomic_write(path) as f:
+        json.dump({"stamp": data_stamp(data_file), **payload}, f)
@@ -0,0 +1,184 @@
+"""
+SQLite storage backend (stdlib sqlite3) for expenses.
+
+Used by file_manager when the data file has a .db / .sqlite suffix
+(see file_manager.STORAGE_BACKEND). Compared to the CSV backend:
+- WAL journal mode, so readers never block the writer
+- indexes on date, category and amount
+- edit / delete touch a single row instead of rewriting the file
+- the rollups are aggregated inside SQLite (GROUP BY date, category)
+
+Schema:
+    expenses(id, date 'YYYY-MM-DD', category, amount (paise), description)
+
+`id` is the stable key of a row: the repository loads it with the rows
+(load_with_ids) and edits / deletes address rows by it.
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from src.expense import Expense, CompactExpense
+from src.utils import to_paise
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    date        TEXT    NOT NULL,
+    category    TEXT    NOT NULL,
+    amount      INTEGER NOT NULL,
+    description TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category);
+CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses(amount);
+"""
+
+INSERT_SQL = "INSERT INTO expenses (date, category, amount, description) VALUES (?, ?, ?, ?)"
+
+# Databases this process has already set up with init()
+_initialized = set()
+
+
+def init(path):
+    """
+        Creates the schema and switches the database to WAL mode
+        (stored in the file itself); run once per database and process.
+    """
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+    _initialized.add(os.path.abspath(path))
+
+
+def connect(path):
+    """
+        Opens a connection; the database is set up by init() on first use.
+    """
+    if os.path.abspath(path) not in _initialized or not os.path.exists(path):
+        init(path)
+    conn = sqlite3.connect(path)
+    # Per-connection setting (WAL mode persists in the file)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _params(expense):
+    return expense.date, expense.category, to_paise(expense.amount), expense.description
+
+
+def id_at(path, index):
+    """
+        Primary key of the row at 0-based position `index` (id order).
+        Walks the id index up to `index`: only for file_manager's
+        positional API, the repository keeps the ids of its rows.
+    """
+    with closing(connect(path)) as conn:
+        row = conn.execute("SELECT id FROM expenses ORDER BY id LIMIT 1 OFFSET ?", (index,)).fetchone()
+    if row is None:
+        raise IndexError("expense index out of range")
+    return row[0]
+
+
+def iter_expenses(path, start=None, end=None, categories=None, compact=False, keep_undated=False):
+    """
+        Streams rows in insertion order; filters become WHERE clauses
+        (served by the date / category indexes). Rows whose date is not
+        YYYY-MM-DD are skipped when compact, unless keep_undated.
+    """
+    clauses, args = [], []
+    if start is not None:
+        clauses.append("date >= ?")
+        args.append(start)
+    if end is not None:
+        clauses.append("date <= ?")
+        args.append(end)
+    if categories is not None:
+        categories = list(categories)
+        clauses.append(f"category IN ({', '.join('?' * len(categories))})")
+        args.extend(categories)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT date, category, amount, description FROM expenses{where} ORDER BY id"
+
+    expense_cls = CompactExpense if compact else Expense
+    with closing(connect(path)) as conn:
+        for d, cat, paise, desc in conn.execute(sql, args):
+            try:
+                yield expense_cls(amount=paise / 100, category=cat, date=d, description=desc)
+            except ValueError:
+                if keep_undated:
+                    yield Expense(amount=paise / 100, category=cat, date=d, description=desc)
+
+
+def load_with_ids(path, compact=False, keep_undated=False):
+    """
+        All rows in id order with their primary keys.
+        Returns (expenses, ids); row filtering as in iter_expenses().
+    """
+    expense_cls = CompactExpense if compact else Expense
+    expenses, ids = [], []
+    with closing(connect(path)) as conn:
+        for row_id, d, cat, paise, desc in conn.execute(
+                "SELECT id, date, category, amount, description FROM expenses ORDER BY id"):
+            try:
+                exp = expense_cls(amount=paise / 100, category=cat, date=d, description=desc)
+            except ValueError:
+                if not keep_undated:
+                    continue
+                exp = Expense(amount=paise / 100, category=cat, date=d, description=desc)
+            expenses.append(exp)
+            ids.append(row_id)
+    return expenses, ids
+
+
+def row_ids(path):
+    """Primary keys of all rows, in id order."""
+    with closing(connect(path)) as conn:
+        return [row_id for row_id, in conn.execute("SELECT id FROM expenses ORDER BY id")]
+
+
+def insert(path, expense):
+    """Inserts one row; returns its id."""
+    with closing(connect(path)) as conn, conn:
+        return conn.execute(INSERT_SQL, _params(expense)).lastrowid
+
+
+def insert_many(path, expenses, replace=False):
+    """
+        Bulk insert in one transaction; replace=True clears the table first.
+        Returns the number of rows written.
+    """
+    with closing(connect(path)) as conn, conn:
+        if replace:
+            conn.execute("DELETE FROM expenses")
+        cur = conn.executemany(INSERT_SQL, (_params(e) for e in expenses))
+        return cur.rowcount
+
+
+def update_expense(path, row_id, expense):
+    """Replaces the row with primary key `row_id` (one indexed UPDATE)."""
+    with closing(connect(path)) as conn, conn:
+        cur = conn.execute(
+            "UPDATE expenses SET date = ?, category = ?, amount = ?, description = ? WHERE id = ?",
+            (*_params(expense), row_id)
+        )
+    if cur.rowcount == 0:
+        raise IndexError(f"No expense with id {row_id}")
+
+
+def delete_expense(path, row_id):
+    """Deletes the row with primary key `row_id`."""
+    with closing(connect(path)) as conn, conn:
+        cur = conn.execute("DELETE FROM expenses WHERE id = ?", (row_id,))
+    if cur.rowcount == 0:
+        raise IndexError(f"No expense with id {row_id}")
+
+
+def date_category_totals(path):
+    """
+        (date, category, paise, rows) per distinct date and category, via
+        GROUP BY: the rollups are built from these without loading rows.
+    """
+    with closing(connect(path)) as conn:
+        return conn.execute("SELECT date, category, SUM(amount), COUNT(*) FROM expenses "
+                            "GROUP BY date, category ORDER BY MIN(id)").fetchall()
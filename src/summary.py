@@ -0,0 +1,123 @@
+"""
+Single-pass multi-aggregate summary of an expense list.
+
+summarize(expenses) walks the rows once and collects everything the
+menu, reports, charts and budget alerts need:
+- total, count, average
+- per-category totals
+- per-month totals
+- per-month, per-category totals
+
+Sums are kept in integer paise (like BudgetAlertEngine), so results do
+not depend on row order. Every aggregation in reports.py and
+budget_manager.py also accepts a Summary, so one pass can feed a whole
+screen.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from src.ledger import Ledger
+from src.utils import to_paise
+
+
+@dataclass
+class Summary:
+    """
+        Aggregates of one pass over a set of expenses (amounts in paise).
+    """
+    total_paise: int = 0
+    count: int = 0
+    category_paise: dict = field(default_factory=dict)      # category -> paise
+    month_paise: dict = field(default_factory=dict)         # 'YYYY-MM' -> paise
+    month_category_paise: dict = field(default_factory=dict)  # month -> {category: paise}
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        # Lets `if not expenses:` checks in the chart functions work unchanged
+        return self.count > 0
+
+    @property
+    def total(self):
+        return self.total_paise / 100
+
+    @property
+    def average(self):
+        return (self.total / self.count) if self.count else 0.0
+
+    @property
+    def by_category(self):
+        """{category: amount}"""
+        return {cat: p / 100 for cat, p in self.category_paise.items()}
+
+    @property
+    def by_month(self):
+        """{'YYYY-MM': amount}, rows with an invalid date excluded"""
+        return {m: p / 100 for m, p in self.month_paise.items()}
+
+    @property
+    def by_category_month(self):
+        """{'YYYY-MM': {category: amount}}"""
+        return {m: {cat: p / 100 for cat, p in cats.items()}
+                for m, cats in self.month_category_paise.items()}
+
+    def month(self, month):
+        """{category: amount} for one 'YYYY-MM' month."""
+        return {cat: p / 100 for cat, p in self.month_category_paise.get(month, {}).items()}
+
+
+def _ledger_summary(ledger):
+    # Works on the columns directly: no per-row objects, one date parse per day
+    category_paise = [0] * len(ledger.categories)
+    cells = defaultdict(int)   # (ordinal, code) -> paise
+    for ordinal, code, paise in zip(ledger.dates, ledger.category_codes, ledger.amounts):
+        category_paise[code] += paise
+        cells[ordinal, code] += paise
+
+    months, month_cats = defaultdict(int), defaultdict(lambda: defaultdict(int))
+    month_of = {}
+    for (ordinal, code), paise in cells.items():
+        m = month_of.get(ordinal)
+        if m is None:
+            m = month_of[ordinal] = date.fromordinal(ordinal).strftime("%Y-%m")
+        months[m] += paise
+        month_cats[m][ledger.categories[code]] += paise
+
+    return Summary(
+        total_paise=ledger.total_paise(),
+        count=len(ledger),
+        category_paise={cat: category_paise[code] for code, cat in enumerate(ledger.categories)},
+        month_paise=dict(months),
+        month_category_paise={m: dict(cats) for m, cats in month_cats.items()},
+    )
+
+
+def summarize(expenses):
+    """
+        One pass over any iterable of expenses (list, generator, Ledger).
+        A Summary is returned unchanged.
+    """
+    if isinstance(expenses, Summary):
+        return expenses
+    if isinstance(expenses, Ledger):
+        return _ledger_summary(expenses)
+
+    total, count = 0, 0
+    categories = defaultdict(int)
+    months, month_cats = defaultdict(int), defaultdict(lambda: defaultdict(int))
+    for e in expenses:
+        paise = to_paise(e.amount)
+        total += paise
+        count += 1
+        categories[e.category] += paise
+        try:
+            m = e.month
+        except ValueError:
+            continue  # counts towards totals only
+        months[m] += paise
+        month_cats[m][e.category] += paise
+
+    return Summary(total, count, dict(categories), dict(months),
+                   {m: dict(cats) for m, cats in month_cats.items()})
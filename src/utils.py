@@ -8,12 +8,15 @@ Includes:
 - Constants
 """
 
+import math
 from datetime import datetime
 from pathlib import Path
 
 # Project root directory (Finance_Manager/)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+CSV_HEADER = ['Date', 'Category', 'Amount', 'Description']
+
 CATEGORIES = ['Food', 'Transport', 'Entertainment', 'Shopping', 'Bills', 'Health', 'Other']
 
 
@@ -24,6 +27,8 @@ def validate_amount(amount_str):
     """
     try:
         amount = float(amount_str)
+        if not math.isfinite(amount):
+            return False, "Invalid number format."
         if amount <= 0:
             return False, "Amount must be greater than 0."
         return True, float(amount)
@@ -49,6 +54,17 @@ def validate_category(cat_str):
     return True, cat
 
 
+def to_paise(amount):
+    # Convert a rupee amount into exact integer paise (1 ₹ = 100 paise).
+    # round(x, 2) rounds the exact float value like f"{x:.2f}" does, so a
+    # 3-decimal amount gets the same paise an Expense row prints.
+    # Raises ValueError for inf / nan, which have no paise value
+    amount = float(amount)
+    if not math.isfinite(amount):
+        raise ValueError(f"Not a finite amount: {amount}")
+    return int(round(round(amount, 2) * 100))
+
+
 def format_currency(amount):
     # Format a numeric amount as Indian currency (₹) with commas and 2 decimals.
     return f"₹{amount:,.2f}"
@@ -0,0 +1,129 @@
+"""
+Optional vectorized aggregation engine (NumPy + pandas).
+
+The Ledger's columns are typed arrays, so they can be handed to NumPy
+without copying (np.frombuffer) and aggregated with pandas group-by
+kernels instead of a Python loop per row:
+
+- total_and_average(expenses)
+- category_summary(expenses)
+- monthly_summary(expenses)
+
+Results match the pure-Python functions in reports.py to the paisa:
+sums are taken over integer paise and only divided by 100 at the end.
+
+pandas is imported on first use. When it is not installed, available()
+is False and every function falls back to the pure-Python path.
+"""
+
+from src.ledger import Ledger
+
+# date.toordinal() of 1970-01-01, the epoch of numpy's datetime64
+EPOCH_ORDINAL = 719163
+
+_modules = None
+
+
+def _load():
+    # (numpy, pandas) or None; the import is attempted only once
+    global _modules
+    if _modules is None:
+        try:
+            import numpy as np
+            import pandas as pd
+            _modules = (np, pd)
+        except ImportError:
+            _modules = False
+    return _modules or None
+
+
+def available():
+    """True when numpy and pandas can be imported."""
+    return _load() is not None
+
+
+def _as_ledger(expenses):
+    # `expenses` must be re-iterable (Ledger or list) for the fallback path
+    if isinstance(expenses, Ledger):
+        return expenses
+    try:
+        return Ledger.from_expenses(expenses)
+    except ValueError:
+        # A row without a valid date; let the pure-Python path decide
+        return None
+
+
+def columns(ledger: Ledger):
+    """
+        Zero-copy NumPy views of the ledger columns:
+        (paise int64, day ordinals int32, category codes uint16)
+        Works on array columns and on the memoryviews of a MappedLedger.
+    """
+    np, _ = _load()
+    return tuple(np.frombuffer(col, dtype=getattr(col, "typecode", None) or col.format)
+                 for col in (ledger.amounts, ledger.dates, ledger.category_codes))
+
+
+def to_frame(expenses):
+    """
+        DataFrame with columns paise, date (datetime64), month ('YYYY-MM')
+        and category (categorical). Returns None without pandas.
+    """
+    if not available():
+        return None
+    ledger = _as_ledger(expenses if isinstance(expenses, Ledger) else list(expenses))
+    if ledger is None:
+        return None
+    np, pd = _load()
+    paise, ordinals, codes = columns(ledger)
+    days = (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+    return pd.DataFrame({
+        "paise": paise,
+        "date": days,
+        "month": np.datetime_as_string(days.astype("datetime64[M]"), unit="M"),
+        "category": pd.Categorical.from_codes(codes, categories=ledger.categories),
+    })
+
+
+def _fallback(name, expenses):
+    # Lazy import: reports.py dispatches to this module
+    from src import reports
+    return getattr(reports, name)(expenses, engine="python")
+
+
+def total_and_average(expenses):
+    if not isinstance(expenses, Ledger):
+        expenses = list(expenses)
+    ledger = _as_ledger(expenses) if available() else None
+    if ledger is None:
+        return _fallback("total_and_average", expenses)
+    paise, _, _ = columns(ledger)
+    total = int(paise.sum()) / 100
+    return total, (total / len(ledger)) if len(ledger) else 0.0
+
+
+def category_summary(expenses):
+    if not isinstance(expenses, Ledger):
+        expenses = list(expenses)
+    ledger = _as_ledger(expenses) if available() else None
+    if ledger is None:
+        return _fallback("category_summary", expenses)
+    _, pd = _load()
+    paise, _, codes = columns(ledger)
+    per_code = pd.Series(paise).groupby(codes).sum()
+    return {ledger.categories[code]: int(total) / 100 for code, total in per_code.items()}
+
+
+def monthly_summary(expenses):
+    if not isinstance(expenses, Ledger):
+        expenses = list(expenses)
+    ledger = _as_ledger(expenses) if available() else None
+    if ledger is None:
+        return _fallback("monthly_summary", expenses)
+    np, pd = _load()
+    paise, ordinals, _ = columns(ledger)
+    # Months since 1970-01 as a plain integer group key
+    months = (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+    per_month = pd.Series(paise).groupby(months.astype(np.int64)).sum()
+    labels = np.datetime_as_string(per_month.index.to_numpy().astype("datetime64[M]"), unit="M")
+    return {str(m): int(total) / 100 for m, total in zip(labels, per_month.to_numpy())}
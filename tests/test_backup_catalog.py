@@ -0,0 +1,82 @@
+import json
+from datetime import date, timedelta
+from src import backup_catalog
+from src.backup_catalog import CatalogEntry
+from src.expense import Expense
+from src.file_manager import save_expenses, append_expenses, backup_data, list_backups
+
+
+def _entry(created):
+    return CatalogEntry(f"b_{created}.manifest.json", created, 0, 0, "")
+
+
+def test_catalog_records_backups(tmp_path):
+    ledger = tmp_path / "expenses.csv"
+    store = tmp_path / "backups"
+    save_expenses([Expense(10, "Food", "2024-01-01", "a"), Expense(20, "Bills", "2024-01-02", "b")], ledger)
+    first = backup_data(ledger, store).path
+    append_expenses([Expense(5, "Food", "2024-01-03", "c")], ledger)
+    second = backup_data(ledger, store).path
+
+    entries = backup_catalog.load(store)
+    assert [e.rows for e in entries] == [2, 3]
+    assert entries[-1].size == ledger.stat().st_size
+    assert list_backups(store) == [first, second]
+    # Rebuilt from the files when the catalog is lost
+    backup_catalog.catalog_path(store).unlink()
+    assert backup_catalog.load(store) == entries
+
+
+def test_catalog_picks_up_legacy_csv_backups(tmp_path):
+    store = tmp_path / "backups"
+    store.mkdir()
+    save_expenses([Expense(10, "Food", "2024-01-01", "a")], store / "expenses_backup_20231105_090000.csv")
+    (entry,) = backup_catalog.load(store)
+    assert (entry.created, entry.rows, entry.is_manifest) == ("2023-11-05T09:00:00", 1, False)
+    assert backup_catalog.verify(store, entry, full=True) == []
+
+
+def test_verify_detects_damage(tmp_path):
+    ledger = tmp_path / "expenses.csv"
+    store = tmp_path / "backups"
+    save_expenses([Expense(10, "Food", "2024-01-01", "a")], ledger)
+    manifest = backup_data(ledger, store).path
+    (entry,) = backup_catalog.load(store)
+    assert backup_catalog.verify(store, entry, full=True) == []
+
+    chunk = next((store / "objects").glob("*/*"))
+    chunk.write_bytes(b"not gzip")
+    assert backup_catalog.verify(store, entry) == []
+    assert backup_catalog.verify(store, entry, full=True) == ["checksum mismatch"]
+    chunk.unlink()
+    assert backup_catalog.verify(store, entry) == ["1 chunk(s) missing"]
+
+    data = json.loads(open(manifest, encoding="utf-8").read())
+    data["size"] += 1
+    open(manifest, "w", encoding="utf-8").write(json.dumps(data))
+    assert backup_catalog.verify(store, entry) == ["manifest was modified"]
+
+
+def test_gfs_retention():
+    # Two backups a day from Mon 2024-01-01 to Thu 2024-02-29
+    days = [date(2024, 1, 1) + timedelta(days=i) for i in range(60)]
+    entries = [_entry(f"{d}T{h}:00:00") for d in days for h in ("09", "18")]
+    keep = backup_catalog.retained(entries, daily=3, weekly=2, monthly=2)
+    # 3 days, then the newest of the previous ISO week and of January
+    expected = ["2024-02-29", "2024-02-28", "2024-02-27", "2024-02-25", "2024-01-31"]
+    assert keep == {_entry(f"{d}T18:00:00").name for d in expected}
+
+
+def test_prune_deletes_backups_and_unreferenced_chunks(tmp_path):
+    ledger = tmp_path / "expenses.csv"
+    store = tmp_path / "backups"
+    for i in range(3):
+        save_expenses([Expense(10 + i, "Food", "2024-01-01", f"version {i}")], ledger)
+        backup_data(ledger, store)
+    assert len(list(store.glob("objects/*/*"))) == 3
+
+    removed = backup_catalog.prune(store, daily=1, weekly=0, monthly=0)
+    assert len(removed) == 2
+    assert len(backup_catalog.load(store)) == 1
+    assert len(list(store.glob("*.manifest.json"))) == 1
+    assert len(list(store.glob("objects/*/*"))) == 1
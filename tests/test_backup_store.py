@@ -0,0 +1,60 @@
+import pytest
+from src import backup_store
+from src.expense import Expense
+from src.file_manager import save_expenses, append_expenses, backup_data, restore_backup, list_backups, load_expenses
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    # Small chunks so a test-sized ledger spans many of them
+    monkeypatch.setattr(backup_store, "MIN_CHUNK", 2048)
+    monkeypatch.setattr(backup_store, "MAX_CHUNK", 8192)
+    monkeypatch.setattr(backup_store, "BOUNDARY_MASK", 63)
+    path = tmp_path / "expenses.csv"
+    save_expenses([Expense(100 + i, "Food", "2024-01-01", f"row {i}") for i in range(5000)], path)
+    return path
+
+
+def test_incremental_backups_deduplicate(ledger, tmp_path):
+    store = tmp_path / "backups"
+    first = backup_store.backup(ledger, store)
+    assert first.new_chunks == first.chunks > 10
+
+    append_expenses([Expense(5, "Bills", "2024-02-01", "new row")], ledger)
+    second = backup_store.backup(ledger, store, compression="lzma")
+    assert second.new_chunks == 1
+    assert second.stored_bytes < first.stored_bytes / 5
+    assert backup_store.store_stats(store)["dedup_ratio"] > first.bytes / first.stored_bytes
+
+    restored = tmp_path / "restored.csv"
+    backup_store.restore(first.path, restored)
+    assert len(load_expenses(restored)) == 5000
+    backup_store.restore(second.path, restored)
+    assert restored.read_bytes() == ledger.read_bytes()
+
+
+def test_restore_detects_missing_chunks(ledger, tmp_path):
+    result = backup_store.backup(ledger, tmp_path / "backups")
+    for path in (tmp_path / "backups" / "objects").glob("*/*"):
+        path.unlink()
+        break
+    target = tmp_path / "target.csv"
+    target.write_text("keep me", encoding="utf-8")
+    with pytest.raises(ValueError):
+        backup_store.restore(result.path, target)
+    assert target.read_text(encoding="utf-8") == "keep me"
+
+
+def test_file_manager_round_trip(ledger, tmp_path):
+    store = tmp_path / "backups"
+    manifest = backup_data(ledger, store).path
+    assert list_backups(store) == [manifest]
+    save_expenses([], ledger)
+    result = restore_backup(manifest, ledger)
+    assert result.rows == 5000 and result.path == str(ledger)
+    assert len(load_expenses(ledger)) == 5000
+    # A chunk still being written (atomic_write temp file) is not garbage
+    in_flight = next((store / "objects").iterdir()) / ".0123abcd.gz.x1y2.tmp"
+    in_flight.write_bytes(b"partial")
+    assert backup_store.collect_garbage(store) == 0 and in_flight.exists()
+    assert not [p for p in store.iterdir() if p.suffix == ".csv"]
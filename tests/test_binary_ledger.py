@@ -0,0 +1,98 @@
+import pytest
+from src import binary_ledger, vectorized
+from src.expense import Expense
+from src.file_manager import (save_expenses, load_expenses, load_ledger, iter_expenses, append_expense,
+                              update_expense, delete_expense, migrate_to_binary, export_csv)
+from src.ledger import Ledger
+from src.repository import ExpenseRepository
+from src.summary import summarize
+
+ROWS = [
+    Expense(250.5, "Food", "2024-01-03", "Lunch, with \"quotes\""),
+    Expense(1200, "Bills", "2024-01-15", "Électricité ₹"),
+    Expense(0.01, "Food", "2024-02-01", ""),
+    Expense(99.99, "Transport", "2024-02-28", "line one\nline two"),
+]
+
+
+def test_csv_round_trip_is_lossless(tmp_path):
+    csv_path = tmp_path / "expenses.csv"
+    save_expenses(ROWS, csv_path)
+    original = csv_path.read_bytes()
+
+    bin_path = tmp_path / "expenses.fmb"
+    assert migrate_to_binary(csv_path, bin_path) == (4, 0)
+    out = tmp_path / "export.csv"
+    assert export_csv(bin_path, out) == 4
+    assert out.read_bytes() == original
+    assert [e.to_row() for e in load_expenses(bin_path)] == [e.to_row() for e in ROWS]
+
+
+def test_mapped_ledger_aggregates_like_a_parsed_one(tmp_path):
+    csv_path = tmp_path / "expenses.csv"
+    bin_path = tmp_path / "expenses.fmb"
+    save_expenses(ROWS + [Expense(5, "Food", "not a date", "skipped")], csv_path)
+    assert binary_ledger.write(bin_path, load_expenses(csv_path)) == (4, 1)
+
+    mapped, parsed = load_ledger(bin_path), load_ledger(csv_path)
+    assert isinstance(mapped, binary_ledger.MappedLedger)
+    assert summarize(mapped) == summarize(parsed)
+    # Written column by column from a Ledger (ASCII descriptions keep their offsets)
+    ascii_path = tmp_path / "ascii.fmb"
+    binary_ledger.write(ascii_path, Ledger.from_expenses([ROWS[0], ROWS[2], ROWS[3]]))
+    assert [str(e) for e in load_ledger(ascii_path)] == [str(ROWS[0]), str(ROWS[2]), str(ROWS[3])]
+    assert mapped.month_totals() == parsed.month_totals()
+    assert mapped.where_keyword("électricité") == [1]
+    assert str(mapped[3]) == str(ROWS[3])
+    with pytest.raises(TypeError):
+        mapped.append(1, "Food", "2024-01-01", "")
+
+    if vectorized.available():
+        paise, _, _ = vectorized.columns(mapped)
+        assert paise.tolist() == list(parsed.amounts)
+        assert vectorized.category_summary(mapped) == parsed.category_totals()
+
+
+def test_binary_backend_writes(tmp_path):
+    path = tmp_path / "expenses.fmb"
+    save_expenses(ROWS[:2], path)
+    append_expense(ROWS[2], path)
+    update_expense(0, Expense(1, "Misc", "2024-01-04", "edited"), path)
+    delete_expense(1, path)
+    assert [e.description for e in load_expenses(path)] == ["edited", ""]
+    assert [e.date for e in iter_expenses(path, start="2024-02", categories=["Food"])] == ["2024-02-01"]
+
+    repo = ExpenseRepository(path)
+    assert isinstance(repo.ledger(), binary_ledger.MappedLedger)
+    repo.append(ROWS[3])
+    assert len(repo.ledger()) == 3
+    assert repo.ledger().description(2) == ROWS[3].description
+
+
+def test_repository_serves_binary_rows_from_the_mapping(tmp_path):
+    path = tmp_path / "expenses.fmb"
+    save_expenses(ROWS, path)
+    repo = ExpenseRepository(path)
+    assert len(repo) == 4
+    # The mapping is the cache: no list of row objects was built
+    assert repo._expenses is repo.ledger()
+    assert [e.description for e in repo.rows([3, 1])] == [ROWS[3].description, ROWS[1].description]
+    repo.update(0, Expense(1, "Misc", "2024-01-04", "edited"))
+    assert repo.delete(1).description == ROWS[1].description
+    repo.append_many([Expense(7, "Food", "2024-03-01", "new")])
+    assert isinstance(repo._expenses, binary_ledger.MappedLedger)
+    assert [e.description for e in repo.expenses()] == ["edited", "", ROWS[3].description, "new"]
+    assert [e.description for e in load_expenses(path)] == ["edited", "", ROWS[3].description, "new"]
+
+
+def test_migration_counts_rows_it_cannot_store(tmp_path):
+    csv_path = tmp_path / "expenses.csv"
+    save_expenses(ROWS + [Expense(5, "Food", "not a date", "undated")], csv_path)
+    assert migrate_to_binary(csv_path, tmp_path / "expenses.fmb") == (4, 1)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "expenses.fmb"
+    path.write_bytes(b"Date,Category,Amount,Description\n" * 4)
+    with pytest.raises(ValueError):
+        binary_ledger.open_ledger(path)
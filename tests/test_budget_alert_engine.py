@@ -0,0 +1,66 @@
+import json
+import random
+import pytest
+import src.budget_manager as budget_manager
+from src.budget_manager import BudgetAlertEngine, budget_alerts
+from src.expense import Expense
+from src.file_manager import save_expenses
+from src.repository import ExpenseRepository
+
+
+@pytest.fixture
+def budget_file(tmp_path, monkeypatch):
+    path = tmp_path / "budgets.json"
+    path.write_text(json.dumps({"Food": 1000.0, "Transport": 200.0, "Bills": 0.0}))
+    monkeypatch.setattr(budget_manager, "BUDGET_FILE", path)
+    return path
+
+
+def random_expense(rnd):
+    return Expense(rnd.randrange(1, 40000) / 100, rnd.choice(["Food", "Transport", "Bills", "Other"]),
+                   f"2024-{rnd.randrange(1, 13):02d}-15", "x")
+
+
+def test_engine_matches_budget_alerts(budget_file):
+    rnd = random.Random(7)
+    expenses = []
+    engine = BudgetAlertEngine()
+    for _ in range(300):
+        op = rnd.random()
+        if op < 0.6 or not expenses:
+            e = random_expense(rnd)
+            expenses.append(e)
+            engine.add(e)
+        elif op < 0.8:
+            i = rnd.randrange(len(expenses))
+            new = random_expense(rnd)
+            engine.replace(i, expenses[i], new)
+            expenses[i] = new
+        else:
+            i = rnd.randrange(len(expenses))
+            engine.remove(i, expenses.pop(i))
+        assert engine.alerts() == budget_alerts(expenses)
+
+
+def test_engine_follows_budget_file_and_months(budget_file):
+    engine = BudgetAlertEngine([Expense(150, "Transport", "2024-03-01", "Cab")])
+    assert engine.alerts() == []
+    assert engine.month_totals("2024-03") == {"Transport": 150.0}
+
+    budget_file.write_text(json.dumps({"Transport": 100.0}))
+    assert engine.alerts() == ["🔴 Transport: Budget exceeded (150.00/100.00)"]
+
+
+def test_engine_tracks_repository_writes(budget_file, tmp_path):
+    repo = ExpenseRepository(tmp_path / "expenses.csv")
+    save_expenses([Expense(900, "Food", "2024-01-01", "Rent share")], repo.filename)
+    engine = BudgetAlertEngine()
+    repo.add_listener(engine)
+    repo.sync()
+
+    repo.append(Expense(50, "Food", "2024-01-02", "Snacks"))
+    assert engine.alerts() == budget_alerts(repo.expenses())
+    repo.update(0, Expense(10, "Food", "2024-01-01", "Tea"))
+    repo.delete(1)
+    assert engine.alerts() == budget_alerts(repo.expenses()) == []
+    assert repo.misses == 1
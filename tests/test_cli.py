@@ -0,0 +1,68 @@
+import pytest
+from src.cli import Session, run_command, main
+from src.expense import Expense
+from src.file_manager import load_expenses, save_expenses
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses([
+        Expense(1200, "Food", "2024-01-02", "Groceries"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+    ], path)
+    return path
+
+
+def test_add_and_search(data_file, capsys):
+    session = Session(data_file)
+    assert run_command(session, ["add", "--amount", "99.5", "--category", "food",
+                                 "--date", "2024-02-01", "-d", "Tea and snacks"]) == 0
+    assert run_command(session, ["search", "snack"]) == 0
+    assert run_command(session, ["search", "--from", "2024-01-03", "--to", "2024-12-31"]) == 0
+    out = capsys.readouterr().out
+    assert "Found 1 result(s):\n2024-02-01 | food: ₹99.50 - Tea and snacks" in out
+    assert "Found 2 result(s)" in out
+
+    assert run_command(session, ["add", "--amount", "-5", "--category", "Food", "--date", "2024-02-01"]) == 1
+    assert "Amount must be greater than 0." in capsys.readouterr().err
+    assert len(load_expenses(data_file)) == 3
+
+    assert run_command(session, ["search", "--min", "inf"]) == 0
+    assert "Found 0 result(s)" in capsys.readouterr().out
+    assert run_command(session, ["search", "--min", "nan"]) == 1
+
+
+def test_batch_runs_in_one_session(data_file, tmp_path, capsys):
+    statement = tmp_path / "statement.csv"
+    statement.write_text("Txn Date,Debit,Type\n2024-03-01,300,Bills\n2024-03-02,oops,Bills\n", encoding="utf-8")
+    script = tmp_path / "nightly.txt"
+    script.write_text(
+        "# nightly job\n"
+        f"import {statement} --map date='Txn Date' --map amount=Debit --map category=Type "
+        f"--rejects {tmp_path / 'rejects.csv'}\n"
+        "\n"
+        "summary\n"
+        "search --category bills\n"
+        "no-such-command\n",
+        encoding="utf-8"
+    )
+
+    assert main(["--data", str(data_file), "batch", str(script)]) == 1
+    out = capsys.readouterr().out
+    assert "Imported 1 row(s), rejected 1" in out
+    assert "Total: ₹1,950.00" in out
+    assert "Found 1 result(s):\n2024-03-01 | Bills: ₹300.00" in out
+    assert (tmp_path / "expenses.rollups.json").exists()
+
+
+def test_add_with_saved_rollups_parses_nothing(data_file):
+    session = Session(data_file)
+    assert run_command(session, ["summary"]) == 0
+    session.close()
+
+    session = Session(data_file)
+    assert run_command(session, ["add", "--amount", "10", "--category", "Food", "--date", "2024-02-01"]) == 0
+    assert run_command(session, ["summary"]) == 0
+    assert session.repo.misses == 0
+    assert session.rollups.summary().by_category == {"Food": 1210.0, "Transport": 450.0}
@@ -0,0 +1,32 @@
+import pytest
+from src.expense import Expense, CompactExpense
+
+
+def test_compact_expense_output_is_identical():
+    rows = [
+        (120.5, "Food", "2024-12-01", "Groceries"),
+        (80, "Transport", "2024-02-29", "Auto"),
+        ("1999.99", "Bills", "2025-01-31", ""),
+        (87863.155, "Bills", "2025-01-31", "3 decimals"),
+        (0.125, "Food", "2025-01-31", "half a paisa"),
+    ]
+    for args in rows:
+        e, c = Expense(*args), CompactExpense(*args)
+        assert c.to_row() == e.to_row()
+        assert str(c) == str(e)
+        assert c.month == e.month
+        assert c.amount == float(e.to_row()[2])
+
+
+def test_compact_expense_is_slotted_and_mutable():
+    c = CompactExpense(400, "Food", "2024-12-01", "Groceries")
+    assert not hasattr(c, "__dict__")
+    assert c.paise == 40000
+
+    c.amount = "12.5"
+    c.date = "2025-03-04"
+    assert c.to_row() == ["2025-03-04", "Food", "12.50", "Groceries"]
+    assert c.month == "2025-03"
+
+    with pytest.raises(ValueError):
+        c.date = "2025-13-01"
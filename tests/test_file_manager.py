@@ -1,6 +1,6 @@
 import os
 from src.expense import Expense
-from src.file_manager import save_expenses, load_expenses
+from src.file_manager import save_expenses, load_expenses, iter_expenses, append_expenses, ExpenseWriter
 
 TEST_DIR = "tests"
 TEST_FILE = os.path.join(TEST_DIR, "test_expenses.csv")
@@ -29,3 +29,41 @@ def test_save_and_load_expenses():
     # Cleanup
     if os.path.exists(TEST_FILE):
         os.remove(TEST_FILE)
+
+
+def test_iter_expenses_filters_while_streaming(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses([
+        Expense(100, "Food", "2024-01-31", "Lunch"),
+        Expense(200, "Bills", "2024-02-01", "Power"),
+        Expense(300, "Food", "2024-02-15", "Dinner"),
+        Expense(400, "Food", "2024-03-01", "Party"),
+    ], path)
+
+    stream = iter_expenses(path, start="2024-02", end="2024-02-31")
+    assert not isinstance(stream, list)
+    assert [e.amount for e in stream] == [200, 300]
+
+    food = iter_expenses(path, categories=["Food"], end="2024-02-28")
+    assert [e.description for e in food] == ["Lunch", "Dinner"]
+
+
+def test_expense_writer_group_commits(tmp_path):
+    path = tmp_path / "expenses.csv"
+    rows = [Expense(i + 1, "Food", "2024-01-01", f"Row {i}") for i in range(25)]
+
+    with ExpenseWriter(path, flush_size=10, flush_interval=60) as writer:
+        writer.write_many(rows[:15])
+        assert writer.commits == 1
+        assert len(load_expenses(path)) == 10
+    assert writer.rows_written == 15 and writer.commits == 2
+
+    assert append_expenses(rows[15:], path, flush_size=4) == 10
+    assert [e.description for e in load_expenses(path)] == [e.description for e in rows]
+
+
+def test_append_expenses_other_backends(tmp_path):
+    rows = [Expense(10, "Bills", f"2024-0{m}-01", "Power") for m in (1, 2, 2)]
+    for target in (tmp_path / "expenses.db", tmp_path / "expenses"):
+        assert append_expenses(rows, target, flush_size=2) == 3
+        assert len(load_expenses(target)) == 3
@@ -0,0 +1,68 @@
+import csv
+import json
+from src.file_manager import load_expenses
+from src.importer import import_csv, import_jsonl
+
+
+def read_rejects(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_import_bank_csv_with_mapping(tmp_path):
+    source = tmp_path / "statement.csv"
+    source.write_text(
+        "Txn Date;Narration;Debit;Type\n"
+        "2024-03-01;UPI grocery;1,250.50;Food\n"
+        "2024-03-02;Refund;-20;Other\n"
+        "2024-02-30;Bad date;10;Other\n"
+        "2024-03-03;Metro card;300;Transport\n",
+        encoding="utf-8"
+    )
+    target, rejects = tmp_path / "expenses.csv", tmp_path / "rejects.csv"
+    mapping = {"date": "Txn Date", "description": "Narration", "amount": "Debit", "category": "Type"}
+
+    result = import_csv(source, target, mapping, delimiter=";", chunk_size=2, rejects_path=rejects)
+
+    assert (result.imported, result.rejected) == (2, 2)
+    assert [e.to_row() for e in load_expenses(target)] == [
+        ["2024-03-01", "Food", "1250.50", "UPI grocery"],
+        ["2024-03-03", "Transport", "300.00", "Metro card"],
+    ]
+    assert [(r["Line"], r["Reason"]) for r in read_rejects(rejects)] == [
+        ("3", "Amount must be greater than 0."),
+        ("4", "Date must be in YYYY-MM-DD format."),
+    ]
+
+
+def test_import_jsonl(tmp_path):
+    source = tmp_path / "feed.jsonl"
+    lines = [
+        json.dumps({"Date": "2024-04-01", "Category": "Bills", "Amount": 99.5, "Description": "Phone"}),
+        "not json",
+        json.dumps({"Date": "2024-04-02", "Category": " ", "Amount": 10}),
+    ]
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    result = import_jsonl(source, tmp_path / "expenses.csv", rejects_path=tmp_path / "rejects.csv")
+
+    assert (result.imported, result.rejected) == (1, 2)
+    assert load_expenses(tmp_path / "expenses.csv")[0].amount == 99.5
+    assert [r["Line"] for r in read_rejects(result.rejects_path)] == ["2", "3"]
+
+
+def test_non_finite_amounts_are_rejected_and_clean_imports_write_no_report(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.importer.REJECTS_DIR", tmp_path / "reports")
+    source = tmp_path / "statement.csv"
+    source.write_text("Date,Category,Amount,Description\n"
+                      "2024-03-01,Food,nan,A\n2024-03-01,Food,inf,B\n2024-03-01,Food,12,C\n", encoding="utf-8")
+
+    first = import_csv(source, tmp_path / "expenses.csv")
+    second = import_csv(source, tmp_path / "expenses.csv")
+    assert (first.imported, first.rejected) == (1, 2)
+    assert first.rejects_path != second.rejects_path
+    assert [r["Reason"] for r in read_rejects(first.rejects_path)] == ["Invalid number format."] * 2
+
+    source.write_text("Date,Category,Amount,Description\n2024-03-02,Food,5,D\n", encoding="utf-8")
+    assert import_csv(source, tmp_path / "expenses.csv").rejects_path is None
+    assert len(list((tmp_path / "reports").iterdir())) == 2
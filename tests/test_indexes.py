@@ -0,0 +1,82 @@
+import pytest
+from src.expense import Expense
+from src.file_manager import save_expenses
+from src.indexes import RangeIndex, SecondaryIndexes
+from src.repository import ExpenseRepository
+
+
+def sample_expenses():
+    return [
+        Expense(1200, "Food", "2024-01-02", "Groceries"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+        Expense(900, "Food", "2024-01-12", "Dining out"),
+        Expense(300, "Transport", "2024-02-20", "Bus & metro"),
+    ]
+
+
+def test_range_index_lookups():
+    index = RangeIndex([(5, 0), (1, 1), (5, 2), (9, 3)])
+    assert index.between(2, 9) == [0, 2, 3]
+    assert index.equal(5) == [0, 2]
+
+    index.insert(5, 1)
+    index.remove(9, 3)
+    assert index.equal(5) == [0, 1, 2]
+    assert index.between(0, 100) == [1, 0, 1, 2]
+
+
+def test_secondary_indexes_queries():
+    indexes = SecondaryIndexes(sample_expenses())
+
+    assert indexes.on_date("2024-01-05") == [1]
+    assert indexes.date_between("2024-01-03", "2024-02-20") == [1, 2, 3]
+    assert indexes.amount_between(300, 900) == [3, 1, 2]
+    # An infinite bound is no bound
+    assert indexes.amount_between(300, float("inf")) == indexes.amount_between(300, 10 ** 9)
+    assert indexes.amount_between(float("-inf"), 900) == indexes.amount_between(0, 900)
+    with pytest.raises(ValueError):
+        indexes.amount_between(float("nan"), 900)
+    assert indexes.in_category("food") == [0, 2]
+
+
+def test_secondary_indexes_follow_repository(tmp_path):
+    repo = ExpenseRepository(tmp_path / "expenses.csv")
+    save_expenses(sample_expenses(), repo.filename)
+    indexes = SecondaryIndexes()
+    repo.add_listener(indexes)
+
+    repo.append(Expense(50, "Food", "2024-03-01", "Tea"))
+    repo.delete(0)
+    repo.update(1, Expense(950, "Food", "2024-01-12", "Dinner"))
+
+    # Results are stable row ids: the delete did not renumber rows 1..4
+    rows = repo.expenses()
+    fresh = SecondaryIndexes(rows)
+    assert repo.rows(indexes.date_between("2024-01-01", "2024-12-31")) == [
+        rows[i] for i in fresh.date_between("2024-01-01", "2024-12-31")]
+    assert fresh.amount_between(0, 10000) == [3, 2, 0, 1]
+    assert indexes.amount_between(0, 10000) == [4, 3, 1, 2]
+    assert indexes.in_category("food") == [2, 4] and fresh.in_category("food") == [1, 3]
+
+
+def test_delete_leaves_other_row_ids_alone(tmp_path):
+    db = tmp_path / "expenses.db"
+    save_expenses(sample_expenses(), db)
+    repo = ExpenseRepository(db)
+    indexes = SecondaryIndexes()
+    repo.add_listener(indexes)
+    repo.expenses()
+    before = indexes.by_amount.rows.tolist()
+
+    repo.delete(1)
+    assert indexes.by_amount.rows.tolist() == [r for r in before if r != 2]
+    assert [e.description for e in repo.rows(indexes.in_category("transport"))] == ["Bus & metro"]
+
+    # Partitioned ledgers rewrite on delete and rebuild from positions
+    root = tmp_path / "expenses"
+    save_expenses(sample_expenses(), root)
+    repo = ExpenseRepository(root)
+    repo.add_listener(indexes)
+    repo.delete(0)
+    assert indexes.in_category("food") == [1]
+    assert [e.description for e in repo.rows(indexes.in_category("food"))] == ["Dining out"]
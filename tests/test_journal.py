@@ -0,0 +1,63 @@
+import os
+from src.expense import Expense
+from src.file_manager import (save_expenses, load_expenses, update_expense, delete_expense,
+                              compact_journal, load_with_row_ids)
+from src.journal import journal_path_for, load_journal
+from src.repository import ExpenseRepository
+
+
+def sample_expenses():
+    return [
+        Expense(120.5, "Food", "2024-01-01", "Groceries"),
+        Expense(80, "Transport", "2024-01-02", "Auto"),
+        Expense(300, "Food", "2024-02-10", "Dinner"),
+    ]
+
+
+def test_edits_are_journaled_not_rewritten(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses(sample_expenses(), path)
+    base = path.read_bytes()
+
+    update_expense(1, Expense(95, "Transport", "2024-01-02", "Cab"), path)
+    delete_expense(0, path)
+
+    assert path.read_bytes() == base
+    assert load_journal(path) == ({1: {"Date": "2024-01-02", "Category": "Transport",
+                                       "Amount": "95.00", "Description": "Cab"}}, {0})
+    assert [e.description for e in load_expenses(path)] == ["Cab", "Dinner"]
+    assert load_with_row_ids(path)[1:] == ([1, 2], 3)
+    # Deleted and malformed last rows still count towards the next row id
+    delete_expense(1, path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        f.write("2024-01-09,Food,oops,bad\r\n")
+    assert load_with_row_ids(path)[1:] == ([1], 4)
+
+
+def test_compaction_folds_journal(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses(sample_expenses(), path)
+    delete_expense(1, path)
+
+    assert compact_journal(path)
+    assert not os.path.exists(journal_path_for(path))
+    assert [e.description for e in load_expenses(path)] == ["Groceries", "Dinner"]
+    assert not compact_journal(path)
+
+
+def test_repository_uses_stable_row_ids(tmp_path):
+    repo = ExpenseRepository(tmp_path / "expenses.csv")
+    save_expenses(sample_expenses(), repo.filename)
+
+    repo.delete(0)
+    repo.append(Expense(10, "Other", "2024-03-01", "Pen"))
+    repo.update(2, Expense(12, "Other", "2024-03-01", "Ink pen"))
+    assert repo.row_id(2) == 3
+
+    assert [e.description for e in load_expenses(repo.filename)] == ["Auto", "Dinner", "Ink pen"]
+    assert [e.description for e in repo.expenses()] == ["Auto", "Dinner", "Ink pen"]
+    assert repo.misses == 1
+
+    assert repo.compact(force=True)
+    assert [e.description for e in repo.expenses()] == ["Auto", "Dinner", "Ink pen"]
+    assert repo.row_id(2) == 2
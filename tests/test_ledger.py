@@ -0,0 +1,52 @@
+from src.expense import Expense
+from src.file_manager import save_expenses, load_ledger
+from src.ledger import Ledger
+from src.budget_manager import calculate_category_spend
+
+
+def sample_expenses():
+    return [
+        Expense(400, "Food", "2024-12-01", "Groceries"),
+        Expense(120.55, "Transport", "2024-12-03", "Bus"),
+        Expense(700, "Food", "2025-01-02", "Dining"),
+    ]
+
+
+def test_ledger_views_match_expenses():
+    expenses = sample_expenses()
+    ledger = Ledger.from_expenses(expenses)
+
+    assert len(ledger) == 3
+    assert ledger.categories == ["Food", "Transport"]
+    assert [e.to_row() for e in ledger] == [e.to_row() for e in expenses]
+    assert ledger[-1].description == "Dining"
+    assert ledger.amounts[1] == 12055
+
+
+def test_ledger_aggregations_and_filters():
+    ledger = Ledger.from_expenses(sample_expenses())
+
+    assert ledger.category_totals() == calculate_category_spend(sample_expenses())
+    assert calculate_category_spend(ledger) == {"Food": 1100.0, "Transport": 120.55}
+    assert ledger.month_totals() == {"2024-12": 520.55, "2025-01": 700.0}
+    assert ledger.where_date("2024-12-03") == [1]
+    assert ledger.where_category("food") == [0, 2]
+    assert ledger.where_amount(100, 500) == [0, 1]
+    assert ledger.where_keyword("din") == [2]
+
+
+def test_load_ledger_from_csv(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses(sample_expenses(), path)
+
+    ledger = load_ledger(path)
+    assert [e.to_row() for e in ledger] == [e.to_row() for e in sample_expenses()]
+
+
+def test_load_ledger_skips_blank_and_short_lines(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses(sample_expenses(), path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        f.write("   \r\n,\r\n2024-12-09\r\n")
+    ledger = load_ledger(path)
+    assert [e.to_row() for e in ledger] == [e.to_row() for e in sample_expenses()]
@@ -0,0 +1,117 @@
+import json
+import pytest
+import subprocess
+import sys
+import threading
+from src.file_manager import load_expenses, save_expenses, compact_journal, iter_expenses
+from src.journal import has_journal
+from src.locking import atomic_write, file_lock, LockUpgradeError
+from src.utils import PROJECT_ROOT
+
+WORKERS = 6
+ROWS = 60
+
+# Each worker mixes single appends, group commits and budget updates
+WORKER = """
+import sys
+from pathlib import Path
+import src.budget_manager as bm
+from src.expense import Expense
+from src.file_manager import append_expense, append_expenses
+from src.repository import ExpenseRepository
+
+data, budgets, worker, rows = Path(sys.argv[1]), Path(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+bm.BUDGET_FILE = budgets
+repo = ExpenseRepository(data)
+for i in range(0, rows, 6):
+    append_expense(Expense(1 + i, "Food", "2024-01-01", f"w{worker}-{i}"), data)
+    repo.append(Expense(1 + i, "Food", "2024-01-01", f"w{worker}-{i + 1}"))
+    append_expenses([Expense(1 + i, "Food", "2024-01-01", f"w{worker}-{i + k}") for k in range(2, 6)],
+                    data, flush_size=2)
+    bm.set_budget(f"cat-{worker}", i)
+"""
+
+
+def test_parallel_writers_lose_no_rows(tmp_path):
+    data, budgets = tmp_path / "expenses.csv", tmp_path / "budgets.json"
+    save_expenses([], data)
+    procs = [subprocess.Popen([sys.executable, "-c", WORKER, str(data), str(budgets), str(w), str(ROWS)],
+                              cwd=PROJECT_ROOT)
+             for w in range(WORKERS)]
+    assert all(p.wait(timeout=120) == 0 for p in procs)
+
+    rows = load_expenses(data)
+    assert len(rows) == WORKERS * ROWS
+    assert {e.description for e in rows} == {f"w{w}-{i}" for w in range(WORKERS) for i in range(ROWS)}
+    with open(budgets, encoding='utf-8') as f:
+        assert json.load(f) == {f"cat-{w}": float(ROWS - 6) for w in range(WORKERS)}
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_text("old", encoding="utf-8")
+    try:
+        with atomic_write(path) as f:
+            f.write("half written")
+            raise RuntimeError("crash")
+    except RuntimeError:
+        pass
+    assert path.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["expenses.csv"]
+
+
+def test_compaction_is_locked_and_atomic(tmp_path):
+    from src.repository import ExpenseRepository
+    from src.expense import Expense
+    data = tmp_path / "expenses.csv"
+    save_expenses([Expense(10, "Food", "2024-01-01", "a"), Expense(20, "Food", "2024-01-02", "b")], data)
+    ExpenseRepository(data).delete(0)
+    assert compact_journal(data) and not has_journal(data)
+    assert [e.description for e in load_expenses(data)] == ["b"]
+
+
+def test_shared_lock_keeps_writers_out(tmp_path):
+    data = tmp_path / "expenses.csv"
+    shared, acquired = threading.Event(), threading.Event()
+
+    def lock(event, **kwargs):
+        with file_lock(data, **kwargs):
+            event.set()
+
+    with file_lock(data, shared=True):
+        # Readers share the lock; a writer (own thread, own fd) waits
+        threading.Thread(target=lock, args=(shared,), kwargs={"shared": True}).start()
+        assert shared.wait(5)
+        thread = threading.Thread(target=lock, args=(acquired,))
+        thread.start()
+        assert not acquired.wait(0.2)
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+
+
+def test_nested_locks_never_upgrade_a_shared_lock(tmp_path):
+    data = tmp_path / "expenses.csv"
+    with file_lock(data):
+        with file_lock(data, shared=True):
+            with file_lock(data):
+                pass
+    with file_lock(data, shared=True):
+        with file_lock(data, shared=True):
+            with pytest.raises(LockUpgradeError):
+                with file_lock(data):
+                    pass
+    # Released: a new exclusive lock is fine
+    with file_lock(data):
+        pass
+
+def test_reader_keeps_its_view_across_a_compaction(tmp_path):
+    from src.repository import ExpenseRepository
+    from src.expense import Expense
+    data = tmp_path / "expenses.csv"
+    save_expenses([Expense(10, "Food", "2024-01-01", d) for d in "abc"], data)
+    ExpenseRepository(data).delete(0)
+    rows = iter_expenses(data)
+    first = next(rows)
+    assert compact_journal(data)
+    assert [first.description] + [e.description for e in rows] == ["b", "c"]
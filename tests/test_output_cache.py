@@ -0,0 +1,40 @@
+from src.output_cache import OutputCache, fingerprint
+
+
+def write(directory, name, size):
+    (directory / name).write_bytes(b"x" * size)
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"Food": 1, "Bills": 2}) == fingerprint({"Bills": 2, "Food": 1})
+    assert fingerprint({"Food": 1}) != fingerprint({"Food": 2})
+
+
+def test_hit_miss_and_persisted_index(tmp_path):
+    cache = OutputCache(tmp_path)
+    assert cache.lookup("a.png", "fp1") is None
+    write(tmp_path, "a.png", 10)
+    cache.store("a.png", "fp1")
+
+    assert cache.lookup("a.png", "fp1") == tmp_path / "a.png"
+    assert cache.lookup("a.png", "fp2") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # A new process sees the same index; a deleted file is a miss
+    reopened = OutputCache(tmp_path)
+    assert reopened.lookup("a.png", "fp1")
+    (tmp_path / "a.png").unlink()
+    assert reopened.lookup("a.png", "fp1") is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = OutputCache(tmp_path, max_bytes=25)
+    for name in ("a.csv", "b.csv"):
+        write(tmp_path, name, 10)
+        cache.store(name, name)
+    cache.lookup("a.csv", "a.csv")        # a is now more recent than b
+    write(tmp_path, "c.csv", 10)
+    cache.store("c.csv", "c.csv")
+
+    assert not (tmp_path / "b.csv").exists()
+    assert cache.stats() == {"hits": 1, "misses": 0, "evictions": 1, "artifacts": 2, "bytes": 20}
@@ -0,0 +1,111 @@
+import pytest
+from src.expense import Expense
+from src.file_manager import save_expenses, append_expenses, load_with_row_ids, load_ledger
+from src.pager import LineIndex, CsvPager, LedgerPager
+from src.repository import ExpenseRepository
+
+
+def _ledger_file(tmp_path, n=95):
+    path = tmp_path / "expenses.csv"
+    rows = [Expense(i + 1, "Food", f"2024-01-{i % 28 + 1:02d}", f"row {i}") for i in range(n)]
+    rows[10].description = 'multi\nline, "quoted"'
+    save_expenses(rows, path)
+    return path
+
+
+def _expected(path):
+    expenses, row_ids, _ = load_with_row_ids(path)
+    return [(row_id, str(e)) for row_id, e in zip(row_ids, expenses)]
+
+
+def _all_pages(pager):
+    return [(row_id, str(e)) for k in range(pager.pages) for row_id, e in pager.page(k)]
+
+
+def test_pages_match_a_full_load(tmp_path):
+    path = _ledger_file(tmp_path)
+    pager = CsvPager(LineIndex(path), page_size=20)
+    assert (len(pager), pager.pages) == (95, 5)
+    assert len(pager.page(4)) == 15
+    assert _all_pages(pager) == _expected(path)
+    assert pager.get(10).description == 'multi\nline, "quoted"'
+    assert pager.page_of_id(45) == 2
+    assert pager.page_of_date("2024-01-15") == 0
+    assert pager.page(5) == [] and pager.get(95) is None
+
+
+def test_index_is_extended_on_append_and_rebuilt_on_rewrite(tmp_path):
+    path = _ledger_file(tmp_path, n=30)
+    index = LineIndex(path).refresh()
+    index.save()
+
+    append_expenses([Expense(7, "Bills", "2024-03-05", "appended")], path)
+    reloaded = LineIndex(path).refresh()
+    assert len(reloaded) == 31
+    assert reloaded.offsets[:31] == index.offsets
+    assert CsvPager(reloaded).get(30).description == "appended"
+
+    save_expenses([Expense(1, "Food", "2024-02-01", "only row")], path)
+    assert len(reloaded.refresh()) == 1
+    assert str(CsvPager(reloaded).get(0)) == "2024-02-01 | Food: ₹1.00 - only row"
+
+
+def test_edits_by_row_id_without_loading(tmp_path):
+    path = _ledger_file(tmp_path, n=50)
+    repo = ExpenseRepository(path)
+    repo.delete_row(3)
+    repo.update_row(40, Expense(9, "Bills", "2024-05-01", "edited"))
+    assert repo.misses == 0
+
+    pager = CsvPager(LineIndex(path), page_size=10)
+    assert len(pager) == 49
+    assert _all_pages(pager) == _expected(path)
+    assert pager.get(3) is None and pager.page_of_id(4) == 0
+    assert pager.page_of_id(40) == 3
+    assert pager.page_of_date("2024-05-01") == 3
+
+    # With the rows loaded the cache is updated in place
+    repo.expenses()
+    assert str(repo.delete_row(40)) == "2024-05-01 | Bills: ₹9.00 - edited"
+    assert repo.is_fresh()
+
+
+def test_row_ids_of_rows_the_load_skipped(tmp_path):
+    path = _ledger_file(tmp_path, n=12)
+    # A line of spaces and a malformed row keep their row ids (12 and 13)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        f.write("   \r\n\r\n2024-01-09,Food,oops,bad amount\r\n2024-01-10,Food,3.00,last\r\n")
+    pager = CsvPager(LineIndex(path))
+    assert _all_pages(pager) == _expected(path)
+    assert pager.get(14).description == "last"
+
+    repo = ExpenseRepository(path)
+    repo.expenses()
+    assert repo.update_row(13, Expense(4, "Food", "2024-01-09", "fixed")) is None
+    assert [e.description for e in repo.expenses()[-2:]] == ["fixed", "last"]
+    with pytest.raises(IndexError):
+        repo.delete_row(15)
+
+
+def test_ledger_pager(tmp_path):
+    pager = LedgerPager(load_ledger(_ledger_file(tmp_path, n=25)), page_size=10)
+    assert pager.pages == 3
+    assert [pos for pos, _ in pager.page(2)] == [20, 21, 22, 23, 24]
+    assert pager.page_of_date("2024-01-25") == 2
+    assert pager.get(24).description == "row 24"
+
+
+def test_last_row_without_a_newline(tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_bytes(b"Date,Category,Amount,Description\r\n"
+                     b"2024-01-01,Food,1.00,first\r\n2024-01-02,Food,2.00,second")
+    index = LineIndex(path)
+    pager = CsvPager(index)
+    assert len(pager) == 2 and _all_pages(pager) == _expected(path)
+    assert pager.get(1).description == "second"
+
+    # Completed later: the open row is scanned again, not indexed twice
+    with open(path, "ab") as f:
+        f.write(b"\r\n2024-01-03,Food,3.00,third\r\n2024-01-04,Food,4.00,\"open")
+    pager = CsvPager(index)
+    assert len(pager) == 3 and _all_pages(pager) == _expected(path)[:3]
@@ -0,0 +1,73 @@
+import pytest
+from src.expense import Expense
+from src.file_manager import (save_expenses, load_expenses, append_expense, iter_expenses,
+                              migrate_to_partitions, is_partitioned, is_journaled)
+from src.partitions import partition_files, load_manifest, rebuild_manifest, month_totals, total_and_count
+
+
+def sample_expenses():
+    return [
+        Expense(1200, "Food", "2024-01-02", "Groceries"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+        Expense(1800, "Bills", "2024-02-15", "Electricity bill"),
+        Expense(500, "Other", "2025-01-03", "Gift"),
+    ]
+
+
+def test_migrate_and_read_partitions(tmp_path):
+    csv_path, root = tmp_path / "expenses.csv", tmp_path / "expenses"
+    save_expenses(sample_expenses(), csv_path)
+
+    assert migrate_to_partitions(csv_path, root) == 4
+    assert (root / "2024" / "01.csv").exists()
+    assert load_manifest(root)["2024-01"] == {"rows": 2, "total_paise": 165000}
+    assert [e.to_row() for e in load_expenses(root)] == [e.to_row() for e in sample_expenses()]
+
+
+def test_reports_only_touch_needed_partitions(tmp_path):
+    root = tmp_path / "expenses"
+    save_expenses(sample_expenses(), root)
+
+    assert partition_files(root, "2024-02", "2024-02-31") == [root / "2024" / "02.csv"]
+    assert len(partition_files(root, "2024", "2024-31")) == 2
+    assert [e.amount for e in iter_expenses(root, start="2024", end="2024-31")] == [1200, 450, 1800]
+
+
+def test_append_updates_manifest(tmp_path):
+    root = tmp_path / "expenses"
+    save_expenses(sample_expenses(), root)
+    append_expense(Expense(100, "Food", "2024-02-20", "Snacks"), root)
+
+    assert month_totals(root) == {"2024-01": 1650.0, "2024-02": 1900.0, "2025-01": 500.0}
+    assert total_and_count(root) == (4050.0, 5)
+    assert rebuild_manifest(root) == load_manifest(root)
+
+
+def test_rewrite_keeps_undated_rows_and_old_ledger_on_failure(tmp_path):
+    root = tmp_path / "expenses"
+    save_expenses(sample_expenses() + [Expense(75, "Food", "03/01/2024", "Legacy date")], root)
+    assert load_manifest(root)["undated"] == {"rows": 1, "total_paise": 7500}
+    assert [e.description for e in load_expenses(root)][-1] == "Legacy date"
+    assert total_and_count(root) == (4025.0, 5)
+    assert "undated" not in month_totals(root)
+
+    def failing_rows():
+        yield Expense(1, "Food", "2024-01-09", "partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        save_expenses(failing_rows(), root)
+    assert len(load_expenses(root)) == 5
+    assert not list(root.glob("**/*.tmp"))
+
+    # Months without rows are removed after the new ones are in place
+    save_expenses(sample_expenses()[:2], root)
+    assert partition_files(root) == [root / "2024" / "01.csv"]
+    assert not (root / "2025" / "01.csv").exists() and not (root / "undated.csv").exists()
+
+
+def test_only_directories_are_partitioned(tmp_path):
+    plain = tmp_path / "expenses"
+    plain.write_text("Date,Category,Amount,Description\n")
+    assert not is_partitioned(plain) and is_journaled(plain)
+    assert is_partitioned(tmp_path / "new_ledger") and is_partitioned(tmp_path)
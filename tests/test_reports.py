@@ -0,0 +1,144 @@
+import csv
+import pytest
+from src.expense import Expense
+import src.reports as reports
+from src.reports import total_and_average, category_summary, monthly_summary, generate_monthly_report
+
+
+@pytest.fixture
+def expenses():
+    return [
+        Expense(1200, "Food", "2024-01-02", "Groceries"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+        Expense(1800, "Bills", "2024-02-15", "Electricity bill"),
+        Expense(650, "Health", "2024-02-18", "Pharmacy"),
+    ]
+
+
+def test_aggregations_accept_generators(expenses):
+    assert total_and_average(e for e in expenses) == (4100.0, 1025.0)
+    assert total_and_average(iter([])) == (0.0, 0.0)
+    assert category_summary(e for e in expenses)["Food"] == 1200
+    assert monthly_summary(e for e in expenses) == {"2024-01": 1650.0, "2024-02": 2450.0}
+
+
+def test_generate_monthly_report_streams_rows(expenses, tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, "REPORTS_DIR", tmp_path)
+    path = generate_monthly_report((e for e in expenses), "2024-02", out_dir=tmp_path)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[1] == ["2024-02-15", "Bills", "1800.00", "Electricity bill"]
+    assert rows[-2:] == [["Total", "2450.00"], ["Average", "1225.00"]]
+
+
+
+def test_out_dir_defaults_to_the_project_directories(expenses, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(reports, "REPORTS_DIR", tmp_path / "project" / "reports")
+    path = generate_monthly_report(expenses, "2024-01")
+
+    assert path == tmp_path / "project" / "reports" / "report_2024-01.csv"
+    assert not (tmp_path / "reports").exists()
+    assert generate_monthly_report(expenses, "2024-01", out_dir=tmp_path / "out").parent == tmp_path / "out"
+
+def test_summarize_single_pass(expenses):
+    from src.budget_manager import calculate_category_spend
+    from src.ledger import Ledger
+    from src.reports import summarize
+
+    summary = summarize(e for e in expenses)
+    assert (summary.total, summary.count, summary.average) == (4100.0, 4, 1025.0)
+    assert summary.by_month == monthly_summary(expenses)
+    assert summary.by_category == category_summary(expenses)
+    assert summary.month("2024-02") == {"Bills": 1800.0, "Health": 650.0}
+
+    # Ledger fast path gives the same result; a Summary passes through
+    assert summarize(Ledger.from_expenses(expenses)) == summary
+    assert summarize(summary) is summary
+    assert total_and_average(summary) == (4100.0, 1025.0)
+    assert monthly_summary(summary) == summary.by_month
+    assert calculate_category_spend(summary) == summary.by_category
+
+
+def test_render_all_charts(expenses, tmp_path, monkeypatch):
+    opened = []
+    monkeypatch.setattr(reports, "open_image", opened.append)
+
+    paths = reports.render_all_charts(expenses, charts_dir=tmp_path, open_files=True, budgets={"Food": 1000})
+    assert set(paths) == {"category", "monthly", "budget"}
+    assert all(p.parent == tmp_path and p.stat().st_size > 0 for p in paths.values())
+    assert opened == list(paths.values())
+    assert reports.render_all_charts([], charts_dir=tmp_path) == {}
+
+
+def test_outputs_served_from_cache(expenses, tmp_path, monkeypatch):
+    from src.output_cache import cache_for
+    monkeypatch.setattr(reports, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(reports, "open_image", lambda path: None)
+
+    path = generate_monthly_report(expenses, "2024-01", out_dir=tmp_path)
+    mtime = path.stat().st_mtime_ns
+    assert generate_monthly_report(iter(expenses), "2024-01", out_dir=tmp_path) == path
+    assert path.stat().st_mtime_ns == mtime
+    expenses.append(Expense(5, "Food", "2024-01-30", "Tea"))
+    generate_monthly_report(expenses, "2024-01", out_dir=tmp_path)
+    assert cache_for(tmp_path).stats()["hits"] == 1
+    assert rows_of(path)[-2] == ["Total", "1655.00"]
+
+    charts = tmp_path / "charts"
+    first = reports.render_all_charts(expenses, charts_dir=charts, budgets={})
+    assert reports.render_all_charts(expenses, charts_dir=charts, budgets={}) == first
+    assert cache_for(charts).stats()["hits"] == 3
+
+
+def rows_of(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_chart_batches_share_one_pool_and_create_nested_dirs(tmp_path):
+    pytest.importorskip("matplotlib")
+    expenses = [Expense(100, "Food", "2024-01-02", "Lunch")]
+    first = reports.render_charts_batch({tmp_path / "a" / "charts": expenses}, budgets={}, max_workers=1)
+    pool = reports._chart_pool(1)
+    second = reports.render_charts_batch({tmp_path / "b" / "charts": expenses}, budgets={}, max_workers=1)
+    assert reports._chart_pool(1) is pool
+    assert all(p.exists() for result in (first, second) for paths in result.values() for p in paths.values())
+
+
+def test_report_source_hit_reads_no_rows_and_evict_spares_user_files(expenses, tmp_path, monkeypatch):
+    from src.output_cache import OutputCache
+    monkeypatch.setattr(reports, "REPORTS_DIR", tmp_path)
+
+    def rows():
+        yield from expenses
+        read.append(True)
+    read = []
+    path = generate_monthly_report(rows(), "2024-01", out_dir=tmp_path, source=("stamp", 1))
+    assert generate_monthly_report(rows(), "2024-01", out_dir=tmp_path, source=("stamp", 1)) == path
+    assert read == [True]
+    assert not list(tmp_path.glob("*.tmp"))
+
+    def failing():
+        raise OSError("disk full")
+        yield
+    with pytest.raises(OSError):
+        generate_monthly_report(failing(), "2024-02", out_dir=tmp_path)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # Hits do not rewrite the index; eviction only deletes files it wrote
+    out = tmp_path / "out"
+    out.mkdir()
+    cache = OutputCache(out, max_bytes=20)
+    (out / "a.csv").write_text("report a")
+    (out / "b.csv").write_text("report b")
+    cache.store("a.csv", "a")
+    cache.store("b.csv", "b")
+    index_mtime = cache.index_path.stat().st_mtime_ns
+    assert cache.lookup("a.csv", "a") and cache.index_path.stat().st_mtime_ns == index_mtime
+    (out / "b.csv").write_text("edited by the user")
+    (out / "c.csv").write_text("report c")
+    cache.store("c.csv", "c")
+    assert cache.evictions == 0 and cache.stats()["artifacts"] == 2
+    assert sorted(p.name for p in out.glob("*.csv")) == ["a.csv", "b.csv", "c.csv"]
@@ -0,0 +1,99 @@
+import pytest
+from src import repository
+from src.expense import Expense
+from src.file_manager import save_expenses, append_expense, load_expenses
+from src.indexes import SecondaryIndexes
+from src.repository import ExpenseRepository
+
+
+def make_repo(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses([Expense(100, "Food", "2024-01-01", "Lunch")], path)
+    return ExpenseRepository(path)
+
+
+def test_repository_reuses_parsed_rows(tmp_path):
+    repo = make_repo(tmp_path)
+
+    assert len(repo.expenses()) == 1
+    assert len(repo.expenses()) == 1
+    assert repo.stats() == {"hits": 1, "misses": 1}
+
+
+def test_repository_own_writes_keep_cache_warm(tmp_path):
+    repo = make_repo(tmp_path)
+    repo.expenses()
+
+    repo.append(Expense(50, "Transport", "2024-01-02", "Bus"))
+    exps = repo.expenses()
+    assert [e.amount for e in exps] == [100, 50]
+
+    exps.pop(0)
+    repo.save(exps)
+    assert [e.description for e in repo.expenses()] == ["Bus"]
+    assert repo.misses == 1
+
+
+def test_failed_save_does_not_serve_unsaved_rows(tmp_path, monkeypatch):
+    repo = make_repo(tmp_path)
+    repo.expenses()
+
+    def disk_full(expenses, filename):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repository, "save_expenses", disk_full)
+    with pytest.raises(OSError):
+        repo.save([Expense(5, "Food", "2024-01-09", "never written")])
+    assert [e.description for e in repo.expenses()] == ["Lunch"]
+
+def test_repository_reloads_after_external_change(tmp_path):
+    repo = make_repo(tmp_path)
+    repo.expenses()
+
+    append_expense(Expense(75, "Bills", "2024-01-03", "Water"), repo.filename)
+    assert len(repo.ledger()) == 2
+    assert repo.misses == 2
+
+
+def test_repository_bulk_append(tmp_path):
+    repo = make_repo(tmp_path)
+    rows = [Expense(i + 1, "Bills", "2024-02-01", f"Bill {i}") for i in range(5)]
+
+    assert repo.append_many(rows, flush_size=2) == 5
+    assert len(repo.expenses()) == 6
+    assert repo.row_id(5) == 5
+    assert repo.misses == 1
+
+
+def test_repository_keeps_rows_with_legacy_dates(tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_text("Date,Category,Amount,Description\n"
+                    "01/02/2024,Food,5.00,legacy\n"
+                    "2024-01-03,Food,6.00,ok\n", encoding="utf-8")
+    repo = ExpenseRepository(path)
+    indexes = SecondaryIndexes()
+    repo.add_listener(indexes)
+    repo.sync()
+
+    repo.append(Expense(7, "Bills", "2024-01-04", "new"))
+    assert [e.description for e in repo.rows(indexes.in_category("food"))] == ["legacy", "ok"]
+    assert len(repo) == 3 and len(repo.ledger()) == 2
+
+    repo.save(repo.expenses())
+    assert [e.to_row() for e in load_expenses(path)] == [
+        ["01/02/2024", "Food", "5.00", "legacy"],
+        ["2024-01-03", "Food", "6.00", "ok"],
+        ["2024-01-04", "Bills", "7.00", "new"],
+    ]
+
+
+def test_append_to_a_cold_cache_parses_nothing(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses([Expense(1, "Food", "2024-01-01", "first")], path)
+    repo = ExpenseRepository(path)
+
+    repo.append(Expense(2, "Food", "2024-01-02", "second"))
+    repo.append_many([Expense(3, "Food", "2024-01-03", "third")])
+    assert repo.misses == 0
+    assert [e.description for e in repo.expenses()] == ["first", "second", "third"]
+    assert repo.misses == 1
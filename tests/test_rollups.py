@@ -0,0 +1,54 @@
+from src.expense import Expense
+from src.file_manager import save_expenses
+from src.reports import summarize, monthly_summary, category_summary
+from src.repository import ExpenseRepository
+from src.rollups import RollupStore
+
+
+def make_repo(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses([
+        Expense(1200, "Food", "2024-01-02", "Groceries"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+        Expense(900, "Food", "2024-02-12", "Dining out"),
+    ], path)
+    return ExpenseRepository(path)
+
+
+def test_rollups_follow_writes(tmp_path):
+    repo = make_repo(tmp_path)
+    rollups = RollupStore(repo.filename)
+    repo.add_listener(rollups)
+
+    repo.append(Expense(300.25, "Transport", "2024-02-20", "Bus"))
+    repo.update(0, Expense(1100, "Food", "2024-01-02", "Groceries"))
+    repo.delete(1)
+
+    summary = rollups.summary()
+    assert summary == summarize(repo.expenses())
+    assert monthly_summary(summary) == {"2024-01": 1100.0, "2024-02": 1200.25}
+    assert category_summary(summary) == {"Food": 2000.0, "Transport": 300.25}
+    assert rollups.month_counts() == {"2024-01": 1, "2024-02": 2}
+
+
+def test_rollups_persist_until_data_changes(tmp_path):
+    repo = make_repo(tmp_path)
+    rollups = RollupStore(repo.filename)
+    repo.add_listener(rollups)
+    repo.sync()
+    rollups.save()
+
+    reloaded = RollupStore(repo.filename)
+    assert reloaded.load()
+    assert reloaded.summary() == rollups.summary()
+
+    # A new process answers from the saved table without parsing rows
+    cold = ExpenseRepository(repo.filename)
+    assert RollupStore(repo.filename).refresh(cold).summary() == rollups.summary()
+    assert cold.misses == 0
+
+    repo.append(Expense(10, "Food", "2024-03-01", "Tea"))
+    assert not RollupStore(repo.filename).load()
+    stale = RollupStore(repo.filename)
+    cold.add_listener(stale)
+    assert stale.refresh(cold).month_counts()["2024-03"] == 1 and cold.misses == 1
@@ -0,0 +1,48 @@
+from src.expense import Expense
+from src.file_manager import save_expenses
+from src.repository import ExpenseRepository
+from src.search_index import KeywordIndex
+
+
+def make_repo(tmp_path):
+    path = tmp_path / "expenses.csv"
+    save_expenses([
+        Expense(1200, "Food", "2024-01-02", "Groceries at market"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+        Expense(900, "Food", "2024-01-12", "Dining out"),
+        Expense(300, "Transport", "2024-02-20", "Bus & metro"),
+    ], path)
+    return ExpenseRepository(path)
+
+
+def test_prefix_and_or_queries(tmp_path):
+    repo = make_repo(tmp_path)
+    index = KeywordIndex(repo.filename)
+    repo.add_listener(index)
+    repo.expenses()
+
+    assert index.search("gro") == [0]
+    assert index.search("food din") == [2]
+    assert index.search("cab OR bus") == [1, 3]
+    assert index.search("transport bus", mode="or") == [3, 1]
+    assert index.search("nothing") == []
+
+
+def test_index_follows_writes_and_persists(tmp_path):
+    repo = make_repo(tmp_path)
+    index = KeywordIndex(repo.filename)
+    repo.add_listener(index)
+
+    repo.append(Expense(50, "Food", "2024-02-21", "Street snacks"))
+    repo.delete(0)
+    repo.update(0, Expense(460, "Transport", "2024-01-05", "Auto rickshaw"))
+    # Row ids: the delete of row 0 did not renumber the others
+    assert index.search("snack") == [4]
+    assert index.search("cab") == []
+    assert index.search("auto") == [1]
+    assert [e.description for e in repo.rows(index.search("auto OR snack"))] == ["Auto rickshaw", "Street snacks"]
+    index.save()
+
+    reopened = KeywordIndex(repo.filename)
+    assert reopened.load(rows=4)
+    assert reopened.postings == index.postings
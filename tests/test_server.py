@@ -0,0 +1,143 @@
+import asyncio
+import json
+from src.expense import Expense
+from src.file_manager import load_expenses, save_expenses
+from src.server import LedgerServer
+import src.server as server_module
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"Transfer-Encoding: chunked" in head:
+        body, rest = b"", payload
+        while True:
+            size, _, rest = rest.partition(b"\r\n")
+            size = int(size, 16)
+            if not size:
+                break
+            body, rest = body + rest[:size], rest[size + 2:]
+        payload = body
+    return status, json.loads(payload)
+
+
+def run_with_server(tmp_path, scenario):
+    data_file = tmp_path / "expenses.csv"
+    save_expenses([
+        Expense(1200, "Food", "2024-01-02", "Groceries"),
+        Expense(450, "Transport", "2024-01-05", "Cab rides"),
+        Expense(1800, "Bills", "2024-02-15", "Electricity bill"),
+    ], data_file)
+
+    async def main():
+        server = await LedgerServer(data_file, port=0).start()
+        try:
+            return await scenario(server.port)
+        finally:
+            await server.stop()
+
+    return data_file, asyncio.run(main())
+
+
+def test_reads_and_chunked_listing(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_module, "CHUNK_ROWS", 2)
+
+    async def scenario(port):
+        # Many concurrent readers on one in-memory ledger
+        results = await asyncio.gather(*(request(port, "GET", "/summary") for _ in range(20)))
+        assert all(r == results[0] for r in results)
+        status, summary = results[0]
+        assert status == 200 and summary["total"] == 3450.0 and summary["by_month"]["2024-02"] == 1800.0
+
+        status, rows = await request(port, "GET", "/expenses")
+        assert status == 200 and [r["id"] for r in rows] == [0, 1, 2]
+        status, rows = await request(port, "GET", "/expenses?from=2024-01-03&to=2024-12-31")
+        assert [r["description"] for r in rows] == ["Cab rides", "Electricity bill"]
+        assert (await request(port, "GET", "/summary/2024-01"))[1] == {"Food": 1200.0, "Transport": 450.0}
+        assert (await request(port, "GET", "/nowhere"))[0] == 404
+        assert (await request(port, "GET", "/expenses?from=bad"))[0] == 400
+        assert (await request(port, "GET", "/expenses?min=1000&max=inf"))[1][0]["description"] == "Groceries"
+        assert (await request(port, "GET", "/expenses?min=nan"))[0] == 400
+
+    run_with_server(tmp_path, scenario)
+
+
+def test_writes_are_serialized(tmp_path):
+    async def scenario(port):
+        posts = [request(port, "POST", "/expenses",
+                         {"amount": 10 + i, "category": "Food", "date": "2024-03-01", "description": f"snack {i}"})
+                 for i in range(10)]
+        assert all(status == 201 for status, _ in await asyncio.gather(*posts))
+        assert (await request(port, "POST", "/expenses", {"amount": -1, "category": "Food", "date": "2024-03-01"}))[0] == 400
+
+        status, _ = await request(port, "PUT", "/expenses/0",
+                                  {"amount": 1100, "category": "Food", "date": "2024-01-02", "description": "Groceries"})
+        assert status == 200
+        status, removed = await request(port, "DELETE", "/expenses/1")
+        assert removed["description"] == "Cab rides"
+        assert (await request(port, "DELETE", "/expenses/99"))[0] == 404
+        return (await request(port, "GET", "/summary"))[1]
+
+    data_file, summary = run_with_server(tmp_path, scenario)
+    assert summary["count"] == 12
+    assert summary["total"] == 1100 + 1800 + sum(10 + i for i in range(10))
+    assert len(load_expenses(data_file)) == 12
+
+
+def test_reload_after_outside_edit_goes_through_the_writer(tmp_path):
+    data_file = tmp_path / "expenses.csv"
+
+    async def scenario(port):
+        # Another process rewrites the file while the server is running
+        save_expenses([Expense(999, "Health", "2024-04-01", "Dentist")], data_file)
+        results = await asyncio.gather(*(request(port, "GET", "/summary") for _ in range(5)),
+                                       request(port, "GET", "/expenses"))
+        assert all(summary["total"] == 999.0 for _, summary in results[:-1])
+        assert [r["description"] for r in results[-1][1]] == ["Dentist"]
+
+    run_with_server(tmp_path, scenario)
+
+
+def test_body_limit_and_internal_errors(tmp_path, monkeypatch, capsys):
+    def broken(_summary):
+        raise RuntimeError("secret detail")
+
+    monkeypatch.setattr(server_module, "budget_alerts", broken)
+
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /expenses HTTP/1.1\r\nContent-Length: {server_module.MAX_BODY + 1}\r\n\r\n".encode())
+        raw = await reader.read()
+        writer.close()
+        assert raw.startswith(b"HTTP/1.1 413 ")
+
+        status, body = await request(port, "GET", "/alerts")
+        assert status == 500 and "secret" not in body["error"]
+
+    run_with_server(tmp_path, scenario)
+    assert "secret detail" in capsys.readouterr().err
+
+
+def test_writes_waiting_on_the_file_lock_do_not_block_the_loop(tmp_path):
+    from src.locking import file_lock
+
+    async def scenario(port):
+        # Another process (here: this thread) holds the data file's lock
+        with file_lock(tmp_path / "expenses.csv"):
+            post = asyncio.create_task(request(port, "POST", "/expenses",
+                                               {"amount": 5, "category": "Food", "date": "2024-03-01"}))
+            await asyncio.sleep(0.2)
+            assert not post.done()
+            status, health = await asyncio.wait_for(request(port, "GET", "/health"), 2)
+            assert status == 200
+        assert (await asyncio.wait_for(post, 5))[0] == 201
+        return (await request(port, "GET", "/summary"))[1]
+
+    _, summary = run_with_server(tmp_path, scenario)
+    assert summary["count"] == 4
@@ -0,0 +1,73 @@
+from src.expense import Expense
+from src.file_manager import (save_expenses, load_expenses, append_expense, iter_expenses,
+                              update_expense, delete_expense, migrate_to_sqlite)
+from src.repository import ExpenseRepository
+from src.reports import category_summary, monthly_summary
+from src.rollups import RollupStore
+
+
+def sample_expenses():
+    return [
+        Expense(120.5, "Food", "2024-01-01", "Groceries"),
+        Expense(80, "Transport", "2024-01-02", "Auto"),
+        Expense(300, "Food", "2024-02-10", "Dinner"),
+    ]
+
+
+def test_sqlite_backend_round_trip(tmp_path):
+    db = tmp_path / "expenses.db"
+    save_expenses(sample_expenses(), db)
+    append_expense(Expense(45, "Bills", "2024-02-11", "Water"), db)
+
+    loaded = load_expenses(db)
+    assert [e.to_row() for e in loaded[:3]] == [e.to_row() for e in sample_expenses()]
+    assert [e.amount for e in iter_expenses(db, start="2024-02", categories=["Food"])] == [300]
+
+    update_expense(1, Expense(90, "Transport", "2024-01-02", "Cab"), db)
+    delete_expense(0, db)
+    assert [e.description for e in load_expenses(db)] == ["Cab", "Dinner", "Water"]
+
+
+def test_sqlite_aggregations_match_reports(tmp_path):
+    csv_path, db = tmp_path / "expenses.csv", tmp_path / "expenses.db"
+    save_expenses(sample_expenses(), csv_path)
+
+    assert migrate_to_sqlite(csv_path, db) == 3
+    append_expense(Expense(5, "Other", "legacy", "undated"), db)
+    expected = sample_expenses() + [Expense(5, "Other", "legacy", "undated")]
+
+    # A cold summary is aggregated by SQLite, not by loading the rows
+    repo = ExpenseRepository(db)
+    summary = RollupStore(db).refresh(repo).summary()
+    assert repo.misses == 0
+    assert summary.by_category == category_summary(expected)
+    assert summary.by_month == monthly_summary(sample_expenses())
+    assert (summary.total, summary.count) == (505.5, 4)
+    # ... and saved, so the next session reuses it
+    assert RollupStore(db).load()
+
+
+def test_repository_on_sqlite(tmp_path):
+    repo = ExpenseRepository(tmp_path / "expenses.db")
+    repo.save(sample_expenses())
+    repo.update(2, Expense(1, "Other", "2024-03-01", "Pen"))
+    repo.delete(0)
+
+    assert [e.description for e in load_expenses(repo.filename)] == ["Auto", "Pen"]
+    assert len(repo.expenses()) == 2
+    assert repo.misses == 0
+
+
+def test_repository_edits_sqlite_rows_by_id(tmp_path):
+    db = tmp_path / "expenses.db"
+    save_expenses(sample_expenses() + [Expense(5, "Other", "01/03/2024", "Legacy date")], db)
+    delete_expense(0, db)
+    repo = ExpenseRepository(db)
+    assert len(repo) == 3 and repo._row_ids == [2, 3, 4]
+
+    repo.append(Expense(7, "Bills", "2024-03-02", "Gas"))
+    repo.update(2, Expense(6, "Other", "2024-03-01", "Fixed date"))
+    repo.delete(0)
+    assert [e.description for e in load_expenses(db)] == ["Dinner", "Fixed date", "Gas"]
+    assert repo._row_ids == [3, 4, 5]
+    assert repo.misses == 1
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+from src.utils import PROJECT_ROOT
+
+# Cold import of the CLI (everything needed to show the first menu).
+# Currently ~0.1s; matplotlib alone used to add ~0.6s.
+STARTUP_BUDGET = float(os.environ.get("FINANCE_STARTUP_BUDGET", "0.5"))
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import src.main, src.menu
+print(json.dumps({
+    "seconds": time.perf_counter() - t0,
+    "heavy": [m for m in ("matplotlib", "numpy", "pandas") if m in sys.modules],
+}))
+"""
+
+
+def cold_start():
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=PROJECT_ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def test_startup_skips_heavy_imports():
+    assert cold_start()["heavy"] == []
+
+
+def test_startup_within_budget():
+    # Best of three, to keep the check stable on a busy machine
+    best = min(cold_start()["seconds"] for _ in range(3))
+    assert best < STARTUP_BUDGET, f"cold start took {best:.3f}s (budget {STARTUP_BUDGET}s)"
@@ -0,0 +1,57 @@
+import random
+from datetime import date
+import pytest
+from src.expense import Expense
+from src.ledger import Ledger
+from src import reports, vectorized
+from src.utils import CATEGORIES
+
+pytestmark = pytest.mark.skipif(not vectorized.available(), reason="pandas not installed")
+
+
+@pytest.fixture
+def ledger():
+    rnd = random.Random(7)
+    start = date(2022, 11, 1).toordinal()
+    return Ledger.from_expenses(
+        Expense(rnd.randrange(1, 1_000_000) / 100, rnd.choice(CATEGORIES),
+                date.fromordinal(start + rnd.randrange(500)).isoformat(), "txn")
+        for _ in range(5000)
+    )
+
+
+def to_paise(summary):
+    return {k: round(v * 100) for k, v in summary.items()}
+
+
+def test_parity_with_python_engine(ledger):
+    rows = list(ledger)
+    for source in (ledger, rows):
+        assert to_paise(vectorized.category_summary(source)) == to_paise(reports.category_summary(rows, engine="python"))
+        assert to_paise(vectorized.monthly_summary(source)) == to_paise(reports.monthly_summary(rows, engine="python"))
+        total, average = vectorized.total_and_average(source)
+        expected = reports.total_and_average(rows, engine="python")
+        assert round(total * 100) == round(expected[0] * 100)
+        assert round(average, 2) == round(expected[1], 2)
+
+
+def test_reports_dispatch_and_fallbacks(ledger, monkeypatch):
+    monkeypatch.setattr(reports, "VECTORIZE_MIN_ROWS", 1)
+    assert reports.category_summary(ledger) == vectorized.category_summary(ledger)
+    assert vectorized.total_and_average(Ledger()) == (0.0, 0.0)
+    # A bad date cannot be placed in the ledger: the Python path answers
+    rows = [Expense(10, "Food", "2024-01-01", ""), Expense(5, "Food", "not-a-date", "")]
+    assert vectorized.monthly_summary(iter(rows)) == {"2024-01": 10.0}
+
+    monkeypatch.setattr(vectorized, "_modules", False)
+    assert not vectorized.available()
+    assert vectorized.category_summary(ledger) == ledger.category_totals()
+    assert vectorized.to_frame(ledger) is None
+
+
+def test_to_frame(ledger):
+    frame = vectorized.to_frame(ledger)
+    assert len(frame) == len(ledger)
+    assert frame["month"].iloc[0] == ledger[0].month
+    assert frame["category"].iloc[0] == ledger[0].category
+    assert int(frame["paise"].sum()) == ledger.total_paise()